@@ -0,0 +1,206 @@
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+from metrics import ADMISSIONS, STAGE_SECONDS
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted"""
+
+    def __init__(self, name: str, status: int, reason: str, retry_after: float):
+        super().__init__(f"{name} requests {reason}")
+        self.name = name
+        self.status = status
+        self.retry_after = retry_after
+
+
+@dataclass(slots=True)
+class AdmissionClass:
+    """Budget for one priority class of requests"""
+    name: str
+    priority: int  # Lower is admitted first when the worker is saturated
+    limit: int  # Requests of this class running at once
+    max_queue: int  # Requests of this class waiting for a slot
+    timeout: float  # Longest a request waits for a slot before it is shed
+    in_flight: int = 0
+    waiters: deque = field(default_factory=deque)
+    admitted: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    completed: int = 0
+    total_wait: float = 0.0
+    total_hold: float = 0.0
+
+
+class AdmissionController:
+    """
+    Per-class concurrency budgets sharing one per-worker capacity
+
+    A request runs straight away while its class is under its limit and the
+    worker under capacity; otherwise it queues. Freed slots go to queued
+    requests in priority order, so when the worker is saturated a transfer
+    overtakes transcription chunks queued before it. Requests are shed fast
+    instead of piling up: 429 when their class's queue is full, 503 when
+    they waited past the class timeout, both with a Retry-After estimated
+    from how long the class's requests take.
+    """
+
+    def __init__(self, capacity: int, classes: list[AdmissionClass]):
+        self.capacity = capacity
+        self.classes = {admission_class.name: admission_class for admission_class in classes}
+        self._by_priority = sorted(classes, key=lambda admission_class: admission_class.priority)
+        self.in_flight = 0
+
+    async def acquire(self, name: str):
+        """Wait for a slot in the class (AdmissionRejected if shed); pair with release()"""
+        admission_class = self.classes[name]
+        if self._has_room(admission_class) and not self._queued_ahead(admission_class):
+            self._grant(admission_class)
+            return
+        if len(admission_class.waiters) >= admission_class.max_queue:
+            admission_class.rejected += 1
+            ADMISSIONS.labels(name, "rejected").inc()
+            raise AdmissionRejected(name, 429, "are over budget", self._retry_after(admission_class))
+
+        future = asyncio.get_running_loop().create_future()
+        admission_class.waiters.append(future)
+        queued_at = time.monotonic()
+        try:
+            async with asyncio.timeout(admission_class.timeout):
+                await future
+        except TimeoutError:
+            if not (future.done() and not future.cancelled()):
+                self._abandon(admission_class, future)
+                admission_class.timed_out += 1
+                ADMISSIONS.labels(name, "timed_out").inc()
+                raise AdmissionRejected(name, 503, "queued too long", self._retry_after(admission_class)) from None
+            # Granted just as the deadline passed: keep the slot
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(name, 0.0)
+            else:
+                self._abandon(admission_class, future)
+            raise
+
+        wait = time.monotonic() - queued_at
+        admission_class.total_wait += wait
+        STAGE_SECONDS.labels(f"{name}_admission_wait").observe(wait)
+
+    def release(self, name: str, held: float):
+        """Give back a slot and hand it to the highest-priority request that can use it"""
+        admission_class = self.classes[name]
+        admission_class.in_flight -= 1
+        admission_class.completed += 1
+        admission_class.total_hold += held
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _has_room(self, admission_class: AdmissionClass) -> bool:
+        return admission_class.in_flight < admission_class.limit and self.in_flight < self.capacity
+
+    def _queued_ahead(self, admission_class: AdmissionClass) -> bool:
+        """Someone of equal or higher priority is waiting only on worker capacity"""
+        return any(
+            other.waiters and other.in_flight < other.limit
+            for other in self._by_priority
+            if other.priority <= admission_class.priority
+        )
+
+    def _grant(self, admission_class: AdmissionClass):
+        admission_class.in_flight += 1
+        admission_class.admitted += 1
+        self.in_flight += 1
+        ADMISSIONS.labels(admission_class.name, "admitted").inc()
+
+    def _dispatch(self):
+        for admission_class in self._by_priority:
+            if self.in_flight >= self.capacity:
+                return
+            while admission_class.waiters and self._has_room(admission_class):
+                future = admission_class.waiters.popleft()
+                if not future.done():
+                    self._grant(admission_class)
+                    future.set_result(None)
+
+    def _abandon(self, admission_class: AdmissionClass, future: asyncio.Future):
+        future.cancel()
+        try:
+            admission_class.waiters.remove(future)
+        except ValueError:
+            pass
+
+    def _retry_after(self, admission_class: AdmissionClass) -> float:
+        """Rough time for the class's queue to drain, from how long its requests hold a slot"""
+        hold = admission_class.total_hold / admission_class.completed if admission_class.completed else 1.0
+        return max(1.0, round(hold * (len(admission_class.waiters) + 1) / admission_class.limit, 1))
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "classes": {
+                admission_class.name: {
+                    "priority": admission_class.priority,
+                    "limit": admission_class.limit,
+                    "max_queue": admission_class.max_queue,
+                    "timeout": admission_class.timeout,
+                    "in_flight": admission_class.in_flight,
+                    "queued": len(admission_class.waiters),
+                    "admitted": admission_class.admitted,
+                    "rejected": admission_class.rejected,
+                    "timed_out": admission_class.timed_out,
+                    "avg_wait": admission_class.total_wait / admission_class.admitted if admission_class.admitted else 0.0,
+                    "avg_hold": admission_class.total_hold / admission_class.completed if admission_class.completed else 0.0
+                }
+                for admission_class in self._by_priority
+            }
+        }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware running HTTP requests through an AdmissionController
+
+    classify(method, path) names the request's class, or None to let it
+    through uncounted (health checks, metrics, long-lived streams). Shed
+    requests get a JSON error with Retry-After without reaching the app.
+    """
+
+    def __init__(self, app, controller: AdmissionController, classify: Callable[[str, str], str | None]):
+        self.app = app
+        self.controller = controller
+        self.classify = classify
+
+    async def __call__(self, scope, receive, send):
+        name = self.classify(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.controller.acquire(name)
+        except AdmissionRejected as e:
+            await self._reject(send, e)
+            return
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(name, time.monotonic() - started)
+
+    async def _reject(self, send, error: AdmissionRejected):
+        body = json.dumps({"detail": f"Overloaded: {str(error)}"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": error.status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, round(error.retry_after))).encode())
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,218 @@
+import io
+import math
+import sys
+import wave
+from array import array
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+except ImportError:  # Audio is forwarded untouched without it (see preprocess_audio)
+    np = None
+
+HAVE_NUMPY = np is not None
+
+
+def frame_rms(frame: bytes) -> float:
+    """Root-mean-square level of a 16-bit little-endian PCM frame"""
+    if np is not None:
+        samples = np.frombuffer(frame, dtype="<i2", count=len(frame) // 2).astype(np.float32)
+        return float(np.sqrt(np.mean(samples * samples))) if samples.size else 0.0
+    samples = array("h")
+    samples.frombytes(frame)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int, channels: int = 1) -> bytes:
+    """Wrap raw 16-bit PCM in a WAV container so Whisper can decode it"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def read_wav(data: bytes | bytearray | memoryview) -> tuple[memoryview, int, int]:
+    """(16-bit PCM, sample_rate, channels) from a WAV file; ValueError for anything else"""
+    try:
+        with wave.open(io.BytesIO(data), "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise ValueError(f"Unsupported WAV sample width: {wav.getsampwidth() * 8} bits")
+            return memoryview(wav.readframes(wav.getnframes())), wav.getframerate(), wav.getnchannels()
+    except (wave.Error, EOFError) as e:
+        raise ValueError(f"Unreadable WAV: {str(e) or 'truncated'}") from None
+
+
+def _resample(samples, sample_rate: int, target_rate: int):
+    """Downsample (block average for integer ratios, linear interpolation otherwise)"""
+    if sample_rate % target_rate == 0:
+        factor = sample_rate // target_rate
+        usable = len(samples) - len(samples) % factor
+        # Averaging each block is a crude low-pass, enough to keep speech band aliasing down
+        return samples[:usable].reshape(-1, factor).mean(axis=1)
+    count = int(len(samples) * target_rate / sample_rate)
+    positions = np.arange(count, dtype=np.float64) * (sample_rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+@dataclass(slots=True)
+class PreprocessedAudio:
+    """Result of preprocess_audio"""
+    pcm: bytes  # 16-bit mono PCM; empty when nothing was loud enough
+    sample_rate: int
+    input_bytes: int  # PCM bytes before downmixing, downsampling and trimming (no container header)
+
+    @property
+    def silent(self) -> bool:
+        return not self.pcm
+
+    @property
+    def bytes_saved(self) -> int:
+        return max(0, self.input_bytes - len(self.pcm))
+
+
+def preprocess_audio(
+    audio: bytes | bytearray | memoryview,
+    audio_format: str,
+    sample_rate: int = 16000,
+    channels: int = 1,
+    target_rate: int = 16000,
+    silence_threshold: float = 500.0,
+    frame_ms: int = 30,
+    pad_ms: int = 300
+) -> PreprocessedAudio:
+    """
+    Shrink 16-bit PCM or WAV before it is uploaded for transcription
+
+    Channels are averaged to mono and anything sampled above target_rate is
+    downsampled to it (lower rates are left alone; upsampling would only add
+    bytes). An energy VAD over frame_ms frames then keeps the frames within
+    pad_ms of one whose RMS reaches silence_threshold: leading and trailing
+    silence is cut and longer pauses shrink to 2 * pad_ms. Raw "pcm" needs
+    sample_rate and channels; WAV carries its own.
+
+    Returns the mono PCM and its rate, to be wrapped with pcm_to_wav; its pcm
+    is empty when no frame is loud enough (nothing worth transcribing).
+    Raises RuntimeError without NumPy and ValueError for audio
+    it can't read as 16-bit PCM.
+    """
+    if np is None:
+        raise RuntimeError("Audio preprocessing needs numpy")
+    if audio_format == "wav":
+        audio, sample_rate, channels = read_wav(audio)
+    elif audio_format != "pcm":
+        raise ValueError(f"Can't preprocess {audio_format} audio")
+    if sample_rate <= 0 or channels <= 0:
+        raise ValueError("sample_rate and channels must be positive")
+    input_bytes = len(audio)
+
+    samples = np.frombuffer(audio, dtype="<i2", count=len(audio) // 2)
+    samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels)
+    samples = samples.mean(axis=1, dtype=np.float32) if channels > 1 else samples[:, 0].astype(np.float32)
+    if sample_rate > target_rate:
+        samples = _resample(samples, sample_rate, target_rate)
+        sample_rate = target_rate
+
+    frame = max(1, sample_rate * frame_ms // 1000)
+    count = -(-len(samples) // frame)
+    if count == 0:
+        return PreprocessedAudio(b"", sample_rate, input_bytes)
+    frames = np.zeros(count * frame, dtype=np.float32)
+    frames[:len(samples)] = samples
+    frames = frames.reshape(count, frame)
+    loud = np.sqrt(np.mean(frames * frames, axis=1)) >= silence_threshold
+    if not loud.any():
+        return PreprocessedAudio(b"", sample_rate, input_bytes)
+
+    # Widen every loud frame by pad frames each side: +1 where a window opens, -1 past where it closes
+    pad = pad_ms // frame_ms
+    loud_frames = np.flatnonzero(loud)
+    edges = np.zeros(count + 1, dtype=np.int32)
+    np.add.at(edges, np.maximum(loud_frames - pad, 0), 1)
+    np.add.at(edges, np.minimum(loud_frames + pad + 1, count), -1)
+    keep = np.cumsum(edges[:count]) > 0
+    kept = frames[keep].reshape(-1)
+    if keep[-1]:
+        kept = kept[:len(kept) - (count * frame - len(samples))]  # Drop the zero padding of the last frame
+    pcm = np.clip(np.rint(kept), -32768, 32767).astype("<i2").tobytes()
+    return PreprocessedAudio(pcm, sample_rate, input_bytes)
+
+
+class AudioSegmenter:
+    """
+    Cut a continuous 16-bit mono PCM stream into utterance segments
+
+    A segment starts at the first frame above silence_threshold, ends once
+    min_silence_ms of silence follows (trailing silence is trimmed), and is
+    force-cut at max_segment_ms. feed() returns (pcm, is_final) pairs where
+    is_final is False for force-cut segments whose utterance continues.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frame_ms: int = 30,
+        silence_threshold: float = 500.0,
+        min_silence_ms: int = 600,
+        max_segment_ms: int = 10000
+    ):
+        self.frame_bytes = int(sample_rate * frame_ms / 1000) * 2
+        self.silence_threshold = silence_threshold
+        self.min_silence_frames = max(1, min_silence_ms // frame_ms)
+        self.max_segment_bytes = max(self.frame_bytes, int(sample_rate * max_segment_ms / 1000) * 2)
+        self._buffer = bytearray()  # Bytes not yet split into frames
+        self._segment = bytearray()
+        self._silent_frames = 0
+
+    def feed(self, data: bytes) -> list[tuple[bytes, bool]]:
+        """Consume PCM bytes and return any segments completed by them"""
+        self._buffer += data
+        segments = []
+        offset = 0
+
+        while len(self._buffer) - offset >= self.frame_bytes:
+            frame = self._buffer[offset:offset + self.frame_bytes]
+            offset += self.frame_bytes
+            loud = frame_rms(frame) >= self.silence_threshold
+
+            if not self._segment and not loud:
+                # Skip silence between utterances entirely
+                continue
+
+            self._segment += frame
+            self._silent_frames = 0 if loud else self._silent_frames + 1
+
+            if self._silent_frames >= self.min_silence_frames:
+                speech_bytes = len(self._segment) - self._silent_frames * self.frame_bytes
+                segments.append((bytes(self._segment[:speech_bytes]), True))
+                self._reset()
+            elif len(self._segment) >= self.max_segment_bytes:
+                segments.append((bytes(self._segment), False))
+                self._reset()
+
+        del self._buffer[:offset]
+        return segments
+
+    def flush(self) -> tuple[bytes, bool] | None:
+        """Return whatever is buffered as a final segment (end of stream)"""
+        if self._silent_frames:
+            # Already trailing off into silence, drop it and the partial frame
+            speech_bytes = len(self._segment) - self._silent_frames * self.frame_bytes
+            segment = bytes(self._segment[:speech_bytes])
+        elif self._segment:
+            segment = bytes(self._segment + self._buffer)
+        else:
+            segment = b""
+        self._buffer.clear()
+        self._reset()
+        return (segment, True) if segment else None
+
+    def _reset(self):
+        self._segment = bytearray()
+        self._silent_frames = 0
@@ -0,0 +1,106 @@
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+
+def completed_ids(output: Path) -> set[str]:
+    """Ids already summarized successfully in an earlier run's output"""
+    from models import BatchSummaryResult
+
+    done = set()
+    if not output.exists():
+        return done
+    for line in output.read_text().splitlines():
+        try:
+            result = BatchSummaryResult.model_validate_json(line)
+        except ValueError:
+            continue  # Line cut short when the earlier run was interrupted
+        if result.status == "ok":
+            done.add(result.id)
+    return done
+
+
+async def run(args) -> int:
+    from cache import SummaryCache
+    from config import settings
+    from connections import ConnectionPool
+    from logs import pipeline as log_pipeline, setup_logging
+    from services import BatchSummaryService, LLMService, parse_batch_lines
+    from state import MemoryStateBackend
+
+    with (sys.stdin if args.input == "-" else open(args.input)) as source:
+        items = parse_batch_lines(source)
+    BatchSummaryService.validate(items)
+
+    output = Path(args.output) if args.output else None
+    if args.resume and output is not None:
+        done = completed_ids(output)
+        items = [item for item in items if item.id not in done]
+        print(f"↩️  Resuming: {len(done)} already summarized, {len(items)} to go", file=sys.stderr)
+
+    setup_logging()
+    connections = ConnectionPool()
+    await connections.start()
+    cache = SummaryCache(
+        max_entries=settings.summary_cache_max_entries,
+        ttl=settings.summary_cache_ttl,
+        sqlite_path=settings.summary_cache_sqlite_path
+    ) if settings.summary_cache_enabled else None
+    llm_service = LLMService(connections, cache)
+    # Resume is driven by the output file, so results needn't be kept in shared state
+    batch_service = BatchSummaryService(llm_service, MemoryStateBackend(), args.concurrency, args.rate)
+
+    counts = {"ok": 0, "fallback": 0, "error": 0}
+    started = time.time()
+    sink = open(output, "a" if args.resume else "w") if output else sys.stdout
+    if args.resume and sink.tell() and not output.read_text().endswith("\n"):
+        sink.write("\n")  # Don't glue the first new result onto a cut-off line
+    try:
+        async for result in batch_service.run(items):
+            sink.write(result.model_dump_json() + "\n")
+            sink.flush()
+            counts[result.status] += 1
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+        await llm_service.close()
+        if cache is not None:
+            cache.close()
+        await connections.close()
+        log_pipeline.stop()
+
+    print(
+        f"✅ {counts['ok']} summarized, {counts['fallback']} fell back, {counts['error']} failed "
+        f"in {time.time() - started:.1f}s",
+        file=sys.stderr
+    )
+    return 0 if counts["ok"] == len(items) else 1
+
+
+def main():
+    """Summarize a JSONL file of transcripts offline (no API server, no LiveKit)"""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Batch-summarize transcripts for post-call QA")
+    parser.add_argument("input", help='JSONL of {"id": ..., "transcript": ...} per line, or - for stdin')
+    parser.add_argument("--output", help="NDJSON results file (default: stdout)")
+    parser.add_argument("--resume", action="store_true", help="Append to --output, skipping ids it already has")
+    parser.add_argument("--concurrency", type=int, help="Summaries in flight (default: BATCH_MAX_CONCURRENCY)")
+    parser.add_argument("--rate", type=float, help="Summaries started per second, 0 for no limit (default: BATCH_RATE_LIMIT)")
+    args = parser.parse_args()
+
+    if args.resume and not args.output:
+        parser.error("--resume needs --output")
+    try:
+        exit(asyncio.run(run(args)))
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        exit(2)
+
+
+if __name__ == "__main__":
+    main()
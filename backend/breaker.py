@@ -0,0 +1,177 @@
+import time
+from collections import deque
+
+
+# Breaker states, in the order providers are preferred
+BREAKER_STATES = ("closed", "half_open", "open")
+
+# How often to check back on a half-open breaker whose probes are all in flight
+PROBE_POLL_INTERVAL = 0.5
+
+
+class CircuitOpenError(Exception):
+    """Raised when every provider's breaker rejected the call"""
+
+
+class CircuitBreaker:
+    """
+    closed/open/half-open breaker over a rolling window of call outcomes
+
+    While closed, the breaker opens once the window holds at least min_calls
+    and either the error rate or the slow-call rate (calls slower than
+    slow_call_threshold) reaches its threshold. After open_duration it lets
+    up to half_open_probes calls through; if they all succeed (and aren't
+    slow) it closes with a fresh window, any failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: float,
+        min_calls: int,
+        error_threshold: float,
+        slow_call_threshold: float,
+        slow_rate_threshold: float,
+        open_duration: float,
+        half_open_probes: int,
+        max_samples: int = 1000
+    ):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.error_threshold = error_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_rate_threshold = slow_rate_threshold
+        self.open_duration = open_duration
+        self.half_open_probes = half_open_probes
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._calls: deque = deque(maxlen=max_samples)  # (finished_at, failed, latency)
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    def acquire(self) -> str | None:
+        """Permit for one call: "call", "probe" (half-open trial) or None if rejected"""
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.open_duration:
+                self.rejected += 1
+                return None
+            self.state = "half_open"
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        if self.state == "half_open":
+            if self._probes_in_flight >= self.half_open_probes:
+                self.rejected += 1
+                return None
+            self._probes_in_flight += 1
+            return "probe"
+        return "call"
+
+    def record(self, permit: str, outcome: str, latency: float):
+        """
+        Feed back a call's outcome: "success", "failure" or "cancelled"
+
+        A cancelled call (e.g. the losing side of a hedge) only counts if it
+        had already run past slow_call_threshold; otherwise it is inconclusive.
+        """
+        if permit == "probe":
+            self._probes_in_flight -= 1
+        slow = latency >= self.slow_call_threshold
+        if outcome == "cancelled" and not slow:
+            return
+        failed = outcome == "failure"
+        now = time.monotonic()
+
+        if permit == "probe" and self.state == "half_open":
+            if failed or slow:
+                self._open(now)
+            else:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self.state = "closed"
+                    self._calls.clear()
+            return
+
+        self._calls.append((now, failed, latency))
+        if self.state == "closed":
+            error_rate, slow_rate, calls = self._rates(now)
+            if calls >= self.min_calls and (
+                error_rate >= self.error_threshold or slow_rate >= self.slow_rate_threshold
+            ):
+                self._open(now)
+
+    def _open(self, now: float):
+        self.state = "open"
+        self.opened_at = now
+        self.times_opened += 1
+
+    def _rates(self, now: float) -> tuple[float, float, int]:
+        """(error rate, slow-call rate, calls) over the window"""
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+        calls = len(self._calls)
+        if not calls:
+            return 0.0, 0.0, 0
+        failures = sum(1 for _, failed, _ in self._calls if failed)
+        slow = sum(1 for _, failed, latency in self._calls if not failed and latency >= self.slow_call_threshold)
+        return failures / calls, slow / calls, calls
+
+    def score(self) -> float:
+        """Health in [0, 1]: success rate discounted by slowness, halved while on probation"""
+        now = time.monotonic()
+        if self.state == "open" and now - self.opened_at < self.open_duration:
+            return 0.0
+        error_rate, slow_rate, _ = self._rates(now)
+        score = (1 - error_rate) * (1 - slow_rate / 2)
+        return score if self.state == "closed" else score / 2
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker would let a call through (0 if it would now)"""
+        if self.state == "open":
+            return max(0.0, self.open_duration - (time.monotonic() - self.opened_at))
+        if self.state == "half_open" and self._probes_in_flight >= self.half_open_probes:
+            return PROBE_POLL_INTERVAL
+        return 0.0
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        error_rate, slow_rate, calls = self._rates(now)
+        latencies = sorted(latency for _, failed, latency in self._calls if not failed)
+        return {
+            "state": self.state,
+            "score": round(self.score(), 3),
+            "calls_in_window": calls,
+            "error_rate": round(error_rate, 3),
+            "slow_rate": round(slow_rate, 3),
+            "p50_latency": latencies[len(latencies) // 2] if latencies else None,
+            "p95_latency": latencies[int(len(latencies) * 0.95)] if latencies else None,
+            "open_for": round(max(0.0, self.open_duration - (now - self.opened_at)), 1) if self.state == "open" else 0.0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
+
+
+class ProviderHealth:
+    """One breaker per provider, plus ordering of providers by current health"""
+
+    def __init__(self, providers: list[str], **breaker_settings):
+        self.breakers = {name: CircuitBreaker(name, **breaker_settings) for name in providers}
+
+    def order(self, providers: list) -> list:
+        """Sort (name, ...) tuples healthiest first; ties keep the configured order"""
+        return sorted(providers, key=lambda provider: -self.breakers[provider[0]].score())
+
+    def acquire(self, provider: str) -> str | None:
+        return self.breakers[provider].acquire()
+
+    def record(self, provider: str, permit: str, outcome: str, latency: float):
+        self.breakers[provider].record(permit, outcome, latency)
+
+    def retry_after(self) -> float:
+        """Seconds until at least one provider would take a call"""
+        return min(breaker.retry_after() for breaker in self.breakers.values())
+
+    def stats(self) -> dict:
+        return {name: breaker.stats() for name, breaker in self.breakers.items()}
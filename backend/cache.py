@@ -0,0 +1,120 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from models import CallSummary
+
+
+class SummaryCache:
+    """
+    Content-addressed CallSummary cache
+
+    An in-memory LRU bounded by max_entries with a per-entry TTL, optionally
+    backed by a SQLite file so entries survive restarts. SQLite work runs in a
+    worker thread to keep it off the event loop.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, sqlite_path: str | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.sqlite_path = sqlite_path
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._db = None
+        self._db_lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> CallSummary | None:
+        """Look a summary up in memory, then on disk"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return CallSummary.model_validate_json(value)
+            del self._entries[key]
+
+        if self.sqlite_path:
+            row = await asyncio.to_thread(self._db_get, key)
+            if row is not None:
+                expires_at, value = row
+                self._remember(key, value, expires_at)
+                self.disk_hits += 1
+                return CallSummary.model_validate_json(value)
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, summary: CallSummary):
+        """Store a summary; emergency fallbacks are never cached"""
+        if summary.provider_used == "emergency_fallback":
+            return
+        value = summary.model_dump_json()
+        expires_at = time.time() + self.ttl
+        self._remember(key, value, expires_at)
+        if self.sqlite_path:
+            await asyncio.to_thread(self._db_put, key, value, expires_at)
+
+    def _remember(self, key: str, value: str, expires_at: float):
+        """Insert into the memory tier, evicting least recently used entries"""
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite tier on first use (call with _db_lock held)"""
+        if self._db is None:
+            self._db = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM summaries WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+        return self._db
+
+    def _db_get(self, key: str) -> tuple[float, str] | None:
+        with self._db_lock:
+            row = self._connect().execute(
+                "SELECT expires_at, value FROM summaries WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return row
+
+    def _db_put(self, key: str, value: str, expires_at: float):
+        with self._db_lock:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO summaries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            db.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "sqlite_path": self.sqlite_path
+        }
+
+    def close(self):
+        """Close the SQLite tier"""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
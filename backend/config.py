@@ -10,12 +10,149 @@ class Settings(BaseSettings):
     # LLM Configuration
     openai_api_key: str
     groq_api_key: str
+    openai_base_url: str = "https://api.openai.com/v1"
+    groq_base_url: str | None = None  # None uses the Groq SDK default
+    
+    # Summary provider execution: "sequential", "hedge" or "race". Streamed
+    # summaries always fall back sequentially; hedge and race there only
+    # abandon a provider silent for llm_hedge_delay before its first chunk
+    llm_execution_mode: str = "hedge"
+    llm_hedge_delay: float = 2.0  # seconds before the fallback provider is fired
+    llm_summary_deadline: float = 12.0  # overall budget before the emergency summary
+    
+    # Per-provider circuit breakers (rolling window of outcomes, per worker)
+    breaker_window: float = 60.0  # seconds of call outcomes considered
+    breaker_min_calls: int = 5  # calls in the window before the breaker may open
+    breaker_error_threshold: float = 0.5  # error rate that opens the breaker
+    breaker_slow_call_threshold: float = 5.0  # seconds; slower calls count as slow
+    breaker_slow_rate_threshold: float = 0.8  # slow-call rate that opens the breaker
+    breaker_open_duration: float = 30.0  # seconds before half-open probes are allowed
+    breaker_half_open_probes: int = 1  # successful probes needed to close again
+    
+    # Long transcripts: compacted, then summarized chunk by chunk and merged (map-reduce)
+    summary_max_prompt_tokens: int = 3000  # estimated tokens sent in one provider call
+    summary_map_concurrency: int = 4  # chunk summaries running at once per request
+    summary_strip_filler: bool = True  # drop "um"/"uh" and stutters before prompting
+    
+    # Summary cache (in-memory LRU + TTL, optional SQLite tier that survives restarts)
+    summary_cache_enabled: bool = True
+    summary_cache_max_entries: int = 1024
+    summary_cache_ttl: float = 3600.0
+    summary_cache_sqlite_path: str | None = None
+    
+    # Room/participant registry fed by LiveKit webhooks (POST /livekit/webhook)
+    room_registry_poll_ttl: float = 5.0  # cache API lookups for rooms webhooks haven't told us about
+    room_registry_resync_interval: float = 300.0  # re-check a webhook-tracked room after this long without events
+    room_registry_max_rooms: int = 10000
+    room_events_keepalive: float = 15.0  # seconds between SSE keepalive comments
+    
+    # Pre-created transfer rooms (per worker; low_watermark 0 and high_watermark 0 disable)
+    room_empty_timeout: int = 300  # LiveKit closes a room nobody joined after this many seconds
+    room_pool_low_watermark: int = 2  # refill when fewer rooms than this are ready
+    room_pool_high_watermark: int = 5  # refill up to this many
+    room_pool_claim_margin: float = 60.0  # don't hand out rooms this close to empty_timeout
+    room_pool_refill_concurrency: int = 2
+    room_pool_check_interval: float = 10.0
+    
+    # Admission control: per-class concurrency budgets; when the worker is saturated
+    # queued requests are admitted transfer first, then room, participants, transcribe
+    admission_enabled: bool = True
+    admission_max_concurrency: int = 64  # requests in flight per worker across classes
+    admission_transfer_limit: int = 32
+    admission_transfer_queue: int = 64
+    admission_transfer_timeout: float = 5.0  # seconds queued before a 503
+    admission_room_limit: int = 32  # create-room / join-room
+    admission_room_queue: int = 64
+    admission_room_timeout: float = 2.0
+    admission_participants_limit: int = 16  # room reads (participants, transcript, summary)
+    admission_participants_queue: int = 64
+    admission_participants_timeout: float = 1.0
+    admission_transcribe_limit: int = 24  # transcription chunks and transcript deltas
+    admission_transcribe_queue: int = 48
+    admission_transcribe_timeout: float = 0.5
+    
+    # Room reaper: deletes transfer rooms of finished transfers and rooms left empty
+    room_reaper_enabled: bool = True
+    room_reaper_interval: float = 30.0
+    room_reaper_grace: float = 15.0  # seconds after a transfer completes or is cancelled before its room goes
+    room_reaper_empty_grace: float = 60.0  # rooms webhooks saw empty out are deleted after this long
+    room_reaper_concurrency: int = 4  # delete_room calls at once
+    room_reaper_batch_size: int = 100  # rooms of each kind per cycle
+    
+    # Transcription scheduler (bounded concurrency and queue, retry on 429/5xx)
+    transcribe_max_concurrency: int = 8
+    transcribe_max_queue: int = 100
+    transcribe_max_retries: int = 3
+    transcribe_backoff_base: float = 0.5  # seconds, doubled per attempt
+    transcribe_backoff_max: float = 8.0
+    
+    # PCM/WAV preprocessing before upload (mono, downsample, trim silence; needs numpy)
+    audio_preprocess_enabled: bool = True
+    audio_target_sample_rate: int = 16000
+    audio_vad_threshold: float = 500.0  # frame RMS level treated as speech
+    audio_vad_pad_ms: int = 300  # silence kept around speech; longer pauses shrink to twice this
+    
+    # WebSocket streaming transcription (16-bit mono PCM segmentation)
+    ws_transcribe_max_inflight: int = 3  # segments transcribing at once per stream
+    ws_segment_silence_threshold: float = 500.0  # RMS level treated as speech
+    ws_segment_min_silence_ms: int = 600  # silence that ends an utterance
+    ws_segment_max_ms: int = 10000  # force-cut long utterances
+    
+    # Rolling per-room summaries built while the call is live
+    rolling_summary_debounce: float = 5.0  # seconds to batch deltas before folding
+    rolling_summary_min_chars: int = 400  # don't fold tails shorter than this
+    rolling_summary_max_concurrency: int = 4  # folds running at once across rooms
+    rolling_summary_ttl: float = 7200.0  # forget a room's rolling state after this long idle
+    
+    # Server-side per-room transcripts written by /transcribe and the rolling summary feed
+    room_transcript_max_turns: int = 2000  # oldest turns are dropped past this
+    room_transcript_ttl: float = 7200.0  # evict a room's transcript after this long without new turns
+    
+    # Shared state for transfers and rolling summaries:
+    # memory:// (single worker), sqlite:///state.db (one host), redis://host:6379/0
+    state_backend_url: str = "memory://"
+    state_memory_max_entries: int = 50000  # bound for the memory backend
+    state_poll_interval: float = 0.25  # seconds between reads when another worker owns a summary
+    
+    # Transfer registry (records expire when idle)
+    transfer_ttl: float = 3600.0  # live transfers expire after this long without progress
+    transfer_retention: float = 600.0  # keep finished transfers this long for lookups
+    transfer_sweep_interval: float = 30.0
+    
+    # Idempotency-Key replay for /transfer and /create-room
+    idempotency_ttl: float = 3600.0  # replay a keyed response for this long
+    idempotency_max_entries: int = 10000  # responses kept in memory per worker
+    idempotency_lease_ttl: float = 60.0  # how long a retry waits on another worker still running the request
+    
+    # Async transfers: upper bound for GET /transfers/{id}/summary long-polls
+    transfer_summary_max_wait: float = 30.0
+    
+    # Batch summarization (POST /summaries/batch and batch.py)
+    batch_max_concurrency: int = 8  # summaries in flight per batch
+    batch_rate_limit: float = 5.0  # summaries started per second across batches (0 disables)
+    batch_max_items: int = 10000
+    batch_result_ttl: float = 86400.0  # keep results this long so a batch can be resumed
     
     # Application Settings
     app_name: str = "Warm Transfer System"
     debug: bool = True
     cors_origins: list[str] = ["http://localhost:3000"]
     
+    # Logging: records are queued and written by a background thread
+    log_level: str = "INFO"
+    log_sinks: str = "stderr"  # comma-separated: stderr, stdout, file:<path>
+    log_format: str = "text"  # "text" or "json"
+    log_queue_size: int = 10000  # records past this are dropped, never waited on
+    log_rate_limit: float = 20.0  # records per second per message template (0 disables)
+    log_rate_burst: int = 50
+    
+    # Outbound HTTP connection pool (shared per upstream)
+    http_max_connections: int = 100
+    http_max_connections_per_host: int = 20
+    http_keepalive_timeout: float = 30.0
+    http_connect_timeout: float = 5.0
+    http_request_timeout: float = 60.0
+    
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,81 @@
+import aiohttp
+import httpx
+
+from config import settings
+
+
+class ConnectionPool:
+    """Application-lifespan HTTP sessions, one pooled keep-alive client per upstream"""
+
+    def __init__(self):
+        # Sessions must be created inside the running event loop, see start()
+        self._openai: aiohttp.ClientSession | None = None
+        self._livekit: aiohttp.ClientSession | None = None
+        self._groq: httpx.AsyncClient | None = None
+
+    def _aiohttp_session(self) -> aiohttp.ClientSession:
+        """Build a keep-alive aiohttp session with per-host connection limits"""
+        connector = aiohttp.TCPConnector(
+            limit=settings.http_max_connections,
+            limit_per_host=settings.http_max_connections_per_host,
+            keepalive_timeout=settings.http_keepalive_timeout,
+            ttl_dns_cache=300
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=settings.http_request_timeout,
+            connect=settings.http_connect_timeout
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def start(self):
+        """Open the pooled sessions (called from the app lifespan)"""
+        if self._openai is None:
+            self._openai = self._aiohttp_session()
+        if self._livekit is None:
+            self._livekit = self._aiohttp_session()
+        if self._groq is None:
+            # The Groq SDK is built on httpx, so its pool is an httpx client
+            self._groq = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.http_max_connections_per_host,
+                    max_keepalive_connections=settings.http_max_connections_per_host,
+                    keepalive_expiry=settings.http_keepalive_timeout
+                ),
+                timeout=httpx.Timeout(
+                    settings.http_request_timeout,
+                    connect=settings.http_connect_timeout
+                )
+            )
+
+    async def close(self):
+        """Close every pooled session so no sockets leak across reloads"""
+        if self._openai is not None:
+            await self._openai.close()
+            self._openai = None
+        if self._livekit is not None:
+            await self._livekit.close()
+            self._livekit = None
+        if self._groq is not None:
+            await self._groq.aclose()
+            self._groq = None
+
+    @property
+    def openai(self) -> aiohttp.ClientSession:
+        """Shared session for api.openai.com (chat completions and Whisper)"""
+        if self._openai is None:
+            raise RuntimeError("Connection pool not started")
+        return self._openai
+
+    @property
+    def livekit(self) -> aiohttp.ClientSession:
+        """Shared session for the LiveKit server API"""
+        if self._livekit is None:
+            raise RuntimeError("Connection pool not started")
+        return self._livekit
+
+    @property
+    def groq(self) -> httpx.AsyncClient:
+        """Shared httpx client handed to the Groq SDK"""
+        if self._groq is None:
+            raise RuntimeError("Connection pool not started")
+        return self._groq
@@ -0,0 +1,241 @@
+import re
+from bisect import bisect_right
+from collections import Counter
+
+from models import CallSummary
+
+
+# Phrase tables: label -> phrases. Matching is case-insensitive on word boundaries.
+ISSUE_PHRASES = {
+    "Billing Inquiry": [
+        "bill", "billing", "billed", "invoice", "charge", "charged", "charges", "double charged",
+        "overcharged", "refund", "payment", "credit card", "subscription", "fee", "receipt", "statement"
+    ],
+    "Authentication Issue": [
+        "login", "log in", "logging in", "password", "locked out", "reset my password", "sign in",
+        "two-factor", "2fa", "verification code", "username", "can't access"
+    ],
+    "Technical Support": [
+        "error", "error message", "crash", "crashes", "not working", "stopped working", "broken", "bug",
+        "connection", "internet", "outage", "wifi", "offline", "install", "freezes", "keeps disconnecting"
+    ],
+    "Account Management": [
+        "cancel", "cancellation", "close my account", "upgrade", "downgrade", "change my plan",
+        "update my address", "change my address", "account settings"
+    ],
+    "Shipping & Delivery": [
+        "delivery", "delivered", "shipping", "shipped", "package", "tracking number", "tracking",
+        "order", "never arrived", "lost package"
+    ]
+}
+
+SENTIMENT_PHRASES = {
+    "Frustrated": [
+        "frustrated", "frustrating", "annoyed", "ridiculous", "third time", "still not", "waste of time",
+        "fed up", "unacceptable", "upset", "again and again"
+    ],
+    "Angry": ["angry", "furious", "outrageous", "terrible", "worst", "speak to a manager", "speak to your supervisor"],
+    "Anxious": ["worried", "urgent", "asap", "as soon as possible", "concerned", "nervous", "scared"],
+    "Confused": ["confused", "don't understand", "not sure", "what does that mean", "makes no sense"],
+    "Positive": ["thank you", "thanks", "great", "appreciate", "perfect", "happy", "awesome", "wonderful"]
+}
+
+# Later matches win: the end of the call says where things stand
+STATUS_PHRASES = {
+    "Escalated to a specialist": [
+        "escalate", "escalating", "bring in", "transfer you", "transferring", "supervisor", "specialist",
+        "billing team", "another team", "colleague"
+    ],
+    "Verifying customer details": [
+        "can i get", "could you provide", "can you confirm", "verify", "account number", "date of birth"
+    ],
+    "Resolved": ["resolved", "fixed", "all set", "that worked", "working now", "sorted"]
+}
+
+ISSUE_ACTIONS = {
+    "Billing Inquiry": ["Review billing history", "Confirm the disputed charges", "Process a refund or credit if warranted"],
+    "Authentication Issue": ["Verify the customer's identity", "Reset credentials", "Check account security"],
+    "Technical Support": ["Reproduce the reported problem", "Check service status", "Walk through troubleshooting"],
+    "Account Management": ["Confirm the requested account change", "Explain any impact on the plan", "Apply the change"],
+    "Shipping & Delivery": ["Look up the order and tracking", "Confirm the delivery address", "Arrange a replacement or refund"],
+    "General Inquiry": ["Review transcript details", "Confirm the customer's main concern", "Provide appropriate assistance"]
+}
+
+# Sentiment is a phrase tally; politeness counts for less than complaints
+_SENTIMENT_WEIGHTS = {"Positive": 0.5}
+
+_STOPWORDS = frozenset("""
+a about after again all also am an and any are as at be because been but by can could did do does
+don't for from get got had has have hello hey hi how i i'm if in into is it it's just know let like
+me my no not now of oh ok okay on one or our please right see so sure that that's the their them
+then there they this to too up us was we well were what when where which will with would yes you
+your yeah
+""".split())
+
+_NAME_EXCLUDE = frozenset({"Sorry", "Calling", "Here", "Just", "Not", "Still", "Really", "Very", "Good", "Fine", "Glad"})
+
+_SPEAKER = re.compile(r"^([A-Za-z][\w .'-]{0,40}?):\s+")
+# A sentence runs to . ! or ? followed by a space; "$49.99", "e.g." and "Mr. Lopez" don't end one
+_SENTENCE = re.compile(r"(?:[^.!?\n]|[.!?](?=[^\s.!?])|(?<=\bMr)\.|(?<=\bMs)\.|(?<=\bMrs)\.|(?<=\bDr)\.)+[.!?]*")
+_WORD = re.compile(r"[a-z0-9']+")
+_DIGIT = re.compile(r"\d")
+_NAME_WORD = r"[A-Z][a-z'-]+"
+_SELF_INTRO = re.compile(
+    rf"\b(?:[Mm]y name is|[Nn]ame's|[Tt]his is|I am|I'm|[Cc]ustomer(?:'s)? name(?: is|:))\s+({_NAME_WORD}(?: {_NAME_WORD})?)"
+)
+_ADDRESSED = re.compile(rf"\b(?:Mr|Mrs|Ms|Miss|Dr)\.?\s+({_NAME_WORD})")
+_CUSTOMER_SPEAKERS = ("caller", "customer", "client")
+
+
+def _trie_pattern(phrases) -> str:
+    """Regex matching any of the phrases (longest wins), factored on shared prefixes so matching doesn't retry each phrase"""
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for character in phrase:
+            node = node.setdefault(character, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(character) + emit(child) for character, child in sorted(node.items()) if character]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+def _build_index() -> tuple[re.Pattern, dict[str, list[tuple[str, str, float]]]]:
+    """One pattern over every phrase, and what each phrase counts towards"""
+    entries: dict[str, list[tuple[str, str, float]]] = {}
+    for table, phrases_by_label in (("issue", ISSUE_PHRASES), ("sentiment", SENTIMENT_PHRASES), ("status", STATUS_PHRASES)):
+        for label, phrases in phrases_by_label.items():
+            for phrase in phrases:
+                weight = 2.0 if " " in phrase else 1.0  # Multi-word phrases are more specific
+                entries.setdefault(phrase, []).append((table, label, weight))
+    return re.compile(rf"(?<![\w'])(?:{_trie_pattern(entries)})(?![\w'])"), entries
+
+
+_PHRASE_INDEX, _PHRASE_ENTRIES = _build_index()
+
+
+def _sentences(transcript: str) -> list[tuple[int, str | None, str]]:
+    """(offset, speaker, text) per sentence; speaker labels carry across a turn's sentences"""
+    sentences = []
+    offset = 0
+    for line in transcript.splitlines(keepends=True):
+        match = _SPEAKER.match(line)
+        speaker = match.group(1) if match else None
+        body_start = match.end() if match else 0
+        for sentence in _SENTENCE.finditer(line, body_start):
+            text = sentence.group().strip()
+            if text:
+                sentences.append((offset + sentence.start(), speaker, text))
+        offset += len(line)
+    return sentences
+
+
+def _is_customer(speaker: str | None) -> bool:
+    return speaker is None or speaker.lower().startswith(_CUSTOMER_SPEAKERS)
+
+
+def _extract_name(sentences: list[tuple[int, str | None, str]]) -> str:
+    """Customer's name from a self-introduction, else from how the agent addresses them"""
+    for _, speaker, text in sentences:
+        if _is_customer(speaker):
+            for match in _SELF_INTRO.finditer(text):
+                name = match.group(1)
+                if name.split()[0] not in _NAME_EXCLUDE:
+                    return name
+    for _, speaker, text in sentences:
+        match = _ADDRESSED.search(text)
+        if match and not (speaker and _is_customer(speaker)):
+            return match.group(0)
+    return "Customer"
+
+
+def _top_label(scores: Counter, default: str) -> str:
+    if not scores:
+        return default
+    label, score = scores.most_common(1)[0]
+    return label if score > 0 else default
+
+
+def extract_summary(transcript: str, provider: str = "heuristic", generation_time: float = 0.0) -> CallSummary:
+    """
+    Extractive CallSummary from the transcript alone, no LLM involved
+
+    One regex pass over the lowercased text matches every known phrase and
+    tallies it towards an issue type, a sentiment (customer turns only when
+    speakers are labelled) and a status (the last status phrase wins). Key
+    points are the highest-scoring sentences: issue phrases, numbers (account
+    ids, amounts, dates) and words frequent across the call score, customer
+    turns count extra. Works on LLM prose as well as transcripts.
+    """
+    sentences = _sentences(transcript)
+    if not sentences:
+        return CallSummary(
+            customer_name="Customer",
+            issue_type="General Inquiry",
+            key_points=["Customer called for assistance"],
+            current_status="In Progress",
+            recommended_actions=list(ISSUE_ACTIONS["General Inquiry"]),
+            customer_sentiment="Neutral",
+            provider_used=provider,
+            generation_time=generation_time
+        )
+
+    starts = [offset for offset, _, _ in sentences]
+    issue_scores: Counter = Counter()
+    sentiment_scores: Counter = Counter()
+    sentence_scores = [0.0] * len(sentences)
+    status = "In Progress"
+    labelled = any(speaker is not None for _, speaker, _ in sentences)
+
+    for match in _PHRASE_INDEX.finditer(transcript.lower()):
+        index = bisect_right(starts, match.start()) - 1
+        speaker = sentences[index][1] if index >= 0 else None
+        for table, label, weight in _PHRASE_ENTRIES[match.group()]:
+            if table == "issue":
+                issue_scores[label] += weight
+                if index >= 0:
+                    sentence_scores[index] += 2 * weight
+            elif table == "sentiment":
+                if not labelled or _is_customer(speaker):
+                    sentiment_scores[label] += weight * _SENTIMENT_WEIGHTS.get(label, 1.0)
+            else:
+                status = label
+
+    words = [_WORD.findall(text.lower()) for _, _, text in sentences]
+    frequency = Counter(word for sentence in words for word in sentence if word not in _STOPWORDS and len(word) > 2)
+    for index, (_, speaker, text) in enumerate(sentences):
+        content = {word for word in words[index] if word in frequency}
+        if len(words[index]) < 4:
+            sentence_scores[index] = -1.0  # Too short to stand on its own ("Sure.", "Thanks!")
+            continue
+        sentence_scores[index] += sum(frequency[word] - 1 for word in content) / len(words[index]) ** 0.5
+        if _DIGIT.search(text):
+            sentence_scores[index] += 1.5
+        if labelled and _is_customer(speaker):
+            sentence_scores[index] *= 1.25
+
+    ranked = sorted(range(len(sentences)), key=lambda index: -sentence_scores[index])
+    chosen = sorted(index for index in ranked[:3] if sentence_scores[index] > 0)
+    key_points = []
+    for index in chosen:
+        _, speaker, text = sentences[index]
+        text = text if len(text) <= 160 else text[:157].rstrip() + "..."
+        key_points.append(f"{speaker}: {text}" if speaker else text)
+
+    issue_type = _top_label(issue_scores, "General Inquiry")
+    return CallSummary(
+        customer_name=_extract_name(sentences),
+        issue_type=issue_type,
+        key_points=key_points or ["Customer called for assistance"],
+        current_status=status,
+        recommended_actions=list(ISSUE_ACTIONS[issue_type]),
+        customer_sentiment=_top_label(sentiment_scores, "Neutral"),
+        provider_used=provider,
+        generation_time=generation_time
+    )
@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from logs import get_logger
+from metrics import IDEMPOTENT_REQUESTS
+from state import StateBackend
+
+
+log = get_logger("idempotency")
+
+
+class IdempotencyConflict(Exception):
+    """An Idempotency-Key was reused for a different request"""
+
+
+class IdempotencyInProgress(Exception):
+    """The keyed request is still running on another worker"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("A request with this Idempotency-Key is still in progress")
+        self.retry_after = retry_after
+
+
+class IdempotentRequests:
+    """
+    Idempotency-Key replay plus single-flight coalescing of identical requests
+
+    Identical requests arriving while one is running on this worker share
+    its execution and result, key or no key. A keyed response is also kept
+    (in a bounded LRU and in the state backend, for ttl) and replayed to
+    retries on any worker; a retry arriving while another worker still runs
+    the request waits for its result, up to lease_ttl. Reusing a key with a
+    different request is an IdempotencyConflict. Failures are not kept, so
+    a retry after an error runs again. The shared execution is shielded: a
+    client hanging up doesn't cancel it for the others, and its result is
+    still kept for their retries.
+    """
+
+    def __init__(
+        self,
+        state: StateBackend,
+        max_entries: int = 10000,
+        ttl: float = 3600.0,
+        lease_ttl: float = 60.0,
+        poll_interval: float = 0.25
+    ):
+        self.state = state
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.lease_ttl = lease_ttl
+        self.poll_interval = poll_interval
+        self._responses: OrderedDict[str, tuple[float, str, dict]] = OrderedDict()  # key -> (expires at, fingerprint, response)
+        self._in_flight: dict[str, tuple[str, asyncio.Task]] = {}
+        self.executed = 0
+        self.replayed = 0
+        self.coalesced = 0
+        self.conflicts = 0
+
+    @staticmethod
+    def fingerprint(payload: dict) -> str:
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    async def run(
+        self,
+        endpoint: str,
+        key: str | None,
+        payload: dict,
+        call: Callable[[], Awaitable[dict]]
+    ) -> tuple[dict, bool]:
+        """
+        (response, replayed) for the request, running call() only if nobody else has
+
+        call() must return a JSON-serializable response. replayed is True when
+        the response came from an earlier or concurrent identical request.
+        """
+        fingerprint = self.fingerprint(payload)
+        flight_key = f"{endpoint}:{key}" if key is not None else f"{endpoint}:request:{fingerprint}"
+
+        if key is not None:
+            response = self._remembered(flight_key, fingerprint)
+            if response is not None:
+                self._count(endpoint, "replayed")
+                return response, True
+
+        flight = self._in_flight.get(flight_key)
+        if flight is not None:
+            self._check(flight[0], fingerprint)
+            self._count(endpoint, "coalesced")
+            response, _ = await asyncio.shield(flight[1])
+            return response, True
+
+        task = asyncio.create_task(
+            self._execute(flight_key, fingerprint, call) if key is not None else self._call(call)
+        )
+        self._in_flight[flight_key] = (fingerprint, task)
+        task.add_done_callback(lambda _: self._in_flight.pop(flight_key, None))
+        response, replayed = await asyncio.shield(task)
+        self._count(endpoint, "replayed" if replayed else "executed")
+        return response, replayed
+
+    async def _call(self, call: Callable[[], Awaitable[dict]]) -> tuple[dict, bool]:
+        return await call(), False
+
+    async def _execute(self, flight_key: str, fingerprint: str, call: Callable[[], Awaitable[dict]]) -> tuple[dict, bool]:
+        """Run a keyed request once across workers: replay a stored response, or take the lease and run it"""
+        result_key = f"idempotency:{flight_key}"
+        lease_key = f"idempotency_lease:{flight_key}"
+        deadline = time.monotonic() + self.lease_ttl
+        while True:
+            stored = await self.state.get(result_key)
+            if stored is not None:
+                stored = json.loads(stored)
+                self._check(stored["fingerprint"], fingerprint)
+                self._remember(flight_key, fingerprint, stored["response"])
+                return stored["response"], True
+
+            if await self.state.add(lease_key, fingerprint, ttl=self.lease_ttl):
+                break
+            # Another worker is running it: wait for its response (or for it to fail and free the lease)
+            owner = await self.state.get(lease_key)
+            if owner is not None:
+                self._check(owner, fingerprint)
+            if time.monotonic() >= deadline:
+                raise IdempotencyInProgress(retry_after=self.poll_interval * 4)
+            await asyncio.sleep(self.poll_interval)
+
+        try:
+            response = await call()
+            self._remember(flight_key, fingerprint, response)
+            try:
+                await self.state.set(
+                    result_key,
+                    json.dumps({"fingerprint": fingerprint, "response": response}),
+                    ttl=self.ttl
+                )
+            except Exception as e:
+                # Still replayed on this worker; only other workers would miss it
+                log.warning("Failed to store idempotent response", extra={"key": flight_key, "error": str(e)})
+            return response, False
+        finally:
+            await self.state.delete(lease_key)
+
+    def _check(self, stored: str, fingerprint: str):
+        if stored != fingerprint:
+            self.conflicts += 1
+            raise IdempotencyConflict("Idempotency-Key was already used for a different request")
+
+    def _remembered(self, flight_key: str, fingerprint: str) -> dict | None:
+        entry = self._responses.get(flight_key)
+        if entry is None:
+            return None
+        expires_at, stored, response = entry
+        if expires_at <= time.time():
+            del self._responses[flight_key]
+            return None
+        self._check(stored, fingerprint)
+        self._responses.move_to_end(flight_key)
+        return response
+
+    def _remember(self, flight_key: str, fingerprint: str, response: dict):
+        self._responses[flight_key] = (time.time() + self.ttl, fingerprint, response)
+        self._responses.move_to_end(flight_key)
+        while len(self._responses) > self.max_entries:
+            self._responses.popitem(last=False)
+
+    def _count(self, endpoint: str, outcome: str):
+        setattr(self, outcome, getattr(self, outcome) + 1)
+        IDEMPOTENT_REQUESTS.labels(endpoint, outcome).inc()
+
+    def stats(self) -> dict:
+        return {
+            "cached_responses": len(self._responses),
+            "max_entries": self.max_entries,
+            "in_flight": len(self._in_flight),
+            "executed": self.executed,
+            "replayed": self.replayed,
+            "coalesced": self.coalesced,
+            "conflicts": self.conflicts
+        }
@@ -0,0 +1,215 @@
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from config import settings
+
+
+ROOT_LOGGER = "warm_transfer"
+
+# Attributes every LogRecord has; anything else on a record came from `extra=` and is a field
+_RECORD_ATTRIBUTES = set(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime"}
+# Control keys consumed by the filters rather than emitted
+_CONTROL_FIELDS = {"sample_rate"}
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the app's root, e.g. get_logger("services")"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def record_fields(record: logging.LogRecord) -> dict:
+    """Structured fields attached to a record via `extra=`"""
+    return {
+        key: value for key, value in record.__dict__.items()
+        if key not in _RECORD_ATTRIBUTES and key not in _CONTROL_FIELDS
+    }
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, then the record's fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **record_fields(record)
+        }
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable line with the record's fields appended as key=value"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        line = super().formatMessage(record)
+        fields = record_fields(record)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a record with probability `extra={"sample_rate": ...}` (records without one always pass)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        sample_rate = getattr(record, "sample_rate", None)
+        return sample_rate is None or random.random() < sample_rate
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per message template, so one failing dependency can't flood the sinks
+
+    Each (logger, template) pair may emit `rate` records per second with
+    bursts of `burst`; the next record let through after drops carries a
+    `suppressed` field with how many were dropped.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self._buckets: dict[tuple[str, str], list] = {}  # key -> [tokens, last refill, suppressed]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        key = (record.name, str(record.msg))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) > 10000:
+                self._buckets.clear()
+            bucket = self._buckets[key] = [float(self.burst), now, 0]
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] < 1:
+            bucket[2] += 1
+            return False
+        bucket[0] -= 1
+        if bucket[2]:
+            record.suppressed = bucket[2]
+            bucket[2] = 0
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Enqueue without ever blocking the caller; records are dropped (and counted) when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message and traceback now, the listener thread only formats
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _build_sink(spec: str) -> logging.Handler:
+    """Handler for one sink: stderr, stdout or file:<path>"""
+    if spec == "stderr":
+        return logging.StreamHandler(sys.stderr)
+    if spec == "stdout":
+        return logging.StreamHandler(sys.stdout)
+    if spec.startswith("file:"):
+        return logging.FileHandler(spec[5:], encoding="utf-8")
+    raise ValueError(f"Unknown log sink {spec!r}, expected stderr, stdout or file:<path>")
+
+
+class LoggingPipeline:
+    """
+    App logging: callers only filter and enqueue; a background thread formats and writes
+
+    Sampling and rate limiting run on the caller before anything is queued,
+    and a full queue drops records instead of blocking, so the event loop
+    never waits on a sink.
+    """
+
+    def __init__(self):
+        self.handler: DroppingQueueHandler | None = None
+        self.listener: QueueListener | None = None
+        self._lock = threading.Lock()
+
+    def start(self, level: str, sinks: str, log_format: str, queue_size: int, rate: float, burst: int):
+        with self._lock:
+            if self.listener is not None:
+                return
+            formatter = JSONFormatter() if log_format == "json" else TextFormatter()
+            handlers = []
+            for spec in (part.strip() for part in sinks.split(",")):
+                if spec:
+                    sink = _build_sink(spec)
+                    sink.setFormatter(formatter)
+                    handlers.append(sink)
+
+            log_queue = queue.Queue(maxsize=queue_size)
+            self.handler = DroppingQueueHandler(log_queue)
+            self.handler.addFilter(SamplingFilter())
+            self.handler.addFilter(RateLimitFilter(rate, burst))
+            self.listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+
+            logger = logging.getLogger(ROOT_LOGGER)
+            logger.setLevel(level.upper())
+            logger.addHandler(self.handler)
+            logger.propagate = False
+            self.listener.start()
+
+    def stop(self):
+        """Drain the queue and stop the writer thread"""
+        with self._lock:
+            if self.listener is None:
+                return
+            logging.getLogger(ROOT_LOGGER).removeHandler(self.handler)
+            self.listener.stop()
+            for sink in self.listener.handlers:
+                sink.close()
+            self.listener = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.handler.queue.qsize() if self.handler else 0,
+            "dropped": self.handler.dropped if self.handler else 0
+        }
+
+
+pipeline = LoggingPipeline()
+
+
+def setup_logging():
+    """Start the pipeline from settings (idempotent)"""
+    pipeline.start(
+        level=settings.log_level,
+        sinks=settings.log_sinks,
+        log_format=settings.log_format,
+        queue_size=settings.log_queue_size,
+        rate=settings.log_rate_limit,
+        burst=settings.log_rate_burst
+    )
@@ -1,8 +1,15 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from contextlib import asynccontextmanager
+import asyncio
+import json
 import time
 from datetime import datetime
+from typing import Literal
 import os
+import uuid
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -11,23 +18,127 @@ load_dotenv()
 # Import our modules
 from config import settings
 from models import (
+    BatchSummaryRequest,
     RoomCreateRequest, 
     RoomCreateResponse, 
     TransferRequest, 
     TransferResponse,
+    TransferSummaryResponse,
+    TransferStatusResponse,
+    TransferStatusUpdate,
+    TranscriptDeltaRequest,
+    RoomTranscriptResponse,
+    RollingSummaryResponse,
     TranscriptionRequest,
     TranscriptionResponse,
     HealthResponse
 )
-from services import LiveKitService, LLMService, TransferService, TranscriptionService
+from admission import AdmissionClass, AdmissionController, AdmissionMiddleware
+from breaker import BREAKER_STATES
+from cache import SummaryCache
+from connections import ConnectionPool
+from idempotency import IdempotencyConflict, IdempotencyInProgress, IdempotentRequests
+from logs import get_logger, pipeline as log_pipeline, setup_logging
+from metrics import BREAKER_STATE, PROVIDER_HEALTH, QUEUE_DEPTH, REGISTRY
+from scheduler import QueueFullError
+from state import create_state_backend
+from services import (
+    BatchSummaryService,
+    LiveKitService,
+    LLMService,
+    ProviderBusyError,
+    RollingSummaryService,
+    TransferService,
+    TranscriptionService,
+    parse_batch_lines
+)
+from streaming import sse_event
+from transcript import TranscriptStore
+
+
+log = get_logger("api")
+
+# Shared outbound HTTP sessions, opened and closed with the app lifespan
+connections = ConnectionPool()
+
+# State shared across workers (transfers, rolling summaries)
+state = create_state_backend(settings.state_backend_url, settings.state_memory_max_entries)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open pooled upstream sessions on startup and release them on shutdown"""
+    setup_logging()
+    await connections.start()
+    transfer_service.registry.start()
+    transfer_service.room_pool.start()
+    if settings.room_reaper_enabled:
+        transfer_service.reaper.start()
+    try:
+        yield
+    finally:
+        await livekit_service.close()
+        await transfer_service.room_pool.close()
+        await transfer_service.reaper.close()
+        await transfer_service.registry.close()
+        await rolling_service.close()
+        await transcription_service.close()
+        await llm_service.close()
+        if summary_cache is not None:
+            summary_cache.close()
+        await state.close()
+        await connections.close()
+        log_pipeline.stop()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Warm Transfer System API",
     description="Real-time warm call transfer with AI-powered summaries",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+def admission_class(method: str, path: str) -> str | None:
+    """Priority class of a request; None for ones admission control leaves alone"""
+    if path.endswith(("/stream", "/events")):
+        return None  # Long-lived SSE streams would hold a slot for the whole call
+    if method == "GET" and path.startswith("/transfers/") and path.endswith("/summary"):
+        return None  # Summary long-polls wait up to transfer_summary_max_wait; they must not starve POST /transfer
+    if path == "/transfer" or path.startswith("/transfers/"):
+        return "transfer"
+    if path in ("/create-room", "/join-room"):
+        return "room"
+    if path.startswith("/rooms/"):
+        return "transcribe" if method == "POST" and path.endswith("/transcript") else "participants"
+    if path in ("/transcribe", "/transcribe/raw"):
+        return "transcribe"
+    return None
+
+
+# Per-class request budgets so a flood of transcription chunks can't starve /transfer
+admission = AdmissionController(settings.admission_max_concurrency, [
+    AdmissionClass(
+        "transfer", 0,
+        settings.admission_transfer_limit, settings.admission_transfer_queue, settings.admission_transfer_timeout
+    ),
+    AdmissionClass(
+        "room", 1,
+        settings.admission_room_limit, settings.admission_room_queue, settings.admission_room_timeout
+    ),
+    AdmissionClass(
+        "participants", 2,
+        settings.admission_participants_limit, settings.admission_participants_queue, settings.admission_participants_timeout
+    ),
+    AdmissionClass(
+        "transcribe", 3,
+        settings.admission_transcribe_limit, settings.admission_transcribe_queue, settings.admission_transcribe_timeout
+    )
+])
+if settings.admission_enabled:
+    # Added before CORS so CORS wraps it and shed responses stay readable by the browser
+    app.add_middleware(AdmissionMiddleware, controller=admission, classify=admission_class)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -38,10 +149,25 @@ app.add_middleware(
 )
 
 # Initialize services
-livekit_service = LiveKitService()
-llm_service = LLMService()
-transcription_service = TranscriptionService()
-transfer_service = TransferService(livekit_service, llm_service)
+summary_cache = SummaryCache(
+    max_entries=settings.summary_cache_max_entries,
+    ttl=settings.summary_cache_ttl,
+    sqlite_path=settings.summary_cache_sqlite_path
+) if settings.summary_cache_enabled else None
+livekit_service = LiveKitService(connections)
+llm_service = LLMService(connections, summary_cache)
+transcription_service = TranscriptionService(connections)
+transcript_store = TranscriptStore(state, settings.room_transcript_max_turns, settings.room_transcript_ttl)
+rolling_service = RollingSummaryService(llm_service, state, transcript_store)
+transfer_service = TransferService(livekit_service, llm_service, state, rolling_service, transcript_store)
+batch_service = BatchSummaryService(llm_service, state)
+idempotent_requests = IdempotentRequests(
+    state,
+    max_entries=settings.idempotency_max_entries,
+    ttl=settings.idempotency_ttl,
+    lease_ttl=settings.idempotency_lease_ttl,
+    poll_interval=settings.state_poll_interval
+)
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -54,10 +180,49 @@ async def health_check():
     )
 
 
-@app.post("/create-room", response_model=RoomCreateResponse)
-async def create_room(request: RoomCreateRequest):
-    """Create a new LiveKit room and generate participant token"""
+async def run_idempotent(
+    endpoint: str,
+    idempotency_key: str | None,
+    request: BaseModel,
+    response: Response,
+    call
+) -> dict:
+    """Run call() once per Idempotency-Key (and once per burst of identical requests)"""
+    if idempotency_key is not None and not 0 < len(idempotency_key) <= 255:
+        raise HTTPException(status_code=400, detail="Idempotency-Key must be 1-255 characters")
     try:
+        result, replayed = await idempotent_requests.run(
+            endpoint,
+            idempotency_key,
+            request.model_dump(mode="json"),
+            call
+        )
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IdempotencyInProgress as e:
+        raise HTTPException(
+            status_code=409,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(e.retry_after)))}
+        )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+
+@app.post("/create-room", response_model=RoomCreateResponse)
+async def create_room(
+    request: RoomCreateRequest,
+    response: Response,
+    idempotency_key: str | None = Header(None)
+):
+    """
+    Create a new LiveKit room and generate participant token
+    
+    A retry with the same Idempotency-Key, or an identical request while
+    this one runs, gets this response instead of creating another room.
+    """
+    async def create() -> dict:
         # Create room
         room_id = await livekit_service.create_room(request.room_name)
         
@@ -73,7 +238,12 @@ async def create_room(request: RoomCreateRequest):
             token=token,
             ws_url=settings.livekit_ws_url,
             expires_at=int(time.time()) + 3600  # 1 hour
-        )
+        ).model_dump(mode="json")
+    
+    try:
+        return await run_idempotent("create-room", idempotency_key, request, response, create)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create room: {str(e)}")
 
@@ -98,13 +268,24 @@ async def join_room(request: RoomCreateRequest):
 
 
 @app.post("/transfer", response_model=TransferResponse)
-async def initiate_transfer(request: TransferRequest):
-    """Initiate warm transfer with AI summary"""
-    try:
+async def initiate_transfer(
+    request: TransferRequest,
+    response: Response,
+    idempotency_key: str | None = Header(None)
+):
+    """
+    Initiate warm transfer with AI summary
+    
+    A double click or client retry with the same Idempotency-Key, or an
+    identical request while this one runs, gets this transfer back instead
+    of a second room, summary and token pair (header Idempotent-Replayed).
+    """
+    async def initiate() -> dict:
         result = await transfer_service.initiate_transfer(
             request.caller_room_id,
             request.agent_a_id,
-            request.transcript  # Real transcript instead of mock
+            request.transcript,  # None: use the transcript recorded server-side for the room
+            async_summary=request.async_summary
         )
         
         return TransferResponse(
@@ -112,15 +293,170 @@ async def initiate_transfer(request: TransferRequest):
             transfer_room_id=result["transfer_room_id"],
             agent_a_token=result["agent_a_token"],
             agent_b_token=result["agent_b_token"],
-            summary=result["summary"]
-        )
+            summary=result["summary"],
+            summary_status=result["summary_status"],
+            preliminary_summary=result["preliminary_summary"]
+        ).model_dump(mode="json")
+    
+    try:
+        return await run_idempotent("transfer", idempotency_key, request, response, initiate)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Transfer failed: {str(e)}")
 
 
+def transfer_status(transfer) -> TransferStatusResponse:
+    """API view of a transfer record"""
+    return TransferStatusResponse(
+        transfer_id=transfer.transfer_id,
+        caller_room_id=transfer.caller_room_id,
+        transfer_room_id=transfer.transfer_room_id,
+        agent_a_id=transfer.agent_a_id,
+        status=transfer.status,
+        summary_status="ready" if transfer.summary is not None else "pending",
+        created_at=datetime.fromtimestamp(transfer.created_at),
+        room_released=transfer.room_released
+    )
+
+
+@app.get("/transfers/{transfer_id}", response_model=TransferStatusResponse)
+async def get_transfer(transfer_id: str):
+    """Look up a transfer's status"""
+    try:
+        return transfer_status(await transfer_service.get_transfer(transfer_id))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Transfer not found")
+
+
+@app.post("/transfers/{transfer_id}/status", response_model=TransferStatusResponse)
+async def update_transfer_status(transfer_id: str, request: TransferStatusUpdate):
+    """Advance a transfer (initiated → accepted → completed or cancelled)"""
+    return await change_transfer_status(transfer_id, request.status)
+
+
+@app.post("/transfers/{transfer_id}/complete", response_model=TransferStatusResponse)
+async def complete_transfer(transfer_id: str):
+    """Mark the handoff done; the caller room's transcript is dropped and the transfer room deleted after a short grace period"""
+    return await change_transfer_status(transfer_id, "completed")
+
+
+@app.post("/transfers/{transfer_id}/cancel", response_model=TransferStatusResponse)
+async def cancel_transfer(transfer_id: str):
+    """Abandon the transfer (the caller stays with Agent A); its room is deleted like a completed one"""
+    return await change_transfer_status(transfer_id, "cancelled")
+
+
+async def change_transfer_status(transfer_id: str, status: str) -> TransferStatusResponse:
+    try:
+        return transfer_status(await transfer_service.update_status(transfer_id, status))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Transfer not found")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@app.get("/transfers/{transfer_id}/summary", response_model=TransferSummaryResponse)
+async def get_transfer_summary(transfer_id: str, wait: float = 0.0):
+    """Fetch a transfer's summary, long-polling up to `wait` seconds while it is pending"""
+    wait = min(max(wait, 0.0), settings.transfer_summary_max_wait)
+    try:
+        summary = await transfer_service.get_summary(transfer_id, wait)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Transfer not found")
+    
+    return TransferSummaryResponse(
+        transfer_id=transfer_id,
+        summary_status="ready" if summary is not None else "pending",
+        summary=summary
+    )
+
+
+@app.get("/transfers/{transfer_id}/summary/stream")
+async def stream_transfer_summary(transfer_id: str):
+    """Stream a transfer's summary over Server-Sent Events, one field at a time"""
+    if await transfer_service.registry.get(transfer_id) is None:
+        raise HTTPException(status_code=404, detail="Transfer not found")
+    
+    async def events():
+        async for event, data in transfer_service.stream_summary_events(transfer_id):
+            yield sse_event(event, data)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/rooms/{room_id}/transcript", response_model=RollingSummaryResponse)
+async def append_transcript(room_id: str, request: TranscriptDeltaRequest):
+    """Feed live transcript turns into the room's rolling summary"""
+    return await rolling_service.append(room_id, request.text, request.speaker_id)
+
+
+@app.get("/rooms/{room_id}/transcript", response_model=RoomTranscriptResponse)
+async def get_room_transcript(room_id: str):
+    """The room's server-side transcript, as written by /transcribe and transcript deltas"""
+    turns = await transcript_store.turns(room_id)
+    if not turns:
+        raise HTTPException(status_code=404, detail="No transcript for this room")
+    return RoomTranscriptResponse(room_id=room_id, turns=turns)
+
+
+async def record_transcript(room_id: str, speaker_id: str, text: str):
+    """Keep a transcription result in the room's transcript and rolling summary; never fails the caller"""
+    try:
+        await rolling_service.append(room_id, text, speaker_id)
+    except Exception as e:
+        log.warning("Failed to record transcript", extra={"room": room_id, "error": str(e)})
+
+
+@app.get("/rooms/{room_id}/summary", response_model=RollingSummaryResponse)
+async def get_rolling_summary(room_id: str):
+    """Current rolling summary for a live call"""
+    try:
+        return await rolling_service.status(room_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="No transcript for this room")
+
+
+@app.post("/summaries/batch")
+async def batch_summaries(request: Request, batch_id: str | None = None):
+    """
+    Summarize many transcripts, streaming NDJSON results as they complete
+    
+    The body is JSON ({"batch_id": ..., "items": [{"id": ..., "transcript": ...}]})
+    or, with Content-Type application/x-ndjson, one item per line and the
+    batch_id as a query parameter. Posting the same batch_id again resumes an
+    interrupted batch. No LiveKit rooms or tokens are created.
+    """
+    body = await request.body()
+    try:
+        if request.headers.get("content-type", "").startswith(("application/x-ndjson", "application/jsonl")):
+            items = parse_batch_lines(body.decode().splitlines())
+        else:
+            batch = BatchSummaryRequest.model_validate_json(body)
+            items, batch_id = batch.items, batch.batch_id or batch_id
+        batch_service.validate(items)
+    except (ValidationError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid batch: {str(e)}")
+    batch_id = batch_id or str(uuid.uuid4())
+    
+    async def lines():
+        async for result in batch_service.run(items, batch_id):
+            yield result.model_dump_json() + "\n"
+    
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"X-Batch-Id": batch_id, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/rooms/{room_id}/participants")
 async def get_room_participants(room_id: str):
-    """Get participants in a room"""
+    """Get participants in a room (served from the webhook-fed registry when current)"""
     try:
         participants = await livekit_service.get_participants(room_id)
         return {"participants": participants}
@@ -128,14 +464,69 @@ async def get_room_participants(room_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to get participants: {str(e)}")
 
 
+@app.get("/rooms/{room_id}/events")
+async def stream_room_events(room_id: str):
+    """
+    Push a room's participant changes over Server-Sent Events
+    
+    Starts with a "snapshot" event listing the current participants, then
+    "participant_joined" / "participant_left" as webhooks report them, and
+    "room_finished" before the stream ends. A comment line is sent every
+    room_events_keepalive seconds while nothing happens.
+    """
+    rooms = livekit_service.rooms
+    
+    async def events():
+        # Subscribe before taking the snapshot so no change falls in between
+        queue = rooms.subscribe(room_id)
+        try:
+            participants = await livekit_service.get_participants(room_id)
+            yield sse_event("snapshot", {"participants": [p.model_dump() for p in participants]})
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=settings.room_events_keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if item is None:
+                    return
+                event, data = item
+                yield sse_event(event, data)
+                if event == "room_finished":
+                    return
+        finally:
+            rooms.unsubscribe(room_id, queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/livekit/webhook")
+async def livekit_webhook(request: Request):
+    """Receive LiveKit webhooks (signed with our API secret) to keep the room registry current"""
+    body = (await request.body()).decode()
+    try:
+        event = livekit_service.rooms.receive(body, request.headers.get("Authorization"))
+    except PermissionError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    return {"received": event.event}
+
+
 @app.post("/transcribe", response_model=TranscriptionResponse)
 async def transcribe_audio(request: TranscriptionRequest):
     """Transcribe audio data using OpenAI Whisper API"""
     try:
         result = await transcription_service.transcribe_audio(
             request.audio_data,
-            request.audio_format
+            request.audio_format,
+            request.priority,
+            request.sample_rate,
+            request.channels
         )
+        await record_transcript(request.room_id, request.speaker_id, result["transcript"])
         
         return TranscriptionResponse(
             transcript=result["transcript"],
@@ -145,10 +536,212 @@ async def transcribe_audio(request: TranscriptionRequest):
             processing_time=result.get("processing_time", 0.0),
             language=result.get("language", "en")
         )
+    except (QueueFullError, ProviderBusyError) as e:
+        raise transcription_overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
 
 
+@app.post("/transcribe/raw", response_model=TranscriptionResponse)
+async def transcribe_raw_audio(
+    request: Request,
+    speaker_id: str,
+    room_id: str,
+    audio_format: str = "webm",
+    priority: Literal["live", "backfill"] = "live",
+    sample_rate: int = Query(16000, gt=0),
+    channels: int = Query(1, gt=0)
+):
+    """
+    Transcribe a raw binary audio body (application/octet-stream or audio/*)
+    
+    Skips the base64 encoding of /transcribe: the request body is forwarded to
+    Whisper with no temp file on the way (PCM/WAV after silence trimming).
+    sample_rate and channels describe raw pcm bodies.
+    """
+    try:
+        audio = await request.body()
+        if not audio:
+            raise HTTPException(status_code=400, detail="Empty audio body")
+        
+        result = await transcription_service.transcribe_bytes(
+            memoryview(audio),
+            audio_format,
+            priority=priority,
+            sample_rate=sample_rate,
+            channels=channels
+        )
+        await record_transcript(room_id, speaker_id, result["transcript"])
+        
+        return TranscriptionResponse(
+            transcript=result["transcript"],
+            speaker_id=speaker_id,
+            confidence=result["confidence"],
+            timestamp=datetime.now(),
+            processing_time=result.get("processing_time", 0.0),
+            language=result.get("language", "en")
+        )
+    except HTTPException:
+        raise
+    except (QueueFullError, ProviderBusyError) as e:
+        raise transcription_overloaded(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
+
+
+def transcription_overloaded(error: Exception) -> HTTPException:
+    """503 with Retry-After for shed or provider-throttled transcription jobs"""
+    retry_after = getattr(error, "retry_after", None) or 1.0
+    return HTTPException(
+        status_code=503,
+        detail=f"Transcription overloaded: {str(error)}",
+        headers={"Retry-After": str(max(1, round(retry_after)))}
+    )
+
+
+@app.websocket("/ws/transcribe/{room_id}")
+async def transcribe_websocket(
+    websocket: WebSocket,
+    room_id: str,
+    speaker_id: str,
+    audio_format: str = "pcm",
+    sample_rate: int = Query(16000, gt=0)
+):
+    """
+    Continuous transcription over a WebSocket
+    
+    Binary frames carry audio (16-bit mono PCM by default, segmented
+    server-side on silence; otherwise one self-contained blob per frame).
+    Text frames are control messages: {"type": "flush"} closes the current
+    utterance, {"type": "end"} drains outstanding segments and closes.
+    Ordered StreamingTranscriptionMessage JSON is pushed back as segments finish.
+    """
+    await websocket.accept()
+    stream = transcription_service.open_stream(speaker_id, audio_format, sample_rate)
+    
+    async def send_results():
+        while (message := await stream.results.get()) is not None:
+            await websocket.send_text(message.model_dump_json())
+            await record_transcript(room_id, speaker_id, message.transcript)
+    
+    sender = asyncio.create_task(send_results())
+    
+    async def stop_sender():
+        """Abandon in-flight segments and wait for the sender, logging whatever it failed on"""
+        stream.cancel()
+        sender.cancel()
+        try:
+            await sender
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            log.warning("Transcription result sender failed", extra={"room": room_id, "error": str(e)})
+    
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes"):
+                stream.feed(message["bytes"])
+            elif message.get("text"):
+                control = websocket_control(message["text"])
+                if control is None:
+                    await stop_sender()
+                    await websocket.close(code=1003, reason='Control frames must be JSON objects like {"type": "flush"}')
+                    return
+                if control == "flush":
+                    stream.flush()
+                elif control == "end":
+                    break
+        
+        await stream.finish()
+        await sender
+        await websocket.close()
+    except WebSocketDisconnect:
+        await stop_sender()
+
+
+def websocket_control(text: str) -> str | None:
+    """The type of a control frame, or None unless it is a JSON object with a string type"""
+    try:
+        control = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(control, dict) or not isinstance(control.get("type"), str):
+        return None
+    return control["type"]
+
+
+@app.get("/admin/transcription")
+async def transcription_stats():
+    """Transcription queue depth, wait times and retry counters"""
+    return transcription_service.stats()
+
+
+@app.get("/admin/admission")
+async def admission_stats():
+    """Per-class admission budgets, queue depths and shed counters"""
+    return admission.stats()
+
+
+@app.get("/admin/idempotency")
+async def idempotency_stats():
+    """Replayed, coalesced and executed counts for idempotent endpoints"""
+    return idempotent_requests.stats()
+
+
+@app.get("/admin/transfers")
+async def transfer_registry_stats():
+    """Transfer registry size and expiry counters"""
+    return await transfer_service.registry.stats()
+
+
+@app.get("/admin/providers")
+async def provider_health():
+    """Circuit breaker state, error/slow rates and health score per summary provider"""
+    return llm_service.health.stats()
+
+
+@app.get("/admin/rooms")
+async def room_registry_stats():
+    """Room registry size, subscribers and webhook counters"""
+    return livekit_service.rooms.stats()
+
+
+@app.get("/admin/room-pool")
+async def room_pool_stats():
+    """Pre-created transfer room pool size, hit rate and refill latency"""
+    return transfer_service.room_pool.stats()
+
+
+@app.get("/admin/reaper")
+async def room_reaper_stats():
+    """Rooms the reaper deleted, by reason, and failed deletions"""
+    return transfer_service.reaper.stats()
+
+
+@app.get("/admin/summary-cache")
+async def summary_cache_stats():
+    """Summary cache hit/miss counters"""
+    if summary_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **summary_cache.stats()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Stage latency histograms, provider outcome counters and in-flight gauges (Prometheus text format)"""
+    QUEUE_DEPTH.labels("transcription").set(transcription_service.scheduler.stats()["queue_depth"])
+    QUEUE_DEPTH.labels("log").set(log_pipeline.stats()["queued"])
+    for name, budget in admission.stats()["classes"].items():
+        QUEUE_DEPTH.labels(f"admission_{name}").set(budget["queued"])
+    for provider, health in llm_service.health.stats().items():
+        PROVIDER_HEALTH.labels(provider).set(health["score"])
+        BREAKER_STATE.labels(provider).set(BREAKER_STATES.index(health["state"]))
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -0,0 +1,296 @@
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+
+
+# Seconds; spans token minting (sub-ms) through the LLM summary deadline
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Timer:
+    """Context manager observing its elapsed time into a histogram child"""
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, child: "_HistogramChild"):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._start)
+
+
+class _InFlight:
+    """Context manager holding a gauge child up by one while the block runs"""
+    __slots__ = ("_child",)
+
+    def __init__(self, child: "_GaugeChild"):
+        self._child = child
+
+    def __enter__(self):
+        self._child.value += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._child.value -= 1
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+    def track(self) -> _InFlight:
+        return _InFlight(self)
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+
+class _Metric(ABC):
+    """A metric family; label combinations are created on first use and cached"""
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """A fresh value holder for one label combination"""
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: tuple[str, ...], child) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def _render_child(self, values: tuple[str, ...], child: _HistogramChild) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-local metrics rendered in the Prometheus text format (0.0.4)
+
+    Updates are plain attribute arithmetic on cached label children, safe
+    because everything runs on one event loop. With several uvicorn workers
+    each process reports its own series.
+    """
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "warm_transfer_stage_duration_seconds",
+    "Latency of each backend stage (LiveKit calls, LLM providers, transcription, end to end).",
+    ("stage",)
+))
+
+ADMISSIONS = REGISTRY.register(Counter(
+    "warm_transfer_admissions_total",
+    "Requests by priority class and admission outcome (admitted, rejected: class over budget, timed_out: queued past its deadline).",
+    ("priority_class", "outcome")
+))
+
+IDEMPOTENT_REQUESTS = REGISTRY.register(Counter(
+    "warm_transfer_idempotent_requests_total",
+    "Idempotency-guarded requests by endpoint and outcome (executed, replayed: earlier response, coalesced: shared a concurrent run).",
+    ("endpoint", "outcome")
+))
+
+PROVIDER_CALLS = REGISTRY.register(Counter(
+    "warm_transfer_provider_calls_total",
+    "Upstream calls by provider and outcome (success, failure, throttled, cancelled, rejected by its breaker).",
+    ("provider", "outcome")
+))
+
+SUMMARY_RESULTS = REGISTRY.register(Counter(
+    "warm_transfer_summaries_total",
+    "Summaries returned, by where they came from (openai, groq, cache, emergency_fallback).",
+    ("source",)
+))
+
+SUMMARY_FALLBACKS = REGISTRY.register(Counter(
+    "warm_transfer_summary_fallbacks_total",
+    "Times summary generation moved on to the next provider, by that provider and why (error, slow, circuit_open).",
+    ("provider", "reason")
+))
+
+IN_FLIGHT = REGISTRY.register(Gauge(
+    "warm_transfer_in_flight",
+    "Operations currently running.",
+    ("operation",)
+))
+
+QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "warm_transfer_queue_depth",
+    "Items waiting in a queue (transcription jobs, log records; sampled at scrape time).",
+    ("queue",)
+))
+
+AUDIO_BYTES = REGISTRY.register(Counter(
+    "warm_transfer_audio_bytes_total",
+    "Transcription audio bytes received, sent on to Whisper, and saved by preprocessing (PCM dropped by downmixing, downsampling and silence trimming).",
+    ("stage",)
+))
+
+AUDIO_SILENT_CHUNKS = REGISTRY.register(Counter(
+    "warm_transfer_audio_silent_chunks_total",
+    "Audio chunks found to be silent and answered without calling Whisper."
+)).labels()
+
+PARTICIPANT_LOOKUPS = REGISTRY.register(Counter(
+    "warm_transfer_participant_lookups_total",
+    "Participant lookups by where they were served from (webhook-tracked registry, polled cache, LiveKit API).",
+    ("source",)
+))
+
+ROOM_POOL_CLAIMS = REGISTRY.register(Counter(
+    "warm_transfer_room_pool_claims_total",
+    "Transfer room claims by outcome (hit: pre-created room, miss: created on demand).",
+    ("outcome",)
+))
+
+ROOM_POOL_SIZE = REGISTRY.register(Gauge(
+    "warm_transfer_room_pool_size",
+    "Pre-created transfer rooms ready to be claimed."
+)).labels()
+
+ROOMS_REAPED = REGISTRY.register(Counter(
+    "warm_transfer_rooms_reaped_total",
+    "LiveKit rooms deleted by the reaper, by why (completed, cancelled, expired transfer; empty room).",
+    ("reason",)
+))
+
+PROVIDER_HEALTH = REGISTRY.register(Gauge(
+    "warm_transfer_provider_health",
+    "Provider health score in [0, 1] used to order summary providers (sampled at scrape time).",
+    ("provider",)
+))
+
+BREAKER_STATE = REGISTRY.register(Gauge(
+    "warm_transfer_breaker_state",
+    "Provider circuit breaker state: 0 closed, 1 half-open, 2 open (sampled at scrape time).",
+    ("provider",)
+))
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Literal
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
 from datetime import datetime
 
 
@@ -27,7 +27,8 @@ class ParticipantInfo(BaseModel):
 class TransferRequest(BaseModel):
     caller_room_id: str
     agent_a_id: str
-    transcript: str  # Real transcript from actual conversation
+    transcript: Optional[str] = None  # Omit to use the room's server-side transcript (fed by /transcribe)
+    async_summary: bool = False  # Return tokens immediately, fetch summary later
 
 
 class CallSummary(BaseModel):
@@ -41,12 +42,71 @@ class CallSummary(BaseModel):
     generation_time: float
 
 
+class TranscriptDeltaRequest(BaseModel):
+    text: str  # New turn(s) since the last delta
+    speaker_id: Optional[str] = None
+
+
+class RoomTranscriptResponse(BaseModel):
+    room_id: str
+    turns: list[str]  # "speaker: text", oldest first
+
+
+class RollingSummaryResponse(BaseModel):
+    room_id: str
+    summarized_chars: int
+    pending_chars: int
+    summary: Optional[CallSummary] = None
+
+
 class TransferResponse(BaseModel):
     transfer_id: str
     transfer_room_id: str
     agent_a_token: str
     agent_b_token: str
-    summary: CallSummary
+    summary: Optional[CallSummary] = None  # None while an async summary is pending
+    summary_status: Literal["pending", "ready"] = "ready"
+    preliminary_summary: Optional[CallSummary] = None  # Local extractive summary, available instantly
+
+
+class TransferSummaryResponse(BaseModel):
+    transfer_id: str
+    summary_status: Literal["pending", "ready"]
+    summary: Optional[CallSummary] = None
+
+
+class TransferStatusResponse(BaseModel):
+    transfer_id: str
+    caller_room_id: str
+    transfer_room_id: str
+    agent_a_id: str
+    status: Literal["initiated", "accepted", "completed", "cancelled", "expired"]
+    summary_status: Literal["pending", "ready"]
+    created_at: datetime
+    room_released: bool = False  # The transfer room has been deleted
+
+
+class TransferStatusUpdate(BaseModel):
+    status: Literal["accepted", "completed", "cancelled"]
+
+
+# Batch summarization models (post-call QA backfill)
+class BatchSummaryItem(BaseModel):
+    id: str  # Caller-chosen, unique within the batch
+    transcript: str
+
+
+class BatchSummaryRequest(BaseModel):
+    batch_id: Optional[str] = None  # Re-post with the same id to resume
+    items: list[BatchSummaryItem]
+
+
+class BatchSummaryResult(BaseModel):
+    id: str
+    status: Literal["ok", "fallback", "error"]  # fallback: emergency summary, retried on resume
+    summary: Optional[CallSummary] = None
+    error: Optional[str] = None
+    resumed: bool = False  # Replayed from an earlier run of the same batch
 
 
 # Transcription models (for future real-time audio transcription)
@@ -54,7 +114,10 @@ class TranscriptionRequest(BaseModel):
     audio_data: str  # Base64 encoded audio data
     speaker_id: str  # Keep consistent with frontend
     room_id: str
-    audio_format: str = "webm"  # webm, wav, mp3, etc.
+    audio_format: str = "webm"  # webm, wav, mp3, pcm (16-bit little-endian), etc.
+    priority: Literal["live", "backfill"] = "live"
+    sample_rate: int = Field(16000, gt=0)  # raw pcm only; wav carries its own
+    channels: int = Field(1, gt=0)
 
 
 class TranscriptionResponse(BaseModel):
@@ -66,6 +129,11 @@ class TranscriptionResponse(BaseModel):
     language: str = "en"
 
 
+class StreamingTranscriptionMessage(TranscriptionResponse):
+    type: Literal["partial", "final"]  # partial: utterance was cut at max duration
+    sequence: int  # Segment order within the WebSocket stream
+
+
 # System models
 class HealthResponse(BaseModel):
     status: str
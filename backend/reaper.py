@@ -0,0 +1,168 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from logs import get_logger
+from metrics import ROOMS_REAPED, STAGE_SECONDS
+from registry import TransferRegistry
+from rooms import RoomRegistry
+from state import StateBackend
+
+
+log = get_logger("reaper")
+
+
+LEASE_KEY = "reaper:lease"
+
+
+class RoomReaper:
+    """
+    Background task deleting LiveKit rooms nobody needs any more
+
+    Every check_interval it deletes:
+    - transfer rooms of completed, cancelled and expired transfers, grace
+      seconds after the transfer finished so agents can leave first. One
+      worker at a time walks the registry's transfer index, under a state
+      lease, after pruning the finished ones off its front. Reading each
+      record also expires transfers abandoned past their TTL, so they are
+      reclaimed too.
+    - rooms this worker's webhook registry saw empty out (caller rooms once
+      the call is over) after they stay empty for empty_grace.
+    Each cycle deletes at most batch_size rooms of each kind, with up to
+    concurrency delete_room calls at once, and calls on_deleted with each
+    deleted room so per-room state goes with it. Failed deletions are retried
+    next cycle. A transfer finishing wakes the reaper once its grace is up, so
+    it doesn't wait for the next interval.
+    """
+
+    def __init__(
+        self,
+        delete: Callable[[str], Awaitable[None]],
+        transfers: TransferRegistry,
+        rooms: RoomRegistry,
+        state: StateBackend,
+        grace: float,
+        empty_grace: float,
+        concurrency: int = 4,
+        batch_size: int = 100,
+        check_interval: float = 30.0,
+        on_deleted: Callable[[str], Awaitable[None]] | None = None
+    ):
+        self.delete = delete
+        self.transfers = transfers
+        self.rooms = rooms
+        self.state = state
+        self.grace = grace
+        self.empty_grace = empty_grace
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.check_interval = check_interval
+        self.on_deleted = on_deleted
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.reclaimed: dict[str, int] = {}
+        self.failures = 0
+        self.cycles = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def schedule(self):
+        """A transfer just finished: reap once its grace period is over"""
+        if self._task is not None:
+            asyncio.get_running_loop().call_later(self.grace, self._wake.set)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.check_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.reap()
+            except Exception as e:
+                log.warning("Room reaper cycle failed", extra={"error": str(e)})
+
+    async def reap(self) -> int:
+        """One cycle; returns how many rooms were deleted"""
+        self.cycles += 1
+        deleted = 0
+        with STAGE_SECONDS.labels("room_reaper").time():
+            if await self.state.add(LEASE_KEY, "1", ttl=self.check_interval):
+                try:
+                    deleted += await self._reap_transfers()
+                finally:
+                    await self.state.delete(LEASE_KEY)
+            deleted += await self._reap_empty_rooms()
+        if deleted:
+            log.info("Rooms reclaimed", extra={"rooms": deleted})
+        return deleted
+
+    async def _reap_transfers(self) -> int:
+        cutoff = time.time() - self.grace
+        finished = []
+        await self.transfers.prune_index()
+        for transfer_id in await self.transfers.transfer_ids():
+            record = await self.transfers.get(transfer_id)  # Expires it first if it went stale
+            if record is not None and record.terminal and not record.room_released and record.updated_at <= cutoff:
+                finished.append(record)
+                if len(finished) >= self.batch_size:
+                    break
+
+        results = await self._delete_all([(record.transfer_room_id, record.status) for record in finished])
+        for record, deleted in zip(finished, results):
+            if deleted:
+                await self.transfers.mark_room_released(record)
+        return sum(results)
+
+    async def _reap_empty_rooms(self) -> int:
+        empty = self.rooms.empty_rooms(self.empty_grace)[:self.batch_size]
+        results = await self._delete_all([(room_name, "empty") for room_name in empty])
+        for room_name, deleted in zip(empty, results):
+            if deleted:
+                self.rooms.discard(room_name)
+        return sum(results)
+
+    async def _delete_all(self, rooms: list[tuple[str, str]]) -> list[bool]:
+        """Delete (room, reason) pairs, concurrency at a time; True where the room is gone"""
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def delete_one(room_name: str, reason: str) -> bool:
+            async with slots:
+                try:
+                    await self.delete(room_name)
+                except Exception as e:
+                    self.failures += 1
+                    log.warning("Failed to delete room", extra={"room": room_name, "reason": reason, "error": str(e)})
+                    return False
+            self.reclaimed[reason] = self.reclaimed.get(reason, 0) + 1
+            ROOMS_REAPED.labels(reason).inc()
+            if self.on_deleted is not None:
+                try:
+                    await self.on_deleted(room_name)
+                except Exception as e:
+                    log.warning("Failed to discard room state", extra={"room": room_name, "error": str(e)})
+            return True
+
+        return list(await asyncio.gather(*(delete_one(room_name, reason) for room_name, reason in rooms)))
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "cycles": self.cycles,
+            "reclaimed": dict(self.reclaimed),
+            "reclaimed_total": sum(self.reclaimed.values()),
+            "failures": self.failures,
+            "empty_rooms_pending": len(self.rooms.empty_rooms(0.0))
+        }
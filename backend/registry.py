@@ -0,0 +1,238 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+
+from logs import get_logger
+from models import CallSummary
+from state import StateBackend
+
+
+log = get_logger("registry")
+
+
+INDEX_KEY = "transfer_index"
+INDEX_LEASE_KEY = "transfer_index:lease"
+
+
+# Allowed status transitions; anything not listed here is terminal
+TRANSFER_TRANSITIONS = {
+    "initiated": {"accepted", "completed", "cancelled", "expired"},
+    "accepted": {"completed", "cancelled", "expired"}
+}
+
+
+@dataclass(slots=True)
+class TransferRecord:
+    """Compact per-transfer state; summary streaming fields are dropped once the summary is ready"""
+    transfer_id: str
+    caller_room_id: str
+    transfer_room_id: str
+    agent_a_id: str
+    status: str = "initiated"
+    summary: CallSummary | None = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    room_released: bool = False  # The reaper deleted the transfer room
+    # Only set on the worker that is streaming the summary; never persisted
+    summary_task: asyncio.Task | None = None
+    summary_events: list | None = None
+    summary_changed: asyncio.Condition | None = None
+
+    @property
+    def terminal(self) -> bool:
+        return self.status not in TRANSFER_TRANSITIONS
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "transfer_id": self.transfer_id,
+            "caller_room_id": self.caller_room_id,
+            "transfer_room_id": self.transfer_room_id,
+            "agent_a_id": self.agent_a_id,
+            "status": self.status,
+            "summary": self.summary.model_dump() if self.summary is not None else None,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "room_released": self.room_released
+        })
+
+    @classmethod
+    def from_json(cls, data: str) -> "TransferRecord":
+        fields = json.loads(data)
+        if fields["summary"] is not None:
+            fields["summary"] = CallSummary.model_validate(fields["summary"])
+        return cls(**fields)
+
+
+class TransferRegistry:
+    """
+    Transfer records kept in the shared state backend with TTL expiry
+
+    Live transfers expire after `ttl` seconds without a status change (checked
+    lazily on every read, so any worker can expire them); terminal ones are
+    kept for `retention` seconds so clients can still look them up. Records
+    streaming a summary on this worker are also held locally so subscribers
+    share their events.
+
+    New transfer ids are appended to an index list in the backend, so the
+    reaper and stats walk the transfers still in play instead of scanning
+    every key. Finished ones (gone, or terminal with their room released)
+    are pruned from the front of the index by the sweeper and the reaper.
+    """
+
+    def __init__(self, state: StateBackend, ttl: float, retention: float, sweep_interval: float):
+        self.state = state
+        self.ttl = ttl
+        self.retention = retention
+        self.sweep_interval = sweep_interval
+        self._local: dict[str, TransferRecord] = {}
+        self._sweeper: asyncio.Task | None = None
+        self.expired = 0
+
+    @staticmethod
+    def _key(transfer_id: str) -> str:
+        return f"transfer:{transfer_id}"
+
+    async def add(self, record: TransferRecord):
+        """Register a new transfer"""
+        await self.save(record)
+        # No TTL: records outlive their add() through later saves; prune_index() bounds the list
+        await self.state.append(INDEX_KEY, record.transfer_id)
+
+    async def save(self, record: TransferRecord):
+        """Persist a record"""
+        storage_ttl = self.retention if record.terminal else self.ttl + self.retention
+        await self.state.set(self._key(record.transfer_id), record.to_json(), ttl=storage_ttl)
+
+    def track(self, record: TransferRecord):
+        """Pin a record whose summary is streaming on this worker"""
+        self._local[record.transfer_id] = record
+
+    async def store_summary(self, record: TransferRecord):
+        """Persist a finished summary without clobbering a status changed by another worker"""
+        self._local.pop(record.transfer_id, None)
+        data = await self.state.get(self._key(record.transfer_id))
+        if data is None:
+            # Expired or evicted while the summary was generating
+            return
+        stored = TransferRecord.from_json(data)
+        stored.summary = record.summary
+        record.status = stored.status
+        record.updated_at = stored.updated_at
+        await self.save(stored)
+
+    async def get(self, transfer_id: str) -> TransferRecord | None:
+        """Load a transfer, expiring it first if it went stale"""
+        data = await self.state.get(self._key(transfer_id))
+        if data is None:
+            self._release(self._local.pop(transfer_id, None))
+            return None
+
+        stored = TransferRecord.from_json(data)
+        record = self._local.get(transfer_id)
+        if record is None:
+            record = stored
+        else:
+            # Status may have been changed by another worker
+            record.status = stored.status
+            record.updated_at = stored.updated_at
+            if record.summary is None:
+                record.summary = stored.summary
+
+        if not record.terminal and time.time() - record.updated_at > self.ttl:
+            record.status = "expired"
+            record.updated_at = time.time()
+            self.expired += 1
+            self._release(record)
+            await self.save(record)
+        return record
+
+    async def transition(self, transfer_id: str, status: str) -> TransferRecord:
+        """
+        Move a transfer to a new status
+
+        Raises KeyError for unknown transfers and ValueError for transitions
+        not allowed from the current status.
+        """
+        record = await self.get(transfer_id)
+        if record is None:
+            raise KeyError(transfer_id)
+        if status not in TRANSFER_TRANSITIONS.get(record.status, ()):
+            raise ValueError(f"Cannot move transfer from {record.status} to {status}")
+        record.status = status
+        record.updated_at = time.time()
+        if record.terminal:
+            self._release(record)
+        await self.save(record)
+        return record
+
+    async def transfer_ids(self) -> list[str]:
+        """Indexed transfers, oldest first (may include some already finished or gone)"""
+        return await self.state.get_list(INDEX_KEY)
+
+    async def prune_index(self) -> int:
+        """Drop finished transfers from the front of the index; returns how many"""
+        if not await self.state.add(INDEX_LEASE_KEY, "1", ttl=self.sweep_interval):
+            return 0  # Another worker is pruning
+        try:
+            finished = 0
+            for transfer_id in await self.transfer_ids():
+                record = await self.get(transfer_id)  # Expires it first if it went stale
+                if record is not None and not (record.terminal and record.room_released):
+                    break
+                finished += 1
+            if finished:
+                await self.state.trim_list(INDEX_KEY, finished)
+            return finished
+        finally:
+            await self.state.delete(INDEX_LEASE_KEY)
+
+    async def mark_room_released(self, record: TransferRecord):
+        """Record that the transfer room is gone so the reaper doesn't delete it again"""
+        record.room_released = True
+        await self.save(record)
+
+    def _release(self, record: TransferRecord | None):
+        """Cancel pending summary work for a record that is finished or gone"""
+        if record is not None and record.summary_task is not None and not record.summary_task.done():
+            record.summary_task.cancel()
+
+    async def _sweep_forever(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.state.sweep()
+                await self.prune_index()
+            except Exception as e:
+                log.warning("State sweep failed", extra={"error": str(e)})
+
+    def start(self):
+        """Start the background sweeper (inside the running event loop)"""
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def close(self):
+        """Stop the sweeper and cancel any pending summaries"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        for record in self._local.values():
+            self._release(record)
+        self._local.clear()
+
+    async def stats(self) -> dict:
+        """Counts by status of indexed transfers, plus expiry counters"""
+        by_status = {}
+        transfer_ids = await self.transfer_ids()
+        for transfer_id in transfer_ids:
+            record = await self.get(transfer_id)
+            if record is not None:
+                by_status[record.status] = by_status.get(record.status, 0) + 1
+        return {
+            "transfers": sum(by_status.values()),
+            "indexed": len(transfer_ids),
+            "by_status": by_status,
+            "expired_by_this_worker": self.expired,
+            "streaming_locally": len(self._local),
+            **self.state.stats()
+        }
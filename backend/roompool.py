@@ -0,0 +1,152 @@
+import asyncio
+import time
+import uuid
+from collections import deque
+from typing import Awaitable, Callable
+
+from logs import get_logger
+from metrics import ROOM_POOL_CLAIMS, ROOM_POOL_SIZE, STAGE_SECONDS
+
+
+log = get_logger("roompool")
+
+
+class RoomPool:
+    """
+    Pre-created transfer rooms so a transfer claims one instead of waiting on create_room
+
+    A background task keeps between low_watermark and high_watermark rooms
+    ready: it refills (up to refill_concurrency creations at once) whenever a
+    claim or expiry drops the pool below low_watermark, and re-checks every
+    check_interval. LiveKit closes a room nobody joined after empty_timeout,
+    so pooled rooms are only handed out while they have at least
+    claim_margin seconds of that left; older ones are dropped and replaced
+    (LiveKit deletes them itself). Only rooms LiveKit confirmed are pooled.
+    The pool is per worker.
+    """
+
+    def __init__(
+        self,
+        create: Callable[[str], Awaitable[str]],
+        low_watermark: int,
+        high_watermark: int,
+        empty_timeout: float,
+        claim_margin: float,
+        refill_concurrency: int = 2,
+        check_interval: float = 10.0,
+        prefix: str = "transfer_"
+    ):
+        self.create = create
+        self.low_watermark = low_watermark
+        self.high_watermark = max(high_watermark, low_watermark)
+        self.empty_timeout = empty_timeout
+        self.claim_margin = claim_margin
+        self.refill_concurrency = refill_concurrency
+        self.check_interval = check_interval
+        self.prefix = prefix
+        self._rooms: deque[tuple[str, float]] = deque()  # (name, created at), oldest first
+        self._creating = 0
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.created = 0
+        self.failures = 0
+        self.total_refill_time = 0.0
+
+    def start(self):
+        if self._task is None and self.high_watermark > 0:
+            self._wake.set()  # Fill straight away rather than after the first check_interval
+            self._task = asyncio.create_task(self._maintain())
+
+    async def close(self):
+        """Stop refilling; rooms still pooled are left for LiveKit to expire"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def claim(self) -> str | None:
+        """Take a ready room, or None if the pool is empty (the caller creates one itself)"""
+        self._expire()
+        if self._rooms:
+            name, _ = self._rooms.popleft()
+            self.hits += 1
+            ROOM_POOL_CLAIMS.labels("hit").inc()
+        else:
+            name = None
+            self.misses += 1
+            ROOM_POOL_CLAIMS.labels("miss").inc()
+        ROOM_POOL_SIZE.set(len(self._rooms))
+        if len(self._rooms) < self.low_watermark:
+            self._wake.set()
+        return name
+
+    def _expire(self):
+        """Drop rooms too close to LiveKit's empty_timeout to be worth handing out"""
+        cutoff = time.monotonic() - (self.empty_timeout - self.claim_margin)
+        while self._rooms and self._rooms[0][1] < cutoff:
+            self._rooms.popleft()
+            self.expired += 1
+
+    async def _maintain(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.check_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            self._expire()
+            if len(self._rooms) < self.low_watermark:
+                await self._refill()
+            ROOM_POOL_SIZE.set(len(self._rooms))
+
+    async def _refill(self):
+        """Create rooms until the pool reaches high_watermark (a failed batch waits for the next check)"""
+        while len(self._rooms) + self._creating < self.high_watermark:
+            batch = min(self.refill_concurrency, self.high_watermark - len(self._rooms) - self._creating)
+            results = await asyncio.gather(*(self._create_one() for _ in range(batch)))
+            if not all(results):
+                return
+
+    async def _create_one(self) -> bool:
+        name = f"{self.prefix}{uuid.uuid4().hex[:8]}"
+        self._creating += 1
+        created_at = time.monotonic()  # LiveKit's empty_timeout runs from its side of this call
+        started = time.perf_counter()
+        try:
+            await self.create(name)
+        except Exception as e:
+            self.failures += 1
+            log.warning("Room pool refill failed", extra={"room": name, "error": str(e)})
+            return False
+        finally:
+            self._creating -= 1
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.labels("room_pool_refill").observe(elapsed)
+        self.total_refill_time += elapsed
+        self.created += 1
+        self._rooms.append((name, created_at))
+        ROOM_POOL_SIZE.set(len(self._rooms))
+        return True
+
+    def stats(self) -> dict:
+        self._expire()
+        claims = self.hits + self.misses
+        return {
+            "size": len(self._rooms),
+            "creating": self._creating,
+            "low_watermark": self.low_watermark,
+            "high_watermark": self.high_watermark,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / claims, 3) if claims else None,
+            "created": self.created,
+            "expired": self.expired,
+            "refill_failures": self.failures,
+            "avg_refill_latency": round(self.total_refill_time / self.created, 4) if self.created else None
+        }
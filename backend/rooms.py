@@ -0,0 +1,217 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from livekit import api
+from livekit.protocol.webhook import WebhookEvent
+
+from logs import get_logger
+from metrics import PARTICIPANT_LOOKUPS
+from models import ParticipantInfo
+
+
+log = get_logger("rooms")
+
+
+# Webhook events that change who is in a room
+PARTICIPANT_EVENTS = ("participant_joined", "participant_left", "participant_connection_aborted")
+ROOM_EVENTS = ("room_started", "room_finished")
+
+
+@dataclass(slots=True)
+class RoomState:
+    """What this worker knows about one room"""
+    participants: dict[str, ParticipantInfo] = field(default_factory=dict)
+    # Newest event time per identity, kept after a leave so a late join can't resurrect it
+    seen: dict[str, int] = field(default_factory=dict)
+    tracked: bool = False  # Kept current by webhooks, as opposed to a polled snapshot
+    synced_at: float = 0.0  # Last webhook or API refresh (monotonic)
+    emptied_at: float | None = None  # When webhooks saw the last participant leave (monotonic)
+    subscribers: set = field(default_factory=set)
+
+
+class RoomRegistry:
+    """
+    Room/participant registry fed by LiveKit webhooks, with the RoomService API as fallback
+
+    Webhooks are verified (JWT signed with our API secret, carrying the body's
+    SHA-256) before they touch the registry; retried deliveries are dropped by
+    event id and out-of-order ones by event time. A room a webhook has told us
+    about is served from memory until resync_interval passes without any
+    event or refresh (in case one was missed). Other rooms are fetched from
+    the API and cached for poll_ttl, with concurrent lookups sharing a single
+    call. The registry is per worker: a room whose webhooks land on another
+    worker is served from the short-TTL cache here.
+
+    Join/leave events are also pushed to subscribers (see subscribe()).
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        fetch: Callable[[str], Awaitable[list[ParticipantInfo]]],
+        poll_ttl: float,
+        resync_interval: float,
+        max_rooms: int = 10000,
+        subscriber_queue_size: int = 100
+    ):
+        self.receiver = api.WebhookReceiver(api.TokenVerifier(api_key, api_secret))
+        self.fetch = fetch
+        self.poll_ttl = poll_ttl
+        self.resync_interval = resync_interval
+        self.max_rooms = max_rooms
+        self.subscriber_queue_size = subscriber_queue_size
+        self._rooms: OrderedDict[str, RoomState] = OrderedDict()
+        self._fetching: dict[str, asyncio.Task] = {}
+        self._recent_events: OrderedDict[str, None] = OrderedDict()
+        self.events_received = 0
+        self.events_rejected = 0
+        self.events_duplicate = 0
+
+    def receive(self, body: str, authorization: str | None) -> WebhookEvent:
+        """Verify and apply a webhook delivery (PermissionError if the signature doesn't check out)"""
+        token = (authorization or "").removeprefix("Bearer ").strip()
+        try:
+            event = self.receiver.receive(body, token)
+        except Exception as e:
+            self.events_rejected += 1
+            raise PermissionError(f"Rejected webhook: {str(e)}") from None
+        self.apply(event)
+        return event
+
+    def apply(self, event: WebhookEvent):
+        """Fold one (already verified) webhook event into the registry"""
+        if event.id:
+            if event.id in self._recent_events:
+                self.events_duplicate += 1
+                return
+            self._recent_events[event.id] = None
+            if len(self._recent_events) > 1000:
+                self._recent_events.popitem(last=False)
+        self.events_received += 1
+
+        room_name = event.room.name
+        if not room_name or event.event not in PARTICIPANT_EVENTS + ROOM_EVENTS:
+            return
+        if event.event == "room_finished":
+            room = self._rooms.pop(room_name, None)
+            if room is not None:
+                self._publish(room, "room_finished", {"room_id": room_name})
+            return
+
+        room = self._room(room_name)
+        room.tracked = True
+        room.synced_at = time.monotonic()
+        if event.event == "room_started":
+            return
+
+        identity = event.participant.identity
+        if event.created_at < room.seen.get(identity, 0):
+            return  # Older than what we already applied for this participant
+        room.seen[identity] = event.created_at
+        if event.event == "participant_joined":
+            participant = ParticipantInfo(
+                identity=identity,
+                role=event.participant.metadata or "participant",
+                connected=True
+            )
+            room.participants[identity] = participant
+            room.emptied_at = None
+            self._publish(room, "participant_joined", participant.model_dump())
+        elif room.participants.pop(identity, None) is not None:
+            if not room.participants:
+                room.emptied_at = time.monotonic()
+            self._publish(room, "participant_left", {"identity": identity})
+
+    def _room(self, room_name: str) -> RoomState:
+        room = self._rooms.get(room_name)
+        if room is None:
+            room = self._rooms[room_name] = RoomState()
+            while len(self._rooms) > self.max_rooms:
+                # Evict the least recently used room nobody is subscribed to
+                victim = next((name for name, state in self._rooms.items() if not state.subscribers), None)
+                if victim is None or victim == room_name:
+                    break
+                del self._rooms[victim]
+        self._rooms.move_to_end(room_name)
+        return room
+
+    def _fresh(self, room: RoomState) -> bool:
+        max_age = self.resync_interval if room.tracked else self.poll_ttl
+        return time.monotonic() - room.synced_at < max_age
+
+    async def get_participants(self, room_name: str) -> list[ParticipantInfo]:
+        """Participants from memory when current, otherwise one shared API fetch"""
+        room = self._rooms.get(room_name)
+        if room is not None and self._fresh(room):
+            PARTICIPANT_LOOKUPS.labels("webhook" if room.tracked else "cache").inc()
+            return list(room.participants.values())
+
+        PARTICIPANT_LOOKUPS.labels("api").inc()
+        task = self._fetching.get(room_name)
+        if task is None:
+            task = self._fetching[room_name] = asyncio.create_task(self._refresh(room_name))
+            task.add_done_callback(lambda _: self._fetching.pop(room_name, None))
+        return await asyncio.shield(task)
+
+    async def _refresh(self, room_name: str) -> list[ParticipantInfo]:
+        started = time.monotonic()
+        participants = await self.fetch(room_name)
+        room = self._room(room_name)
+        if room.synced_at > started:
+            # A webhook landed while we were fetching and is newer than this snapshot
+            return list(room.participants.values())
+        room.participants = {participant.identity: participant for participant in participants}
+        room.synced_at = time.monotonic()
+        return participants
+
+    def empty_rooms(self, min_age: float) -> list[str]:
+        """Webhook-tracked rooms whose participants all left at least min_age seconds ago"""
+        cutoff = time.monotonic() - min_age
+        return [
+            name for name, room in self._rooms.items()
+            if room.tracked and not room.participants and room.emptied_at is not None and room.emptied_at <= cutoff
+        ]
+
+    def discard(self, room_name: str):
+        """Forget a room we deleted ourselves (its room_finished webhook may come later or not at all)"""
+        room = self._rooms.pop(room_name, None)
+        if room is not None:
+            self._publish(room, "room_finished", {"room_id": room_name})
+
+    def subscribe(self, room_name: str) -> asyncio.Queue:
+        """Queue receiving (event, data) for the room's join/leave events"""
+        queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        self._room(room_name).subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, room_name: str, queue: asyncio.Queue):
+        room = self._rooms.get(room_name)
+        if room is not None:
+            room.subscribers.discard(queue)
+
+    def _publish(self, room: RoomState, event: str, data: dict):
+        for queue in list(room.subscribers):
+            try:
+                queue.put_nowait((event, data))
+            except asyncio.QueueFull:
+                # A subscriber this far behind gets cut off rather than slowing everyone down
+                # (its stream ends and it can reconnect for a fresh snapshot)
+                room.subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+                log.warning("Dropped a slow room event subscriber", extra={"event": event})
+
+    def stats(self) -> dict:
+        return {
+            "rooms": len(self._rooms),
+            "tracked_rooms": sum(1 for room in self._rooms.values() if room.tracked),
+            "subscribers": sum(len(room.subscribers) for room in self._rooms.values()),
+            "events_received": self.events_received,
+            "events_rejected": self.events_rejected,
+            "events_duplicate": self.events_duplicate
+        }
@@ -0,0 +1,116 @@
+import asyncio
+import itertools
+import time
+from typing import Awaitable, Callable
+
+from metrics import STAGE_SECONDS
+
+
+class QueueFullError(Exception):
+    """Raised when a job is shed because the scheduler's queue is full"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} queue is full")
+        self.retry_after = retry_after
+
+
+class JobScheduler:
+    """
+    Bounded priority job queue drained by a fixed number of workers
+
+    Lower priority values run first; equal priorities run FIFO. submit() sheds
+    load with QueueFullError instead of queueing past max_queue.
+    """
+
+    def __init__(self, name: str, concurrency: int, max_queue: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self._queue: asyncio.PriorityQueue | None = None
+        self._order = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def submit(self, job: Callable[[], Awaitable], priority: int = 0):
+        """Queue job() and wait for its result"""
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        if self._queue.qsize() >= self.max_queue:
+            self.rejected += 1
+            raise QueueFullError(self.name, retry_after=self._retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((priority, next(self._order), time.monotonic(), job, future))
+        self._ensure_workers()
+        return await future
+
+    def _ensure_workers(self):
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.create_task(self._work()))
+
+    async def _work(self):
+        while True:
+            _, _, queued_at, job, future = await self._queue.get()
+            if future.done():
+                # Caller gave up while queued
+                continue
+
+            wait = time.monotonic() - queued_at
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            STAGE_SECONDS.labels(f"{self.name}_queue_wait").observe(wait)
+
+            self.in_flight += 1
+            task = asyncio.create_task(job())
+            future.add_done_callback(lambda f, task=task: task.cancel() if f.cancelled() else None)
+            try:
+                result = await task
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling() or not future.cancelled():
+                    # The worker itself is being shut down (maybe along with the caller)
+                    future.cancel()
+                    raise
+            except Exception as e:
+                self.failed += 1
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                self.completed += 1
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self.in_flight -= 1
+
+    def _retry_after(self) -> float:
+        """Rough time for the queue to drain, from the average wait so far"""
+        started = self.completed + self.failed
+        average_wait = self.total_wait / started if started else 1.0
+        return max(1.0, round(average_wait, 1))
+
+    def stats(self) -> dict:
+        """Queue depth, wait times and outcome counters"""
+        started = self.completed + self.failed
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_wait": self.total_wait / started if started else 0.0,
+            "max_wait": self.max_wait
+        }
+
+    async def close(self):
+        """Stop the workers"""
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
@@ -0,0 +1,40 @@
+import argparse
+import os
+
+import uvicorn
+from dotenv import load_dotenv
+
+
+def main():
+    """Production launcher: N uvicorn worker processes, no auto-reload"""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Run the Warm Transfer System API in production mode")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args()
+
+    from config import settings
+
+    if args.workers > 1 and settings.state_backend_url.startswith("memory"):
+        print("❌ memory:// state is private to each worker process.")
+        print("   Set STATE_BACKEND_URL to sqlite:///state.db (one host) or redis://host:6379/0 to run multiple workers.")
+        exit(1)
+
+    print(f"🚀 Starting Warm Transfer System Backend with {args.workers} worker(s)...")
+    print(f"🗄️  Shared state: {settings.state_backend_url}")
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        reload=False,
+        log_level=args.log_level
+    )
+
+
+if __name__ == "__main__":
+    main()
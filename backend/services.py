@@ -1,125 +1,276 @@
+import asyncio
+import hashlib
+from datetime import datetime
+from email.utils import parsedate_to_datetime
 import time
 import uuid
 import json
 import os
+import random
 import base64
-import tempfile
 import aiohttp
 from livekit import api
 import openai
 import groq
 
+from audio import HAVE_NUMPY, AudioSegmenter, pcm_to_wav, preprocess_audio
+from breaker import CircuitOpenError, ProviderHealth
+from cache import SummaryCache
 from config import settings
-from models import CallSummary, ParticipantInfo
+from connections import ConnectionPool
+from extractive import extract_summary
+from logs import get_logger
+from metrics import AUDIO_BYTES, AUDIO_SILENT_CHUNKS, IN_FLIGHT, PROVIDER_CALLS, STAGE_SECONDS, SUMMARY_FALLBACKS, SUMMARY_RESULTS
+from models import BatchSummaryItem, BatchSummaryResult, CallSummary, ParticipantInfo, StreamingTranscriptionMessage
+from registry import TransferRecord, TransferRegistry
+from reaper import RoomReaper
+from roompool import RoomPool
+from rooms import RoomRegistry
+from scheduler import JobScheduler, QueueFullError
+from state import StateBackend
+from streaming import SummaryFieldParser
+from transcript import (
+    TRANSCRIPTION_UNAVAILABLE,
+    TranscriptStore,
+    chunk_transcript,
+    compact_transcript,
+    estimate_tokens
+)
+
+
+SUMMARY_SYSTEM_PROMPT = """You are a call center AI assistant. Analyze the conversation transcript and extract key information. 
+Respond ONLY with a JSON object containing these exact fields:
+{
+    "customer_name": "extracted or 'Customer'",
+    "issue_type": "brief category",
+    "key_points": ["point1", "point2", "point3"],
+    "current_status": "status description",
+    "recommended_actions": ["action1", "action2", "action3"],
+    "customer_sentiment": "sentiment description"
+}"""
+
+OPENAI_SUMMARY_MODEL = "gpt-4o-mini"
+GROQ_SUMMARY_MODEL = "llama-3.3-70b-versatile"
+
+# Cache keys embed this, so any prompt or model change invalidates cached summaries
+SUMMARY_PROMPT_FINGERPRINT = hashlib.sha256(
+    f"{SUMMARY_SYSTEM_PROMPT}|{OPENAI_SUMMARY_MODEL}|{GROQ_SUMMARY_MODEL}".encode()
+).hexdigest()
+
+# Summary fields in the order the prompt asks for them, with their defaults
+SUMMARY_FIELD_DEFAULTS = {
+    "customer_name": "Customer",
+    "issue_type": "General Inquiry",
+    "key_points": ["Customer needs assistance"],
+    "current_status": "In Progress",
+    "recommended_actions": ["Review customer needs"],
+    "customer_sentiment": "Neutral"
+}
+
+
+log = get_logger("services")
+
+
+# Extra wait past llm_summary_deadline for a summary owned by another worker (its state writes)
+SUMMARY_POLL_SLACK = 5.0
+
+# Transcripts longer than this get their preliminary summary extracted off the
+# event loop (66 KB takes ~14 ms); shorter ones aren't worth the thread hop
+PRELIMINARY_INLINE_CHARS = 4000
+
+
+# Scheduler priorities for transcription jobs (lower runs first)
+TRANSCRIPTION_PRIORITIES = {"live": 0, "backfill": 10}
+
+
+class ProviderBusyError(Exception):
+    """An upstream kept rate-limiting (429) or failing (5xx) after retries"""
+
+    def __init__(self, status: int, retry_after: float | None = None):
+        super().__init__(f"Provider busy: HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
 
 
 class LiveKitService:
     """Service for managing LiveKit rooms and tokens using latest API"""
 
-    def __init__(self):
+    def __init__(self, connections: ConnectionPool):
         # Don't initialize the API client here to avoid event loop issues
+        self.connections = connections
         self.lkapi = None
+        self.rooms = RoomRegistry(
+            settings.livekit_api_key,
+            settings.livekit_api_secret,
+            fetch=self._list_participants,
+            poll_ttl=settings.room_registry_poll_ttl,
+            resync_interval=settings.room_registry_resync_interval,
+            max_rooms=settings.room_registry_max_rooms
+        )
 
     async def _get_api(self):
-        """Lazy initialization of LiveKit API client"""
+        """Lazy initialization of LiveKit API client on the shared session"""
         if self.lkapi is None:
             self.lkapi = api.LiveKitAPI(
                 url=settings.livekit_ws_url,
                 api_key=settings.livekit_api_key,
-                api_secret=settings.livekit_api_secret
+                api_secret=settings.livekit_api_secret,
+                session=self.connections.livekit
             )
         return self.lkapi
 
     async def create_room(self, room_name: str) -> str:
         """Create a new LiveKit room using the latest API"""
         try:
-            lkapi = await self._get_api()
-            room_info = await lkapi.room.create_room(
-                api.CreateRoomRequest(
-                    name=room_name,
-                    empty_timeout=300,  # 5 minutes
-                    max_participants=10
-                )
-            )
-            return room_info.name
+            return await self.provision_room(room_name)
         except Exception as e:
-            print(f"Error creating room: {e}")
+            log.warning("Error creating room", extra={"room": room_name, "error": str(e)})
             # Return room name anyway for demo purposes
             return room_name
+
+    async def provision_room(self, room_name: str) -> str:
+        """Create a LiveKit room, raising if LiveKit didn't confirm it"""
+        try:
+            lkapi = await self._get_api()
+            with STAGE_SECONDS.labels("livekit_create_room").time():
+                room_info = await lkapi.room.create_room(
+                    api.CreateRoomRequest(
+                        name=room_name,
+                        empty_timeout=settings.room_empty_timeout,
+                        max_participants=10
+                    )
+                )
+        except Exception:
+            PROVIDER_CALLS.labels("livekit", "failure").inc()
+            raise
+        PROVIDER_CALLS.labels("livekit", "success").inc()
+        return room_info.name
+    
+    async def delete_room(self, room_name: str):
+        """Delete a LiveKit room, disconnecting anyone left in it; a room that's already gone is fine"""
+        try:
+            lkapi = await self._get_api()
+            with STAGE_SECONDS.labels("livekit_delete_room").time():
+                await lkapi.room.delete_room(api.DeleteRoomRequest(room=room_name))
+        except api.TwirpError as e:
+            if e.code == api.TwirpErrorCode.NOT_FOUND:
+                PROVIDER_CALLS.labels("livekit", "success").inc()
+                return
+            PROVIDER_CALLS.labels("livekit", "failure").inc()
+            raise
+        except Exception:
+            PROVIDER_CALLS.labels("livekit", "failure").inc()
+            raise
+        PROVIDER_CALLS.labels("livekit", "success").inc()
     
     def generate_token(self, room_name: str, participant_name: str, role: str = "participant") -> str:
         """Generate LiveKit access token using the latest API"""
-        try:
-            # Create access token with the latest API using proper syntax
-            token = api.AccessToken(
-                api_key=settings.livekit_api_key,
-                api_secret=settings.livekit_api_secret
-            )
-            token.with_identity(participant_name)
-            token.with_name(participant_name)
+        with STAGE_SECONDS.labels("livekit_token").time():
+            try:
+                # Create access token with the latest API using proper syntax
+                token = api.AccessToken(
+                    api_key=settings.livekit_api_key,
+                    api_secret=settings.livekit_api_secret
+                )
+                token.with_identity(participant_name)
+                token.with_name(participant_name)
             
-            # Create video grants
-            grants = api.VideoGrants(
-                room_join=True,
-                room=room_name,
-                can_publish=True,
-                can_subscribe=True,
-                can_publish_data=role in ["agent_a", "agent_b"]
-            )
-            token.with_grants(grants)
+                # Create video grants
+                grants = api.VideoGrants(
+                    room_join=True,
+                    room=room_name,
+                    can_publish=True,
+                    can_subscribe=True,
+                    can_publish_data=role in ["agent_a", "agent_b"]
+                )
+                token.with_grants(grants)
             
-            return token.to_jwt()
-        except Exception as e:
-            print(f"Error generating token: {e}")
-            # For demo purposes, return a mock token
-            return "demo_token_" + str(uuid.uuid4())[:8]
+                return token.to_jwt()
+            except Exception as e:
+                log.error("Error generating token", extra={"room": room_name, "error": str(e)})
+                # For demo purposes, return a mock token
+                return "demo_token_" + str(uuid.uuid4())[:8]
     
     async def get_participants(self, room_name: str) -> list[ParticipantInfo]:
-        """Get participants in a room using the latest API"""
+        """Get participants in a room, from the webhook-fed registry when it is current"""
         try:
-            lkapi = await self._get_api()
-            participants = await lkapi.room.list_participants(
-                api.ListParticipantsRequest(room=room_name)
-            )
-            return [
-                ParticipantInfo(
-                    identity=p.identity,
-                    role=p.metadata or "participant",
-                    connected=True
-                ) for p in participants.participants
-            ]
+            return await self.rooms.get_participants(room_name)
         except Exception as e:
-            print(f"Error getting participants: {e}")
+            log.warning("Error getting participants", extra={"room": room_name, "error": str(e)})
             return []
 
+    async def _list_participants(self, room_name: str) -> list[ParticipantInfo]:
+        """Ask the LiveKit API who is in a room"""
+        try:
+            lkapi = await self._get_api()
+            with STAGE_SECONDS.labels("livekit_list_participants").time():
+                participants = await lkapi.room.list_participants(
+                    api.ListParticipantsRequest(room=room_name)
+                )
+        except Exception:
+            PROVIDER_CALLS.labels("livekit", "failure").inc()
+            raise
+        PROVIDER_CALLS.labels("livekit", "success").inc()
+        return [
+            ParticipantInfo(
+                identity=p.identity,
+                role=p.metadata or "participant",
+                connected=True
+            ) for p in participants.participants
+        ]
+
     async def close(self):
-        """Close the LiveKit API client"""
+        """Close the LiveKit API client (the pooled session is closed by its owner)"""
         if self.lkapi:
             await self.lkapi.aclose()
+            self.lkapi = None
+
+
 class LLMService:
     """Service for generating call summaries using multiple LLM providers"""
 
-    def __init__(self):
+    def __init__(self, connections: ConnectionPool, cache: SummaryCache | None = None):
         # Don't initialize clients here to avoid initialization issues
+        self.connections = connections
+        self.cache = cache
         self.openai_client = None
         self.groq_client = None
+        self.health = ProviderHealth(
+            ["openai", "groq"],
+            window=settings.breaker_window,
+            min_calls=settings.breaker_min_calls,
+            error_threshold=settings.breaker_error_threshold,
+            slow_call_threshold=settings.breaker_slow_call_threshold,
+            slow_rate_threshold=settings.breaker_slow_rate_threshold,
+            open_duration=settings.breaker_open_duration,
+            half_open_probes=settings.breaker_half_open_probes
+        )
 
     def _get_openai_client(self):
         """Lazy initialization of OpenAI client"""
         if self.openai_client is None:
             try:
-                with open("debug_ai.log", "a") as f:
-                    f.write(f"🔧 Initializing OpenAI client...\n")
                 self.openai_client = openai.AsyncOpenAI(
-                    api_key=settings.openai_api_key
+                    api_key=settings.openai_api_key,
+                    base_url=settings.openai_base_url
                 )
-                with open("debug_ai.log", "a") as f:
-                    f.write(f"✅ OpenAI client initialized successfully\n")
-            except Exception as e:
-                with open("debug_ai.log", "a") as f:
-                    f.write(f"❌ Failed to initialize OpenAI client: {type(e).__name__}: {str(e)}\n")
-                    import traceback
-                    f.write(f"📋 OpenAI Init Traceback: {traceback.format_exc()}\n")
+                log.debug("OpenAI client initialized", extra={"provider": "openai"})
+            except Exception:
+                log.exception("Failed to initialize OpenAI client", extra={"provider": "openai"})
                 self.openai_client = None
         return self.openai_client
 
@@ -127,141 +278,307 @@ class LLMService:
         """Lazy initialization of Groq client"""
         if self.groq_client is None:
             try:
-                with open("debug_ai.log", "a") as f:
-                    f.write(f"🔧 Initializing Groq client...\n")
                 self.groq_client = groq.AsyncGroq(
-                    api_key=settings.groq_api_key
+                    api_key=settings.groq_api_key,
+                    base_url=settings.groq_base_url,
+                    http_client=self.connections.groq
                 )
-                with open("debug_ai.log", "a") as f:
-                    f.write(f"✅ Groq client initialized successfully\n")
-            except Exception as e:
-                with open("debug_ai.log", "a") as f:
-                    f.write(f"❌ Failed to initialize Groq client: {type(e).__name__}: {str(e)}\n")
-                    import traceback
-                    f.write(f"📋 Groq Init Traceback: {traceback.format_exc()}\n")
+                log.debug("Groq client initialized", extra={"provider": "groq"})
+            except Exception:
+                log.exception("Failed to initialize Groq client", extra={"provider": "groq"})
                 self.groq_client = None
         return self.groq_client
 
-    async def generate_summary(self, transcript: str) -> CallSummary:
-        """Generate call summary with fallback providers"""
+    async def close(self):
+        """Drop SDK clients bound to pooled sessions so a restarted pool is picked up"""
+        self.openai_client = None
+        self.groq_client = None
+
+    async def generate_summary(self, transcript: str, previous: CallSummary | None = None) -> CallSummary:
+        """
+        Generate call summary with hedged fallback providers and an overall deadline
+        
+        With `previous`, the transcript is only the part of the call after that
+        summary and the providers fold it into an updated summary. The
+        transcript is compacted first; one longer than summary_max_prompt_tokens
+        is summarized in chunks that are then merged.
+        """
         start_time = time.time()
+        transcript = compact_transcript(transcript, settings.summary_strip_filler)
 
-        # Try OpenAI first (using HTTP to avoid client library issues)
-        try:
-            summary = await self._generate_with_openai(transcript)
-            summary.provider_used = "openai"
-            summary.generation_time = time.time() - start_time
-            return summary
-        except Exception as e:
-            print(f"OpenAI failed: {str(e)}")
+        cache_key = self._cache_key(transcript, previous)
+        cached = await self._cache_get(cache_key, start_time)
+        if cached is not None:
+            return self._record_summary(cached, "cache")
+
+        # OpenAI first (using HTTP to avoid client library issues), Groq as fallback,
+        # unless current health says otherwise
+        providers = self._summary_providers()
+
+        async def summarize() -> tuple[CallSummary, str]:
+            messages = await self._summary_messages(transcript, previous)
+            return await self._run_providers(providers, messages)
 
-        # Fallback to Groq (if available)
         try:
-            summary = await self._generate_with_groq(transcript)
-            summary.provider_used = "groq"  
+            with IN_FLIGHT.labels("summary").track():
+                summary, provider = await asyncio.wait_for(
+                    summarize(),
+                    timeout=settings.llm_summary_deadline
+                )
+            summary.provider_used = provider
             summary.generation_time = time.time() - start_time
-            return summary
+            await self._cache_put(cache_key, summary)
+            return self._record_summary(summary, provider)
+        except asyncio.TimeoutError:
+            log.warning("LLM providers missed the summary deadline", extra={"deadline": settings.llm_summary_deadline})
+            reason = "slow"
+        except CircuitOpenError:
+            log.warning("Every summary provider's circuit is open")
+            reason = "circuit_open"
         except Exception as e:
-            print(f"Groq failed: {str(e)}")
+            log.warning("All LLM providers failed", extra={"error": str(e)})
+            reason = "error"
 
         # Emergency fallback
-        print("Using emergency fallback summary")
-        return self._create_emergency_summary(transcript, time.time() - start_time)
+        SUMMARY_FALLBACKS.labels("emergency_fallback", reason).inc()
+        emergency = self._create_emergency_summary(transcript, time.time() - start_time)
+        log.warning(
+            "Using emergency fallback summary",
+            extra={"provider": "emergency_fallback", "reason": reason, "latency": round(emergency.generation_time, 3)}
+        )
+        return self._record_summary(emergency, "emergency_fallback")
+
+    def _summary_providers(self) -> list:
+        """(name, generate) pairs, healthiest first"""
+        return self.health.order([
+            ("openai", self._generate_with_openai),
+            ("groq", self._generate_with_groq)
+        ])
+
+    async def _summary_messages(self, transcript: str, previous: CallSummary | None = None) -> list[dict]:
+        """
+        Prompt for the final summary call, fitting the transcript into summary_max_prompt_tokens
+
+        A transcript over budget is split into chunks, each summarized on its
+        own (map, up to summary_map_concurrency at once); the partial summaries,
+        `previous` first, are then merged in groups that fit the budget until
+        one merge prompt remains (reduce). Chunks whose summary failed are left
+        out; if every chunk failed the error propagates.
+        """
+        budget = settings.summary_max_prompt_tokens
+        if estimate_tokens(transcript) <= budget:
+            return self._build_messages(transcript, previous)
+
+        chunks = chunk_transcript(transcript, budget)
+        semaphore = asyncio.Semaphore(settings.summary_map_concurrency)
+
+        async def summarize_chunk(chunk: str) -> CallSummary:
+            async with semaphore:
+                summary, _ = await self._run_providers(self._summary_providers(), self._build_messages(chunk))
+                return summary
+
+        with STAGE_SECONDS.labels("summary_map").time():
+            results = await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        partials = [result for result in results if isinstance(result, CallSummary)]
+        if len(partials) < len(results):
+            failed = [result for result in results if not isinstance(result, CallSummary)]
+            log.warning(
+                "Dropped chunk summaries that failed",
+                extra={"chunks": len(chunks), "failed": len(failed), "error": str(failed[0])}
+            )
+            if not partials:
+                raise failed[0]
+        if previous is not None:
+            partials.insert(0, previous)
+
+        log.debug("Summarized transcript in chunks", extra={"chunks": len(chunks), "tokens": estimate_tokens(transcript)})
+        while True:
+            groups = self._group_partials(partials, budget)
+            if len(groups) == 1:
+                return self._build_merge_messages(groups[0])
+            results = await asyncio.gather(*(
+                self._run_providers(self._summary_providers(), self._build_merge_messages(group))
+                for group in groups
+            ))
+            partials = [summary for summary, _ in results]
+
+    def _group_partials(self, partials: list[CallSummary], budget: int) -> list[list[CallSummary]]:
+        """Consecutive runs of partial summaries whose JSON fits the token budget (at least two per run)"""
+        groups, current, size = [], [], 0
+        for partial in partials:
+            tokens = estimate_tokens(self._summary_json(partial))
+            if len(current) >= 2 and size + tokens > budget:
+                groups.append(current)
+                current, size = [], 0
+            current.append(partial)
+            size += tokens
+        if current:
+            if len(current) == 1 and groups:
+                groups[-1].append(current[0])
+            else:
+                groups.append(current)
+        return groups
+
+    def _record_summary(self, summary: CallSummary, source: str) -> CallSummary:
+        """Count where a summary came from and observe its end-to-end time"""
+        SUMMARY_RESULTS.labels(source).inc()
+        STAGE_SECONDS.labels("summary").observe(summary.generation_time)
+        log.debug("Summary ready", extra={"provider": source, "latency": round(summary.generation_time, 3)})
+        return summary
+
+    async def _observe_provider(self, provider: str, permit: str, call) -> CallSummary:
+        """Await one provider call, recording its latency, outcome and concurrency"""
+        outcome = "failure"
+        started = time.perf_counter()
+        try:
+            with IN_FLIGHT.labels(f"llm_{provider}").track():
+                result = await call
+            outcome = "success"
+            return result
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            latency = time.perf_counter() - started
+            self.health.record(provider, permit, outcome, latency)
+            STAGE_SECONDS.labels(f"llm_{provider}").observe(latency)
+            PROVIDER_CALLS.labels(provider, outcome).inc()
 
-    async def _generate_with_openai(self, transcript: str) -> CallSummary:
+    async def _run_providers(
+        self,
+        providers: list,
+        messages: list[dict]
+    ) -> tuple[CallSummary, str]:
+        """
+        Run providers according to settings.llm_execution_mode and return the first success
+        
+        - sequential: start the next provider only after the current one fails
+        - hedge: also start the next provider once llm_hedge_delay elapses without a result
+        - race: start every provider at once
+        
+        Providers whose circuit breaker is open are skipped. Losing providers
+        are cancelled as soon as a winner is known. Raises CircuitOpenError if
+        no provider could be tried at all.
+        """
+        mode = settings.llm_execution_mode
+        remaining = list(providers)
+        running = {}
+        attempted = False
+
+        def launch(fallback_reason: str | None = None):
+            nonlocal attempted
+            while remaining:
+                name, generate = remaining.pop(0)
+                permit = self.health.acquire(name)
+                if permit is None:
+                    PROVIDER_CALLS.labels(name, "rejected").inc()
+                    fallback_reason = fallback_reason or "circuit_open"
+                    continue
+                if fallback_reason is not None:
+                    SUMMARY_FALLBACKS.labels(name, fallback_reason).inc()
+                task = asyncio.create_task(self._observe_provider(name, permit, generate(messages)))
+                running[task] = name
+                attempted = True
+                return
+
+        try:
+            while running or remaining:
+                if not running or mode == "race":
+                    while remaining:
+                        is_primary = mode == "race" or len(remaining) == len(providers)
+                        launch(None if is_primary else "error")
+                        if mode != "race":
+                            break
+                    if not running:
+                        break
+
+                hedge_delay = settings.llm_hedge_delay if mode == "hedge" and remaining else None
+                done, _ = await asyncio.wait(
+                    running.keys(),
+                    timeout=hedge_delay,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    # Primary is slow: fire the hedge request alongside it
+                    launch("slow")
+                    continue
+
+                winner = None
+                for task in done:
+                    name = running.pop(task)
+                    error = task.exception()
+                    if error is not None:
+                        log.warning("Summary provider failed", extra={"provider": name, "error": str(error)})
+                    elif winner is None:
+                        winner = (task.result(), name)
+                if winner is not None:
+                    return winner
+        finally:
+            for task in running:
+                task.cancel()
+
+        if not attempted:
+            raise CircuitOpenError("Every summary provider's circuit is open")
+        raise Exception("No provider produced a summary")
+
+    async def _generate_with_openai(self, messages: list[dict]) -> CallSummary:
         """Generate summary using OpenAI via direct HTTP"""
         
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {settings.openai_api_key}",
-                    "Content-Type": "application/json"
-                }
+            session = self.connections.openai
+            headers = {
+                "Authorization": f"Bearer {settings.openai_api_key}",
+                "Content-Type": "application/json"
+            }
+            
+            payload = {
+                "model": OPENAI_SUMMARY_MODEL,
+                "messages": messages,
+                "temperature": 0.1,
+                "max_tokens": 500
+            }
+            
+            async with session.post(
+                f"{settings.openai_base_url}/chat/completions",
+                headers=headers,
+                json=payload
+            ) as response:
+                if response.status != 200:
+                    raise Exception(f"OpenAI API error: {response.status}")
                 
-                payload = {
-                    "model": "gpt-4o-mini",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": """You are a call center AI assistant. Analyze the conversation transcript and extract key information. 
-                            Respond ONLY with a JSON object containing these exact fields:
-                            {
-                                "customer_name": "extracted or 'Customer'",
-                                "issue_type": "brief category",
-                                "key_points": ["point1", "point2", "point3"],
-                                "current_status": "status description",
-                                "recommended_actions": ["action1", "action2", "action3"],
-                                "customer_sentiment": "sentiment description"
-                            }"""
-                        },
-                        {
-                            "role": "user",
-                            "content": f"Analyze this call transcript and extract the information: {transcript}"
-                        }
-                    ],
-                    "temperature": 0.1,
-                    "max_tokens": 500
-                }
+                result = await response.json()
+                ai_response = result["choices"][0]["message"]["content"].strip()
                 
-                async with session.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers=headers,
-                    json=payload
-                ) as response:
-                    if response.status != 200:
-                        raise Exception(f"OpenAI API error: {response.status}")
+                # Parse the AI response
+                try:
+                    ai_data = json.loads(ai_response)
+                    return CallSummary(
+                        customer_name=ai_data.get("customer_name", "Customer"),
+                        issue_type=ai_data.get("issue_type", "General Inquiry"),
+                        key_points=ai_data.get("key_points", ["Customer needs assistance"]),
+                        current_status=ai_data.get("current_status", "In Progress"),
+                        recommended_actions=ai_data.get("recommended_actions", ["Review customer needs"]),
+                        customer_sentiment=ai_data.get("customer_sentiment", "Neutral"),
+                        provider_used="openai",
+                        generation_time=0.0
+                    )
+                except json.JSONDecodeError:
+                    return self._parse_text_response(ai_response, "openai")
                     
-                    result = await response.json()
-                    ai_response = result["choices"][0]["message"]["content"].strip()
-                    
-                    # Parse the AI response
-                    try:
-                        ai_data = json.loads(ai_response)
-                        return CallSummary(
-                            customer_name=ai_data.get("customer_name", "Customer"),
-                            issue_type=ai_data.get("issue_type", "General Inquiry"),
-                            key_points=ai_data.get("key_points", ["Customer needs assistance"]),
-                            current_status=ai_data.get("current_status", "In Progress"),
-                            recommended_actions=ai_data.get("recommended_actions", ["Review customer needs"]),
-                            customer_sentiment=ai_data.get("customer_sentiment", "Neutral"),
-                            provider_used="openai",
-                            generation_time=0.0
-                        )
-                    except json.JSONDecodeError:
-                        return self._parse_text_response(ai_response, "openai")
-                        
         except Exception as e:
-            with open("debug_ai.log", "a") as f:
-                f.write(f"❌ OpenAI HTTP error: {str(e)}\n")
+            log.debug("OpenAI HTTP error", extra={"provider": "openai", "error": str(e)})
             raise e
 
-    async def _generate_with_groq(self, transcript: str) -> CallSummary:
+    async def _generate_with_groq(self, messages: list[dict]) -> CallSummary:
         """Generate summary using Groq"""
         client = self._get_groq_client()
         if client is None:
             raise Exception("Groq client initialization failed")
             
         response = await client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are a call center AI assistant. Analyze the conversation transcript and extract key information. 
-                    Respond ONLY with a JSON object containing these exact fields:
-                    {
-                        "customer_name": "extracted or 'Customer'",
-                        "issue_type": "brief category",
-                        "key_points": ["point1", "point2", "point3"],
-                        "current_status": "status description",
-                        "recommended_actions": ["action1", "action2", "action3"],
-                        "customer_sentiment": "sentiment description"
-                    }"""
-                },
-                {
-                    "role": "user",
-                    "content": f"Analyze this call transcript and extract the information: {transcript}"
-                }
-            ],
+            model=GROQ_SUMMARY_MODEL,
+            messages=messages,
             temperature=0.1,
             max_tokens=500
         )
@@ -269,7 +586,7 @@ class LLMService:
         try:
             # Extract and parse the AI response
             ai_response = response.choices[0].message.content.strip()
-            print(f"Groq raw response: {ai_response}")
+            log.debug("Groq raw response", extra={"provider": "groq", "response": ai_response, "sample_rate": 0.1})
             
             # Try to parse JSON response
             try:
@@ -289,94 +606,684 @@ class LLMService:
                 return self._parse_text_response(ai_response, "groq")
                 
         except Exception as e:
-            print(f"Error processing Groq response: {e}")
+            log.warning("Error processing Groq response", extra={"provider": "groq", "error": str(e)})
             raise e
 
-    def _parse_text_response(self, ai_response: str, provider: str) -> CallSummary:
-        """Fallback method to parse text response when JSON parsing fails"""
-        # Simple text analysis for key information
-        
-        # Extract basic information from text
-        customer_name = "Customer"
-        issue_type = "General Inquiry"
-        key_points = ["Customer needs assistance", "Requires agent attention"]
-        current_status = "In Progress"
-        recommended_actions = ["Review customer needs", "Provide appropriate assistance"]
-        customer_sentiment = "Neutral"
-        
-        # Try to extract more specific information from the response
-        if "login" in ai_response.lower() or "password" in ai_response.lower():
-            issue_type = "Authentication Issue"
-            key_points = ["Customer having login/password issues"]
-            recommended_actions = ["Reset password", "Verify account security"]
-        elif "billing" in ai_response.lower() or "charge" in ai_response.lower():
-            issue_type = "Billing Inquiry"
-            key_points = ["Customer has billing concerns"]
-            recommended_actions = ["Review billing history", "Explain charges"]
-        elif "technical" in ai_response.lower() or "connection" in ai_response.lower():
-            issue_type = "Technical Support"
-            key_points = ["Customer experiencing technical issues"]
-            recommended_actions = ["Troubleshoot technical problems", "Check system status"]
-        
-        # Check sentiment indicators
-        if any(word in ai_response.lower() for word in ["frustrated", "angry", "upset"]):
-            customer_sentiment = "Frustrated"
-        elif any(word in ai_response.lower() for word in ["happy", "satisfied", "pleased"]):
-            customer_sentiment = "Positive"
-        elif any(word in ai_response.lower() for word in ["patient", "understanding"]):
-            customer_sentiment = "Patient"
+    def _cache_key(self, transcript: str, previous: CallSummary | None) -> str:
+        """Content address for a summary request: normalized transcript + prompt/model version"""
+        normalized = " ".join(transcript.split())
+        previous_json = self._summary_json(previous) if previous else ""
+        return hashlib.sha256(
+            f"{SUMMARY_PROMPT_FINGERPRINT}\0{previous_json}\0{normalized}".encode()
+        ).hexdigest()
+
+    async def _cache_get(self, key: str, start_time: float) -> CallSummary | None:
+        """Cached summary for key, with generation_time reflecting the lookup"""
+        if self.cache is None:
+            return None
+        summary = await self.cache.get(key)
+        if summary is not None:
+            summary.generation_time = time.time() - start_time
+        return summary
+
+    async def _cache_put(self, key: str, summary: CallSummary):
+        """Cache a provider-generated summary (the cache itself rejects emergency fallbacks)"""
+        if self.cache is None:
+            return
+        try:
+            await self.cache.put(key, summary)
+        except Exception as e:
+            log.warning("Summary cache write failed", extra={"error": str(e)})
+
+    def _build_messages(self, transcript: str, previous: CallSummary | None = None) -> list[dict]:
+        """Chat messages asking a provider to summarize (or update a summary of) the transcript as JSON"""
+        if previous is None:
+            content = f"Analyze this call transcript and extract the information: {transcript}"
+        else:
+            summary_so_far = self._summary_json(previous)
+            content = (
+                f"Summary of the call so far: {summary_so_far}\n\n"
+                f"Update it with the rest of the call and return the complete JSON object. "
+                f"Transcript since that summary: {transcript}"
+            )
+        return [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": content}
+        ]
+
+    def _summary_json(self, summary: CallSummary) -> str:
+        return summary.model_dump_json(exclude={"provider_used", "generation_time"})
+
+    def _build_merge_messages(self, partials: list[CallSummary]) -> list[dict]:
+        """Chat messages asking a provider to merge partial summaries of consecutive parts of one call"""
+        parts = "\n".join(f"Part {index}: {self._summary_json(partial)}" for index, partial in enumerate(partials, 1))
+        content = (
+            f"These are summaries of consecutive parts of one call, in order. "
+            f"Merge them into a single JSON object for the whole call, keeping the "
+            f"latest status and sentiment: {parts}"
+        )
+        return [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": content}
+        ]
+
+    async def stream_summary(self, transcript: str, previous: CallSummary | None = None):
+        """
+        Stream a call summary field by field
         
-        return CallSummary(
-            customer_name=customer_name,
-            issue_type=issue_type,
-            key_points=key_points,
-            current_status=current_status,
-            recommended_actions=recommended_actions,
-            customer_sentiment=customer_sentiment,
-            provider_used=provider,
-            generation_time=0.0
+        Yields ("field", {"name": ..., "value": ...}) as soon as each CallSummary
+        field is complete in the provider's token stream, then a final
+        ("summary", CallSummary). Providers are tried healthiest first, skipping
+        any whose circuit breaker is open; a provider that fails mid-stream
+        hands over to the next, which only fills the fields not yet sent.
+        Streaming is always sequential fallback, never concurrent: in hedge and
+        race mode a provider that sends nothing within llm_hedge_delay is
+        abandoned (as cancelled, not failed) and the next one started, as if
+        it had failed. The whole stream honours llm_summary_deadline.
+        `previous` and long transcripts work as in generate_summary(); only
+        the final (merge) call is streamed.
+        """
+        start_time = time.time()
+        deadline = start_time + settings.llm_summary_deadline
+        transcript = compact_transcript(transcript, settings.summary_strip_filler)
+
+        cache_key = self._cache_key(transcript, previous)
+        cached = await self._cache_get(cache_key, start_time)
+        if cached is not None:
+            for name in SUMMARY_FIELD_DEFAULTS:
+                yield "field", {"name": name, "value": getattr(cached, name)}
+            yield "summary", self._record_summary(cached, "cache")
+            return
+        providers = self.health.order([
+            ("openai", self._stream_openai),
+            ("groq", self._stream_groq)
+        ])
+        fields = {}
+        fallback_reason = None
+
+        try:
+            messages = await asyncio.wait_for(self._summary_messages(transcript, previous), deadline - time.time())
+        except Exception as e:
+            log.warning("Chunked summarization failed", extra={"error": f"{type(e).__name__}: {str(e)}"})
+            if isinstance(e, asyncio.TimeoutError):
+                fallback_reason = "slow"
+            elif isinstance(e, CircuitOpenError):
+                fallback_reason = "circuit_open"
+            else:
+                fallback_reason = "error"
+            providers = []
+
+        for index, (provider, stream) in enumerate(providers):
+            permit = self.health.acquire(provider)
+            if permit is None:
+                PROVIDER_CALLS.labels(provider, "rejected").inc()
+                fallback_reason = fallback_reason or "circuit_open"
+                continue
+            if fallback_reason is not None:
+                SUMMARY_FALLBACKS.labels(provider, fallback_reason).inc()
+            parser = SummaryFieldParser()
+            chunks = stream(messages)
+            first_chunk = True
+            abandoned = False  # Hedged out: slow to start, not failed
+            outcome = "cancelled"
+            provider_started = time.perf_counter()
+            IN_FLIGHT.labels(f"llm_{provider}").inc()
+            try:
+                while True:
+                    timeout = deadline - time.time()
+                    if timeout <= 0:
+                        raise asyncio.TimeoutError()
+                    is_last = index == len(providers) - 1
+                    hedged = (
+                        first_chunk and not is_last and settings.llm_execution_mode != "sequential"
+                        and settings.llm_hedge_delay < timeout
+                    )
+                    if hedged:
+                        timeout = settings.llm_hedge_delay
+                    try:
+                        text = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        abandoned = hedged
+                        raise
+                    first_chunk = False
+
+                    for name, value in parser.feed(text):
+                        if name in SUMMARY_FIELD_DEFAULTS and name not in fields:
+                            if not fields:
+                                STAGE_SECONDS.labels("summary_first_field").observe(time.time() - start_time)
+                            fields[name] = self._coerce_field(name, value)
+                            yield "field", {"name": name, "value": fields[name]}
+                outcome = "success"
+            except Exception as e:
+                log.warning(
+                    "Summary provider stream failed",
+                    extra={"provider": provider, "error": f"{type(e).__name__}: {str(e)}"}
+                )
+                # Like a hedge loser in _run_providers: the breaker only counts it if it was already slow
+                outcome = "cancelled" if abandoned else "failure"
+                fallback_reason = "slow" if isinstance(e, asyncio.TimeoutError) else "error"
+                continue
+            finally:
+                await chunks.aclose()
+                latency = time.perf_counter() - provider_started
+                self.health.record(provider, permit, outcome, latency)
+                IN_FLIGHT.labels(f"llm_{provider}").dec()
+                STAGE_SECONDS.labels(f"llm_{provider}").observe(latency)
+                PROVIDER_CALLS.labels(provider, outcome).inc()
+
+            if not fields:
+                # Provider ignored the JSON instruction, fall back to text analysis
+                parsed = self._parse_text_response(parser.text, provider)
+                fields = {name: getattr(parsed, name) for name in SUMMARY_FIELD_DEFAULTS}
+                for name, value in fields.items():
+                    yield "field", {"name": name, "value": value}
+
+            summary = self._summary_from_fields(fields, provider, time.time() - start_time)
+            await self._cache_put(cache_key, summary)
+            yield "summary", self._record_summary(summary, provider)
+            return
+
+        # Emergency fallback, keeping whatever fields already reached the client
+        SUMMARY_FALLBACKS.labels("emergency_fallback", fallback_reason or "error").inc()
+        emergency = self._create_emergency_summary(transcript, time.time() - start_time)
+        log.warning(
+            "Using emergency fallback summary",
+            extra={
+                "provider": "emergency_fallback",
+                "reason": fallback_reason or "error",
+                "latency": round(emergency.generation_time, 3)
+            }
         )
+        for name in SUMMARY_FIELD_DEFAULTS:
+            if name not in fields:
+                fields[name] = getattr(emergency, name)
+                yield "field", {"name": name, "value": fields[name]}
+        summary = self._summary_from_fields(fields, "emergency_fallback", emergency.generation_time)
+        yield "summary", self._record_summary(summary, "emergency_fallback")
 
-    def _create_emergency_summary(self, transcript: str, generation_time: float) -> CallSummary:
-        """Emergency fallback summary"""
+    async def _stream_openai(self, messages: list[dict]):
+        """Yield completion text deltas from OpenAI's streaming chat API"""
+        session = self.connections.openai
+        payload = {
+            "model": OPENAI_SUMMARY_MODEL,
+            "messages": messages,
+            "temperature": 0.1,
+            "max_tokens": 500,
+            "stream": True
+        }
+        async with session.post(
+            f"{settings.openai_base_url}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {settings.openai_api_key}",
+                "Content-Type": "application/json"
+            },
+            json=payload
+        ) as response:
+            if response.status != 200:
+                raise Exception(f"OpenAI API error: {response.status}")
+
+            async for line in response.content:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
+
+    async def _stream_groq(self, messages: list[dict]):
+        """Yield completion text deltas from Groq's streaming chat API"""
+        client = self._get_groq_client()
+        if client is None:
+            raise Exception("Groq client initialization failed")
+
+        stream = await client.chat.completions.create(
+            model=GROQ_SUMMARY_MODEL,
+            messages=messages,
+            temperature=0.1,
+            max_tokens=500,
+            stream=True
+        )
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
+    def _coerce_field(self, name: str, value) -> object:
+        """Shape a streamed value to the CallSummary field type"""
+        if isinstance(SUMMARY_FIELD_DEFAULTS[name], list):
+            if isinstance(value, list):
+                return [str(item) for item in value]
+            return [str(value)]
+        return value if isinstance(value, str) else json.dumps(value)
+
+    def _summary_from_fields(self, fields: dict, provider: str, generation_time: float) -> CallSummary:
+        """Assemble a CallSummary from streamed fields, defaulting any the model omitted"""
         return CallSummary(
-            customer_name="Customer",
-            issue_type="General Inquiry",
-            key_points=[
-                "Customer called for assistance",
-                "Issue requires agent attention",
-                "Full transcript available for review"
-            ],
-            current_status="In Progress",
-            recommended_actions=[
-                "Review transcript details",
-                "Ask customer to repeat key concerns",
-                "Provide appropriate assistance"
-            ],
-            customer_sentiment="Neutral",
-            provider_used="emergency_fallback",
+            **{name: fields.get(name, default) for name, default in SUMMARY_FIELD_DEFAULTS.items()},
+            provider_used=provider,
             generation_time=generation_time
         )
 
+    def _parse_text_response(self, ai_response: str, provider: str) -> CallSummary:
+        """Fallback when a provider answers in prose instead of JSON: extract the fields from its text"""
+        return extract_summary(ai_response, provider)
+
+    def _create_emergency_summary(self, transcript: str, generation_time: float) -> CallSummary:
+        """Emergency fallback summary, extracted locally from the transcript"""
+        return extract_summary(transcript, "emergency_fallback", generation_time)
+
+    async def preliminary_summary(self, transcript: str) -> CallSummary:
+        """Instant local summary to show while the LLM summary is generated"""
+        with STAGE_SECONDS.labels("summary_heuristic").time():
+            started = time.perf_counter()
+            if len(transcript) > PRELIMINARY_INLINE_CHARS:
+                summary = await asyncio.to_thread(self._extract_preliminary, transcript)
+            else:
+                summary = self._extract_preliminary(transcript)
+            summary.generation_time = time.perf_counter() - started
+        return summary
+
+    @staticmethod
+    def _extract_preliminary(transcript: str) -> CallSummary:
+        return extract_summary(compact_transcript(transcript, settings.summary_strip_filler))
+
+
+class RollingSummaryService:
+    """
+    Per-room running summary, folded forward in the background while the call is live
+    
+    State lives in the shared state backend so deltas can land on any worker:
+    a list of unsummarized turns (the tail) and the summary covering everything
+    before it. A short lease keeps two workers from folding the same room.
+    Turns are also kept in full in the room's TranscriptStore, when given.
+    """
+
+    def __init__(self, llm_service: LLMService, state: StateBackend, transcripts: TranscriptStore | None = None):
+        self.llm = llm_service
+        self.state = state
+        self.transcripts = transcripts
+        self._fold_tasks = {}  # Debounced folds scheduled by this worker
+        self._fold_slots = asyncio.Semaphore(settings.rolling_summary_max_concurrency)
+
+    @staticmethod
+    def _keys(room_id: str) -> tuple[str, str, str]:
+        """(tail list, summary, fold lease) keys for a room"""
+        prefix = f"rolling:{room_id}"
+        return f"{prefix}:tail", f"{prefix}:summary", f"{prefix}:lease"
+
+    async def append(self, room_id: str, text: str, speaker_id: str | None = None) -> dict:
+        """Add a transcript delta and schedule a debounced fold"""
+        tail_key, _, _ = self._keys(room_id)
+        if self.transcripts is not None:
+            turn = await self.transcripts.append(room_id, text, speaker_id)
+        else:
+            turn = TranscriptStore.format_turn(text, speaker_id)
+        if not turn:
+            try:
+                return await self.status(room_id)
+            except KeyError:
+                return {"room_id": room_id, "summarized_chars": 0, "pending_chars": 0, "summary": None}
+        await self.state.append(tail_key, turn, ttl=settings.rolling_summary_ttl)
+
+        status = await self.status(room_id)
+        if room_id not in self._fold_tasks and status["pending_chars"] >= settings.rolling_summary_min_chars:
+            self._fold_tasks[room_id] = asyncio.create_task(self._fold_later(room_id))
+        return status
+
+    async def _fold_later(self, room_id: str):
+        """Wait out the debounce window, then fold the tail (bounded concurrency)"""
+        try:
+            while True:
+                await asyncio.sleep(settings.rolling_summary_debounce)
+                async with self._fold_slots:
+                    if not await self._fold(room_id):
+                        break
+                status = await self.status(room_id)
+                if status["pending_chars"] < settings.rolling_summary_min_chars:
+                    break
+        except Exception as e:
+            log.warning("Rolling summary failed", extra={"room": room_id, "error": str(e)})
+        finally:
+            self._fold_tasks.pop(room_id, None)
+
+    async def _fold(self, room_id: str) -> bool:
+        """Fold the current tail into the running summary; False if skipped or the providers failed"""
+        tail_key, summary_key, lease_key = self._keys(room_id)
+        lease_ttl = settings.llm_summary_deadline + 5.0
+        if not await self.state.add(lease_key, "1", ttl=lease_ttl):
+            # Another worker is folding this room right now
+            return False
+
+        try:
+            tail = await self.state.get_list(tail_key)
+            if not tail:
+                return False
+            summary, summarized_chars = await self._load_summary(summary_key)
+            folded = await self.llm.generate_summary("\n".join(tail), previous=summary)
+            if folded.provider_used == "emergency_fallback":
+                # Keep the tail so transfer time still sees those turns
+                return False
+
+            await self.state.set(summary_key, json.dumps({
+                "summary": folded.model_dump(),
+                "summarized_chars": summarized_chars + sum(len(turn) for turn in tail)
+            }), ttl=settings.rolling_summary_ttl)
+            await self.state.trim_list(tail_key, len(tail))
+            return True
+        finally:
+            await self.state.delete(lease_key)
+
+    async def _load_summary(self, summary_key: str) -> tuple[CallSummary | None, int]:
+        data = await self.state.get(summary_key)
+        if data is None:
+            return None, 0
+        stored = json.loads(data)
+        return CallSummary.model_validate(stored["summary"]), stored["summarized_chars"]
+
+    async def snapshot(self, room_id: str) -> tuple[CallSummary | None, str] | None:
+        """Return (running summary, unsummarized tail) for a room, or None if untracked"""
+        tail_key, summary_key, _ = self._keys(room_id)
+        tail = await self.state.get_list(tail_key)
+        summary, _ = await self._load_summary(summary_key)
+        if summary is None and not tail:
+            return None
+        return summary, "\n".join(tail)
+
+    async def status(self, room_id: str) -> dict:
+        """Describe a room's rolling summary progress (KeyError if untracked)"""
+        tail_key, summary_key, _ = self._keys(room_id)
+        tail = await self.state.get_list(tail_key)
+        summary, summarized_chars = await self._load_summary(summary_key)
+        if summary is None and not tail:
+            raise KeyError(room_id)
+        return {
+            "room_id": room_id,
+            "summarized_chars": summarized_chars,
+            "pending_chars": sum(len(turn) for turn in tail),
+            "summary": summary
+        }
+
+    async def discard(self, room_id: str):
+        """Forget a room, cancelling any fold this worker has pending"""
+        task = self._fold_tasks.pop(room_id, None)
+        if task is not None:
+            task.cancel()
+        await self.state.delete(*self._keys(room_id))
+
+    async def close(self):
+        """Cancel this worker's pending folds (shared state is left in place)"""
+        for task in self._fold_tasks.values():
+            task.cancel()
+        self._fold_tasks.clear()
+
+
+class BatchSummaryService:
+    """
+    Summaries for many transcripts at once (post-call QA backfill), without LiveKit
+    
+    Items go through LLMService.generate_summary, at most max_concurrency at
+    a time per batch, started no faster than rate_limit per second across
+    batches, and held back while every provider's circuit is open. Results
+    are yielded as they complete. With a batch_id, successful results are
+    kept in the state backend so running the batch again resumes it: stored
+    results are replayed and only the rest is summarized. Emergency
+    fallbacks are reported but not kept, so a resume retries them.
+    """
+
+    def __init__(
+        self,
+        llm_service: LLMService,
+        state: StateBackend,
+        max_concurrency: int | None = None,
+        rate_limit: float | None = None
+    ):
+        self.llm = llm_service
+        self.state = state
+        self.max_concurrency = max_concurrency or settings.batch_max_concurrency
+        self.rate_limit = settings.batch_rate_limit if rate_limit is None else rate_limit
+        self._next_start = 0.0
+
+    @staticmethod
+    def _key(batch_id: str) -> str:
+        return f"batch:{batch_id}:results"
+
+    @staticmethod
+    def validate(items: list[BatchSummaryItem]):
+        """Reject oversized batches and duplicate item ids (ValueError)"""
+        if len(items) > settings.batch_max_items:
+            raise ValueError(f"Batch has {len(items)} items, the limit is {settings.batch_max_items}")
+        seen = set()
+        for item in items:
+            if item.id in seen:
+                raise ValueError(f"Duplicate item id {item.id!r}")
+            seen.add(item.id)
+
+    async def run(self, items: list[BatchSummaryItem], batch_id: str | None = None):
+        """Yield a BatchSummaryResult per item, in completion order"""
+        stored = {}
+        if batch_id is not None:
+            for entry in await self.state.get_list(self._key(batch_id)):
+                result = BatchSummaryResult.model_validate_json(entry)
+                stored[result.id] = result
+
+        pending = []
+        for item in items:
+            if item.id in stored:
+                yield stored[item.id].model_copy(update={"resumed": True})
+            else:
+                pending.append(item)
+
+        results = asyncio.Queue()
+        queued = iter(pending)
+
+        async def worker():
+            for item in queued:
+                await self._admit()
+                result = await self._summarize(item)
+                if batch_id is not None and result.status == "ok":
+                    try:
+                        await self.state.append(self._key(batch_id), result.model_dump_json(), ttl=settings.batch_result_ttl)
+                    except Exception as e:
+                        log.warning("Could not store batch result", extra={"batch": batch_id, "item": item.id, "error": str(e)})
+                await results.put(result)
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.max_concurrency, len(pending)))]
+        try:
+            for _ in pending:
+                yield await results.get()
+        finally:
+            # Client went away or the batch finished: nothing left should keep calling providers
+            for task in workers:
+                task.cancel()
+
+    async def _admit(self):
+        """Wait out a fully open set of provider breakers, then pace starts to rate_limit"""
+        while (wait := self.llm.health.retry_after()) > 0:
+            log.info("Batch waiting for a summary provider", extra={"wait": round(wait, 1), "sample_rate": 0.1})
+            await asyncio.sleep(wait)
+        if self.rate_limit > 0:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + 1 / self.rate_limit
+            await asyncio.sleep(start - now)
+
+    async def _summarize(self, item: BatchSummaryItem) -> BatchSummaryResult:
+        try:
+            with IN_FLIGHT.labels("batch_summary").track():
+                summary = await self.llm.generate_summary(item.transcript)
+        except Exception as e:
+            log.warning("Batch item failed", extra={"item": item.id, "error": str(e)})
+            return BatchSummaryResult(id=item.id, status="error", error=str(e))
+        status = "fallback" if summary.provider_used == "emergency_fallback" else "ok"
+        return BatchSummaryResult(id=item.id, status=status, summary=summary)
+
+
+def parse_batch_lines(lines) -> list[BatchSummaryItem]:
+    """
+    Batch items from JSONL lines of {"id": ..., "transcript": ...}
+    
+    Blank lines are skipped; an item without an id gets its line number.
+    Raises ValueError naming the first bad line.
+    """
+    items = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+            data["id"] = str(data.get("id", number))
+            items.append(BatchSummaryItem.model_validate(data))
+        except (ValueError, AttributeError) as e:
+            raise ValueError(f"Line {number}: {e}") from None
+    return items
+
 
 class TransferService:
     """Service for managing warm transfers"""
     
-    def __init__(self, livekit_service: LiveKitService, llm_service: LLMService):
+    def __init__(
+        self,
+        livekit_service: LiveKitService,
+        llm_service: LLMService,
+        state: StateBackend,
+        rolling_service: RollingSummaryService | None = None,
+        transcripts: TranscriptStore | None = None
+    ):
         self.livekit = livekit_service
         self.llm = llm_service
-        self.active_transfers = {}
+        self.rolling = rolling_service
+        self.transcripts = transcripts
+        self.room_pool = RoomPool(
+            livekit_service.provision_room,
+            low_watermark=settings.room_pool_low_watermark,
+            high_watermark=settings.room_pool_high_watermark,
+            empty_timeout=settings.room_empty_timeout,
+            claim_margin=settings.room_pool_claim_margin,
+            refill_concurrency=settings.room_pool_refill_concurrency,
+            check_interval=settings.room_pool_check_interval
+        )
+        self.registry = TransferRegistry(
+            state,
+            ttl=settings.transfer_ttl,
+            retention=settings.transfer_retention,
+            sweep_interval=settings.transfer_sweep_interval
+        )
+        self.reaper = RoomReaper(
+            livekit_service.delete_room,
+            self.registry,
+            livekit_service.rooms,
+            state,
+            grace=settings.room_reaper_grace,
+            empty_grace=settings.room_reaper_empty_grace,
+            concurrency=settings.room_reaper_concurrency,
+            batch_size=settings.room_reaper_batch_size,
+            check_interval=settings.room_reaper_interval,
+            on_deleted=self._forget_room
+        )
     
-    async def initiate_transfer(self, caller_room_id: str, agent_a_id: str, transcript: str) -> dict:
-        """Initiate a warm transfer"""
+    async def initiate_transfer(
+        self,
+        caller_room_id: str,
+        agent_a_id: str,
+        transcript: str | None = None,
+        async_summary: bool = False
+    ) -> dict:
+        """
+        Initiate a warm transfer
+        
+        When the caller room has a rolling summary, the request transcript is
+        ignored in favour of that summary plus its unsummarized tail, so
+        transfer-time LLM work stays small regardless of call length. Without
+        either, the room's server-side transcript is used.
+        
+        The transfer room comes from the pre-created pool when one is ready.
+        The room and tokens never depend on the summary. With async_summary the
+        summary is streamed in a background task and fetched via get_summary()
+        or followed field by field via stream_summary_events(); otherwise room
+        creation and summary generation run concurrently. Either way the result
+        carries a preliminary summary extracted locally in well under a millisecond.
+        With no transcript at all, that local summary is the final one: no LLM
+        is called.
+        """
+        started = time.perf_counter()
+        with IN_FLIGHT.labels("transfer").track(), STAGE_SECONDS.labels("transfer").time():
+            result = await self._initiate_transfer(caller_room_id, agent_a_id, transcript, async_summary)
+        log.info("Transfer initiated", extra={
+            "transfer_id": result["transfer_id"],
+            "room": caller_room_id,
+            "transfer_room": result["transfer_room_id"],
+            "summary_status": result["summary_status"],
+            "latency": round(time.perf_counter() - started, 3)
+        })
+        return result
+
+    async def _initiate_transfer(
+        self,
+        caller_room_id: str,
+        agent_a_id: str,
+        transcript: str | None,
+        async_summary: bool
+    ) -> dict:
         transfer_id = str(uuid.uuid4())
-        transfer_room_id = f"transfer_{transfer_id[:8]}"
+        # A pre-created room needs no LiveKit round trip; on a pool miss create one as before
+        transfer_room_id = self.room_pool.claim()
+        pooled = transfer_room_id is not None
+        if not pooled:
+            transfer_room_id = f"transfer_{transfer_id[:8]}"
+        
+        async def create_room():
+            if not pooled:
+                await self.livekit.create_room(transfer_room_id)
+        
+        # Store transfer info up front so summary subscribers can attach immediately
+        transfer = TransferRecord(
+            transfer_id=transfer_id,
+            caller_room_id=caller_room_id,
+            transfer_room_id=transfer_room_id,
+            agent_a_id=agent_a_id
+        )
+        await self.registry.add(transfer)
         
-        # Create transfer room
-        await self.livekit.create_room(transfer_room_id)
+        # Prefer the room's rolling summary: only the unsummarized tail is left to fold
+        previous = None
+        snapshot = await self.rolling.snapshot(caller_room_id) if self.rolling else None
+        if snapshot is not None:
+            previous, transcript = snapshot
+        elif not transcript and self.transcripts is not None:
+            transcript = await self.transcripts.text(caller_room_id)
+        transcript = transcript or ""
+        # Something to show straight away: the rolling summary, else a local extractive one
+        preliminary = previous or await self.llm.preliminary_summary(transcript)
         
-        # Generate AI summary
-        summary = await self.llm.generate_summary(transcript)
+        if not transcript.strip():
+            # Nothing new since the last fold, or nothing said at all: no LLM call to pay for
+            await create_room()
+            transfer.summary = preliminary
+            await self.registry.store_summary(transfer)
+        elif async_summary:
+            # Stream the summary in the background, it overlaps room creation
+            transfer.summary_events = []
+            transfer.summary_changed = asyncio.Condition()
+            transfer.summary_task = asyncio.create_task(
+                self._run_summary_stream(transfer, transcript, previous)
+            )
+            self.registry.track(transfer)
+            await create_room()
+        else:
+            # Create transfer room and generate AI summary concurrently
+            _, transfer.summary = await asyncio.gather(
+                create_room(),
+                self.llm.generate_summary(transcript, previous)
+            )
+            await self.registry.store_summary(transfer)
         
         # Generate tokens for both Agent A and Agent B to join transfer room
         agent_a_token = self.livekit.generate_token(
@@ -391,119 +1298,534 @@ class TransferService:
             "agent_b"
         )
         
-        # Store transfer info
-        self.active_transfers[transfer_id] = {
-            "caller_room_id": caller_room_id,
-            "transfer_room_id": transfer_room_id,
-            "agent_a_id": agent_a_id,
-            "summary": summary,
-            "status": "initiated"
-        }
-        
+        summary = transfer.summary
         return {
             "transfer_id": transfer_id,
             "transfer_room_id": transfer_room_id,
             "agent_a_token": agent_a_token,
             "agent_b_token": agent_b_token,
-            "summary": summary
+            "summary": summary,
+            "summary_status": "ready" if summary is not None else "pending",
+            "preliminary_summary": preliminary
         }
 
+    async def _run_summary_stream(
+        self,
+        transfer: TransferRecord,
+        transcript: str,
+        previous: CallSummary | None = None
+    ) -> CallSummary:
+        """Consume the LLM summary stream, publishing each event to subscribers"""
+        changed = transfer.summary_changed
+        try:
+            async for event, data in self.llm.stream_summary(transcript, previous):
+                if event == "summary":
+                    transfer.summary = data
+                else:
+                    transfer.summary_events.append(data)
+                async with changed:
+                    changed.notify_all()
+        finally:
+            if transfer.summary is None:
+                transfer.summary = self.llm._create_emergency_summary(transcript, 0.0)
+            # Subscribers replay from the summary itself from now on
+            transfer.summary_task = None
+            transfer.summary_events = None
+            transfer.summary_changed = None
+            async with changed:
+                changed.notify_all()
+            try:
+                await self.registry.store_summary(transfer)
+            except Exception as e:
+                log.error(
+                    "Failed to persist transfer summary",
+                    extra={"transfer_id": transfer.transfer_id, "error": str(e)}
+                )
+        return transfer.summary
+
+    async def get_summary(self, transfer_id: str, wait: float = 0.0) -> CallSummary | None:
+        """
+        Return the transfer's summary, long-polling up to `wait` seconds if it is pending
+        
+        Raises KeyError for unknown transfers; returns None if still pending.
+        """
+        transfer = await self.get_transfer(transfer_id)
+        task = transfer.summary_task
+        if transfer.summary is None and task is not None and wait > 0:
+            try:
+                # Shield so a client hanging up never cancels the shared summary
+                return await asyncio.wait_for(asyncio.shield(task), timeout=wait)
+            except asyncio.TimeoutError:
+                return None
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise  # This request itself was cancelled
+                # The transfer was completed or cancelled mid-summary: the
+                # stream's cleanup has left the emergency summary in place
+                return transfer.summary
+        if transfer.summary is None and wait > 0:
+            # Being generated on another worker
+            transfer = await self._poll_for_summary(transfer_id, time.monotonic() + wait)
+        return transfer.summary
+
+    async def _poll_for_summary(self, transfer_id: str, deadline: float | None = None) -> TransferRecord:
+        """Re-read a transfer from the state backend until its summary lands (or the deadline)"""
+        transfer = await self.get_transfer(transfer_id)
+        while transfer.summary is None and transfer.summary_changed is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(settings.state_poll_interval)
+            transfer = await self.get_transfer(transfer_id)
+        return transfer
+
+    async def stream_summary_events(self, transfer_id: str):
+        """
+        Replay and follow a transfer's summary as ("field", ...) then ("summary", ...) events
+        
+        Raises KeyError for unknown transfers. Transfers whose summary was generated
+        synchronously replay it as fields straight away. If another worker was
+        generating it and nothing lands within the summary deadline (that worker
+        died), the stream ends with an ("error", ...) event.
+        """
+        transfer = await self.get_transfer(transfer_id)
+        if transfer.summary is None and transfer.summary_changed is None:
+            # Being generated on another worker: fields arrive all at once
+            deadline = time.monotonic() + settings.llm_summary_deadline + SUMMARY_POLL_SLACK
+            transfer = await self._poll_for_summary(transfer_id, deadline)
+            if transfer.summary is None and transfer.summary_changed is None:
+                yield "error", {"transfer_id": transfer_id, "detail": "Summary did not arrive in time"}
+                return
+        changed = transfer.summary_changed
+        sent = set()
+        position = 0
+
+        while True:
+            events = transfer.summary_events or []
+            while position < len(events):
+                sent.add(events[position]["name"])
+                yield "field", events[position]
+                position += 1
+
+            summary = transfer.summary
+            if summary is not None:
+                for name in SUMMARY_FIELD_DEFAULTS:
+                    if name not in sent:
+                        yield "field", {"name": name, "value": getattr(summary, name)}
+                yield "summary", summary.model_dump()
+                return
+
+            async with changed:
+                await changed.wait_for(
+                    lambda: len(transfer.summary_events or []) > position
+                    or transfer.summary is not None
+                )
+
+    async def get_transfer(self, transfer_id: str) -> TransferRecord:
+        """Look up a transfer; raises KeyError if unknown or already swept"""
+        transfer = await self.registry.get(transfer_id)
+        if transfer is None:
+            raise KeyError(transfer_id)
+        return transfer
+
+    async def update_status(self, transfer_id: str, status: str) -> TransferRecord:
+        """
+        Advance a transfer's status (KeyError if unknown, ValueError if not allowed)
+        
+        Completing or cancelling a transfer hands its room to the reaper.
+        Completing it also drops the caller room's transcript and rolling
+        summary: the handoff is done and the summary has been delivered.
+        """
+        transfer = await self.registry.transition(transfer_id, status)
+        if transfer.terminal:
+            self.reaper.schedule()
+        if transfer.status == "completed":
+            for room_id in (transfer.caller_room_id, transfer.transfer_room_id):
+                try:
+                    await self._forget_room(room_id)
+                except Exception as e:
+                    log.warning("Failed to discard room state", extra={"room": room_id, "error": str(e)})
+        return transfer
+
+    async def _forget_room(self, room_id: str):
+        """Drop a room's transcript and rolling summary once the room is gone or done with"""
+        if self.rolling is not None:
+            await self.rolling.discard(room_id)
+        if self.transcripts is not None:
+            await self.transcripts.discard(room_id)
+
 
 class TranscriptionService:
     """Real-time audio transcription using OpenAI Whisper API"""
     
-    def __init__(self):
+    def __init__(self, connections: ConnectionPool):
+        self.connections = connections
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY environment variable is required")
+        self.scheduler = JobScheduler(
+            "transcription",
+            concurrency=settings.transcribe_max_concurrency,
+            max_queue=settings.transcribe_max_queue
+        )
+        self.retries = 0
+        self.exhausted = 0
+        self.preprocess = settings.audio_preprocess_enabled and HAVE_NUMPY
+        if settings.audio_preprocess_enabled and not self.preprocess:
+            log.warning("numpy is not installed, PCM/WAV audio is sent to Whisper unprocessed")
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.bytes_saved = 0
+        self.silent_chunks = 0
     
-    async def transcribe_audio(self, audio_data: str, audio_format: str = "webm") -> dict:
+    async def transcribe_audio(
+        self,
+        audio_data: str,
+        audio_format: str = "webm",
+        priority: str = "live",
+        sample_rate: int = 16000,
+        channels: int = 1
+    ) -> dict:
         """
         Transcribe audio data using OpenAI Whisper API
         
         Args:
             audio_data: Base64 encoded audio data
             audio_format: Audio format (webm, wav, mp3, etc.)
+            priority: "live" or "backfill", see transcribe_bytes
+            sample_rate: Sample rate of raw "pcm" audio
+            channels: Interleaved channels of raw "pcm" audio
             
         Returns:
             dict with transcript, confidence, processing_time, language
         """
         start_time = time.time()
-        
         try:
-            # Decode base64 audio data
             audio_bytes = base64.b64decode(audio_data)
+        except ValueError:
+            return self._unavailable(start_time)
+        return await self.transcribe_bytes(audio_bytes, audio_format, start_time, priority, sample_rate, channels)
+    
+    async def transcribe_bytes(
+        self,
+        audio: bytes | bytearray | memoryview,
+        audio_format: str = "webm",
+        start_time: float | None = None,
+        priority: str = "live",
+        sample_rate: int = 16000,
+        channels: int = 1
+    ) -> dict:
+        """
+        Transcribe raw audio bytes using OpenAI Whisper API
+        
+        The buffer is handed straight to the outbound multipart body: no temp
+        file and no base64 round trip. PCM and WAV are first downmixed,
+        downsampled and trimmed of silence (see audio.preprocess_audio); a
+        chunk with no speech in it gets an empty transcript without a Whisper
+        call. Jobs go through the bounded scheduler, live-call audio ahead of
+        backfill.
+        
+        Args:
+            audio: Raw audio bytes (a memoryview is not copied)
+            audio_format: Audio format (webm, wav, mp3, pcm, etc.)
+            start_time: When the request started, for processing_time
+            priority: "live" or "backfill"
+            sample_rate: Sample rate of raw "pcm" audio
+            channels: Interleaved channels of raw "pcm" audio
             
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(suffix=f".{audio_format}", delete=False) as temp_file:
-                temp_file.write(audio_bytes)
-                temp_file_path = temp_file.name
-            
-            # Prepare multipart form data for OpenAI Whisper API
-            form_data = aiohttp.FormData()
-            form_data.add_field('file', open(temp_file_path, 'rb'), 
-                               filename=f"audio.{audio_format}", 
-                               content_type=f"audio/{audio_format}")
-            form_data.add_field('model', 'whisper-1')
-            form_data.add_field('response_format', 'verbose_json')
-            form_data.add_field('language', 'en')
+        Returns:
+            dict with transcript, confidence, processing_time, language
             
-            # Call OpenAI Whisper API
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    'https://api.openai.com/v1/audio/transcriptions',
-                    headers={
-                        'Authorization': f'Bearer {self.openai_api_key}'
-                    },
-                    data=form_data
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        processing_time = time.time() - start_time
-                        
-                        # Clean up temporary file
-                        os.unlink(temp_file_path)
-                        
-                        return {
-                            "transcript": result.get("text", ""),
-                            "confidence": 0.95,  # Whisper doesn't provide confidence, using default
-                            "processing_time": processing_time,
-                            "language": result.get("language", "en")
-                        }
-                    else:
-                        error_text = await response.text()
-                        raise Exception(f"OpenAI API error: {response.status} - {error_text}")
-                        
+        Raises:
+            QueueFullError: the scheduler queue is full, the job was shed
+            ProviderBusyError: Whisper kept returning 429/5xx after all retries
+        """
+        if start_time is None:
+            start_time = time.time()
+        
+        self.bytes_received += len(audio)
+        AUDIO_BYTES.labels("received").inc(len(audio))
+        if audio_format in ("pcm", "wav"):
+            audio, audio_format = await self._prepare_audio(audio, audio_format, sample_rate, channels)
+            if audio is None:
+                self.silent_chunks += 1
+                AUDIO_SILENT_CHUNKS.inc()
+                return {"transcript": "", "confidence": 0.0, "processing_time": time.time() - start_time, "language": "en"}
+        self.bytes_sent += len(audio)
+        AUDIO_BYTES.labels("sent").inc(len(audio))
+        
+        try:
+            with IN_FLIGHT.labels("transcription").track():
+                result = await self._transcribe_with_retry(
+                    audio,
+                    audio_format,
+                    TRANSCRIPTION_PRIORITIES.get(priority, TRANSCRIPTION_PRIORITIES["live"])
+                )
+        except (QueueFullError, ProviderBusyError):
+            raise
         except Exception as e:
-            # Clean up temporary file if it exists
+            log.warning("Transcription failed", extra={"provider": "whisper", "error": str(e)})
+            return self._unavailable(start_time)
+        
+        result["processing_time"] = time.time() - start_time
+        STAGE_SECONDS.labels("transcription").observe(result["processing_time"])
+        return result
+    
+    async def _prepare_audio(
+        self,
+        audio: bytes | bytearray | memoryview,
+        audio_format: str,
+        sample_rate: int,
+        channels: int
+    ) -> tuple[bytes | bytearray | memoryview | None, str]:
+        """
+        Preprocessed WAV (None if silent); raw PCM is at least wrapped as WAV, which Whisper needs
+
+        Only PCM bytes dropped by downmixing, downsampling and trimming count
+        as saved, so the WAV header added to raw PCM never reads as a loss.
+        """
+        if self.preprocess:
+            try:
+                with STAGE_SECONDS.labels("audio_preprocess").time():
+                    # Off the event loop: a long 48 kHz stereo upload takes a few milliseconds
+                    processed = await asyncio.to_thread(
+                        preprocess_audio,
+                        audio,
+                        audio_format,
+                        sample_rate,
+                        channels,
+                        target_rate=settings.audio_target_sample_rate,
+                        silence_threshold=settings.audio_vad_threshold,
+                        pad_ms=settings.audio_vad_pad_ms
+                    )
+                self.bytes_saved += processed.bytes_saved
+                AUDIO_BYTES.labels("saved").inc(processed.bytes_saved)
+                if processed.silent:
+                    return None, "wav"
+                return pcm_to_wav(processed.pcm, processed.sample_rate), "wav"
+            except ValueError as e:
+                log.info("Audio not preprocessed", extra={"audio_format": audio_format, "error": str(e)})
+        if audio_format == "pcm":
+            return pcm_to_wav(audio, sample_rate, channels), "wav"
+        return audio, audio_format
+    
+    async def _transcribe_with_retry(self, audio: bytes | bytearray | memoryview, audio_format: str, priority: int) -> dict:
+        """
+        Call Whisper through the scheduler, backing off on 429/5xx and honouring Retry-After
+
+        Each attempt is its own scheduler job: the slot is given back while
+        backing off, so other chunks keep moving, and the retry queues again
+        at the same priority.
+        """
+        for attempt in range(settings.transcribe_max_retries + 1):
             try:
-                os.unlink(temp_file_path)
-            except FileNotFoundError:
-                pass
+                result = await self.scheduler.submit(lambda: self._timed_whisper_call(audio, audio_format), priority=priority)
+                PROVIDER_CALLS.labels("whisper", "success").inc()
+                return result
+            except ProviderBusyError as e:
+                PROVIDER_CALLS.labels("whisper", "throttled" if e.status == 429 else "failure").inc()
+                if attempt == settings.transcribe_max_retries:
+                    self.exhausted += 1
+                    raise
+                backoff = min(
+                    settings.transcribe_backoff_base * 2 ** attempt,
+                    settings.transcribe_backoff_max
+                )
+                delay = e.retry_after if e.retry_after is not None else random.uniform(backoff / 2, backoff)
+                self.retries += 1
+                log.info(
+                    "Whisper busy, retrying",
+                    extra={"provider": "whisper", "status": e.status, "retry_in": round(delay, 2)}
+                )
+                await asyncio.sleep(delay)
+            except QueueFullError:
+                raise
+            except Exception:
+                PROVIDER_CALLS.labels("whisper", "failure").inc()
+                raise
+    
+    async def _timed_whisper_call(self, audio: bytes | bytearray | memoryview, audio_format: str) -> dict:
+        with STAGE_SECONDS.labels("whisper").time():
+            return await self._call_whisper(audio, audio_format)
+    
+    async def _call_whisper(self, audio: bytes | bytearray | memoryview, audio_format: str) -> dict:
+        """Single Whisper request; raises ProviderBusyError on retryable statuses"""
+        # Prepare multipart form data for OpenAI Whisper API
+        form_data = aiohttp.FormData()
+        form_data.add_field('file', audio,
+                           filename=f"audio.{audio_format}", 
+                           content_type=f"audio/{audio_format}")
+        form_data.add_field('model', 'whisper-1')
+        form_data.add_field('response_format', 'verbose_json')
+        form_data.add_field('language', 'en')
+        
+        # Call OpenAI Whisper API over the shared keep-alive session
+        session = self.connections.openai
+        async with session.post(
+            f'{settings.openai_base_url}/audio/transcriptions',
+            headers={
+                'Authorization': f'Bearer {self.openai_api_key}'
+            },
+            data=form_data
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                return {
+                    "transcript": result.get("text", ""),
+                    "confidence": 0.95,  # Whisper doesn't provide confidence, using default
+                    "language": result.get("language", "en")
+                }
             
-            # Fallback to mock transcription for development
-            processing_time = time.time() - start_time
-            return {
-                "transcript": "[Audio transcription temporarily unavailable]",
-                "confidence": 0.0,
-                "processing_time": processing_time,
-                "language": "en"
-            }
+            error_text = await response.text()
+            if response.status == 429 or response.status >= 500:
+                raise ProviderBusyError(
+                    response.status,
+                    parse_retry_after(response.headers.get("Retry-After"))
+                )
+            raise Exception(f"OpenAI API error: {response.status} - {error_text}")
+    
+    def stats(self) -> dict:
+        """Scheduler queue depth and wait times plus provider retry counters"""
+        return {
+            **self.scheduler.stats(),
+            "retries": self.retries,
+            "retries_exhausted": self.exhausted,
+            "preprocessing": self.preprocess,
+            "audio_bytes_received": self.bytes_received,
+            "audio_bytes_sent": self.bytes_sent,
+            "audio_bytes_saved": self.bytes_saved,
+            "silent_chunks_skipped": self.silent_chunks
+        }
+    
+    async def close(self):
+        """Stop the scheduler workers"""
+        await self.scheduler.close()
+    
+    def _unavailable(self, start_time: float) -> dict:
+        """Fallback to mock transcription for development"""
+        return {
+            "transcript": TRANSCRIPTION_UNAVAILABLE,
+            "confidence": 0.0,
+            "processing_time": time.time() - start_time,
+            "language": "en"
+        }
+    
+    def open_stream(self, speaker_id: str, audio_format: str = "pcm", sample_rate: int = 16000) -> "TranscriptionStream":
+        """Start a continuous transcription stream for one speaker"""
+        return TranscriptionStream(self, speaker_id, audio_format, sample_rate)
     
     async def transcribe_stream(self, audio_chunks: list, audio_format: str = "webm") -> dict:
         """
         Transcribe streaming audio chunks
         
         Args:
-            audio_chunks: List of base64 encoded audio chunks
+            audio_chunks: List of base64 encoded (str) or raw (bytes) audio chunks
             audio_format: Audio format
             
         Returns:
             dict with accumulated transcript
         """
-        # Combine audio chunks
-        combined_audio = b"".join([base64.b64decode(chunk) for chunk in audio_chunks])
-        combined_b64 = base64.b64encode(combined_audio).decode()
+        start_time = time.time()
+        
+        # Combine audio chunks, decoding each base64 chunk exactly once
+        combined_audio = bytearray()
+        for chunk in audio_chunks:
+            combined_audio += base64.b64decode(chunk) if isinstance(chunk, str) else chunk
         
-        # Transcribe combined audio
-        return await self.transcribe_audio(combined_b64, audio_format)
\ No newline at end of file
+        # Transcribe combined audio without re-encoding it
+        return await self.transcribe_bytes(memoryview(combined_audio), audio_format, start_time)
+
+
+class TranscriptionStream:
+    """
+    One speaker's continuous audio stream, transcribed segment by segment
+    
+    For "pcm" (16-bit little-endian mono) the server segments on silence and
+    max duration. Container formats (webm, ogg, ...) can't be split mid-stream,
+    so each fed message is treated as one self-contained segment. Segments are
+    transcribed concurrently but results are queued strictly in order, ending
+    with a None sentinel.
+    """
+    
+    def __init__(self, service: TranscriptionService, speaker_id: str, audio_format: str, sample_rate: int):
+        self.service = service
+        self.speaker_id = speaker_id
+        self.audio_format = audio_format
+        self.sample_rate = sample_rate
+        self.segmenter = AudioSegmenter(
+            sample_rate,
+            silence_threshold=settings.ws_segment_silence_threshold,
+            min_silence_ms=settings.ws_segment_min_silence_ms,
+            max_segment_ms=settings.ws_segment_max_ms
+        ) if audio_format == "pcm" else None
+        self.results: asyncio.Queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(settings.ws_transcribe_max_inflight)
+        self._tasks = set()
+        self._completed = {}
+        self._next_sequence = 0
+        self._emit_sequence = 0
+    
+    def feed(self, data: bytes):
+        """Add audio; completed segments are dispatched immediately"""
+        if self.segmenter is None:
+            self._dispatch(data, True)
+            return
+        for segment, is_final in self.segmenter.feed(data):
+            self._dispatch(segment, is_final)
+    
+    def flush(self):
+        """Close the current utterance, e.g. when the client stops talking"""
+        if self.segmenter is not None:
+            segment = self.segmenter.flush()
+            if segment is not None:
+                self._dispatch(*segment)
+    
+    async def finish(self):
+        """Flush, wait for every segment, then queue the end-of-stream sentinel"""
+        self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.results.put(None)
+    
+    def cancel(self):
+        """Abandon in-flight segments (client went away)"""
+        for task in self._tasks:
+            task.cancel()
+    
+    def _dispatch(self, audio: bytes, is_final: bool):
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        task = asyncio.create_task(self._transcribe(sequence, audio, is_final))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _transcribe(self, sequence: int, audio: bytes, is_final: bool):
+        start_time = time.time()
+        try:
+            async with self._slots:
+                result = await self.service.transcribe_bytes(
+                    audio,
+                    self.audio_format,
+                    start_time,
+                    sample_rate=self.sample_rate
+                )
+        except Exception as e:
+            log.warning(
+                "Segment transcription failed",
+                extra={"speaker_id": self.speaker_id, "sequence": sequence, "error": str(e)}
+            )
+            result = self.service._unavailable(start_time)
+        
+        self._completed[sequence] = StreamingTranscriptionMessage(
+            type="final" if is_final else "partial",
+            sequence=sequence,
+            transcript=result["transcript"],
+            speaker_id=self.speaker_id,
+            confidence=result["confidence"],
+            timestamp=datetime.now(),
+            processing_time=result.get("processing_time", 0.0),
+            language=result.get("language", "en")
+        )
+        # Release results in order, holding back any that overtook an earlier segment
+        while self._emit_sequence in self._completed:
+            await self.results.put(self._completed.pop(self._emit_sequence))
+            self._emit_sequence += 1
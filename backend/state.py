@@ -0,0 +1,457 @@
+import asyncio
+from abc import ABC, abstractmethod
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+
+# Characters SCAN MATCH treats as glob syntax
+_GLOB_SPECIAL = re.compile(r"([*?\[\]\\])")
+
+
+class StateBackend(ABC):
+    """
+    Shared key/value + list store used for state that must be visible to every worker
+
+    Values are strings (callers serialize to JSON). `ttl` is in seconds; None
+    means no expiry.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def get(self, key: str) -> str | None:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: float | None = None):
+        ...
+
+    @abstractmethod
+    async def add(self, key: str, value: str, ttl: float | None = None) -> bool:
+        """Set only if the key is absent; True if it was set (used as a lease)"""
+
+    @abstractmethod
+    async def delete(self, *keys: str):
+        ...
+
+    @abstractmethod
+    async def append(self, key: str, value: str, ttl: float | None = None) -> int:
+        """Append to a list, refreshing its TTL; returns the new length"""
+
+    @abstractmethod
+    async def get_list(self, key: str) -> list[str]:
+        ...
+
+    @abstractmethod
+    async def trim_list(self, key: str, count: int):
+        """Drop the first `count` items of a list"""
+
+    @abstractmethod
+    async def keys(self, prefix: str) -> list[str]:
+        ...
+
+    async def sweep(self):
+        """Purge expired entries (no-op where the store expires keys itself)"""
+
+    async def close(self):
+        """Release connections"""
+
+    def stats(self) -> dict:
+        return {"backend": self.name}
+
+
+class MemoryStateBackend(StateBackend):
+    """Process-local store bounded by max_entries (least recently used go first); only correct with a single worker"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float | None, object]] = OrderedDict()
+        self.evicted = 0
+
+    def _live(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def _store(self, key: str, value, ttl: float | None):
+        self._data[key] = (time.time() + ttl if ttl is not None else None, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evicted += 1
+
+    async def get(self, key: str) -> str | None:
+        value = self._live(key)
+        return value if isinstance(value, str) else None
+
+    async def set(self, key: str, value: str, ttl: float | None = None):
+        self._store(key, value, ttl)
+
+    async def add(self, key: str, value: str, ttl: float | None = None) -> bool:
+        if self._live(key) is not None:
+            return False
+        self._store(key, value, ttl)
+        return True
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def append(self, key: str, value: str, ttl: float | None = None) -> int:
+        items = self._live(key)
+        if not isinstance(items, list):
+            items = []
+        items.append(value)
+        self._store(key, items, ttl)
+        return len(items)
+
+    async def get_list(self, key: str) -> list[str]:
+        items = self._live(key)
+        return list(items) if isinstance(items, list) else []
+
+    async def trim_list(self, key: str, count: int):
+        items = self._live(key)
+        if isinstance(items, list):
+            del items[:count]
+
+    async def keys(self, prefix: str) -> list[str]:
+        now = time.time()  # Scans don't count as use, so don't go through _live
+        return [
+            key for key, (expires_at, _) in list(self._data.items())
+            if key.startswith(prefix) and (expires_at is None or expires_at > now)
+        ]
+
+    async def sweep(self):
+        now = time.time()
+        for key, (expires_at, _) in list(self._data.items()):
+            if expires_at is not None and expires_at <= now:
+                del self._data[key]
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "entries": len(self._data), "evicted": self.evicted}
+
+
+class SQLiteStateBackend(StateBackend):
+    """
+    File-backed store shared by worker processes on one host
+
+    Each process holds its own connection in WAL mode; queries run in a worker
+    thread to stay off the event loop.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (call with _lock held)"""
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS kv "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS lists "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS lists_key ON lists (key, id)")
+            self._db = db
+        return self._db
+
+    async def _run(self, operation, *args):
+        return await asyncio.to_thread(self._locked, operation, *args)
+
+    def _locked(self, operation, *args):
+        with self._lock:
+            return operation(self._connect(), *args)
+
+    @staticmethod
+    def _expiry(ttl: float | None) -> float | None:
+        return time.time() + ttl if ttl is not None else None
+
+    async def get(self, key: str) -> str | None:
+        def operation(db, key):
+            row = db.execute(
+                "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time())
+            ).fetchone()
+            return row[0] if row else None
+        return await self._run(operation, key)
+
+    async def set(self, key: str, value: str, ttl: float | None = None):
+        def operation(db, key, value, expires_at):
+            db.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+        await self._run(operation, key, value, self._expiry(ttl))
+
+    async def add(self, key: str, value: str, ttl: float | None = None) -> bool:
+        def operation(db, key, value, expires_at):
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("DELETE FROM kv WHERE key = ? AND expires_at <= ?", (key, time.time()))
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, expires_at)
+                )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            return cursor.rowcount == 1
+        return await self._run(operation, key, value, self._expiry(ttl))
+
+    async def delete(self, *keys: str):
+        def operation(db, keys):
+            db.executemany("DELETE FROM kv WHERE key = ?", [(key,) for key in keys])
+            db.executemany("DELETE FROM lists WHERE key = ?", [(key,) for key in keys])
+        await self._run(operation, keys)
+
+    async def append(self, key: str, value: str, ttl: float | None = None) -> int:
+        def operation(db, key, value, expires_at):
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("DELETE FROM lists WHERE key = ? AND expires_at <= ?", (key, time.time()))
+                db.execute("INSERT INTO lists (key, value, expires_at) VALUES (?, ?, ?)", (key, value, expires_at))
+                db.execute("UPDATE lists SET expires_at = ? WHERE key = ?", (expires_at, key))
+                length = db.execute("SELECT COUNT(*) FROM lists WHERE key = ?", (key,)).fetchone()[0]
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            return length
+        return await self._run(operation, key, value, self._expiry(ttl))
+
+    async def get_list(self, key: str) -> list[str]:
+        def operation(db, key):
+            rows = db.execute(
+                "SELECT value FROM lists WHERE key = ? AND (expires_at IS NULL OR expires_at > ?) ORDER BY id",
+                (key, time.time())
+            ).fetchall()
+            return [row[0] for row in rows]
+        return await self._run(operation, key)
+
+    async def trim_list(self, key: str, count: int):
+        def operation(db, key, count):
+            db.execute(
+                "DELETE FROM lists WHERE id IN (SELECT id FROM lists WHERE key = ? ORDER BY id LIMIT ?)",
+                (key, count)
+            )
+        await self._run(operation, key, count)
+
+    async def keys(self, prefix: str) -> list[str]:
+        def operation(db, prefix):
+            now = time.time()
+            pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            rows = db.execute(
+                "SELECT key FROM kv WHERE key LIKE ? ESCAPE '\\' AND (expires_at IS NULL OR expires_at > ?) "
+                "UNION SELECT DISTINCT key FROM lists WHERE key LIKE ? ESCAPE '\\' AND (expires_at IS NULL OR expires_at > ?)",
+                (pattern, now, pattern, now)
+            ).fetchall()
+            return [row[0] for row in rows]
+        return await self._run(operation, prefix)
+
+    async def sweep(self):
+        def operation(db):
+            now = time.time()
+            db.execute("DELETE FROM kv WHERE expires_at <= ?", (now,))
+            db.execute("DELETE FROM lists WHERE expires_at <= ?", (now,))
+        await self._run(operation)
+
+    async def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "path": self.path}
+
+
+class RedisError(Exception):
+    """Error reply from a Redis-protocol server"""
+
+
+class RedisStateBackend(StateBackend):
+    """
+    Store on any server speaking the Redis protocol (RESP2)
+
+    Uses a small built-in client so no redis package is required; connections
+    are pooled and each command gets a connection to itself.
+    """
+
+    name = "redis"
+
+    def __init__(self, host: str, port: int = 6379, db: int = 0, password: str | None = None, pool_size: int = 8):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.pool_size = pool_size
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._opened = 0
+        self._available: asyncio.Semaphore | None = None
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        connection = (reader, writer)
+        try:
+            if self.password:
+                await self._roundtrip(connection, "AUTH", self.password)
+            if self.db:
+                await self._roundtrip(connection, "SELECT", self.db)
+        except BaseException:
+            writer.close()
+            raise
+        return connection
+
+    async def command(self, *args):
+        """Run one command on a pooled connection and return the decoded reply"""
+        if self._available is None:
+            self._available = asyncio.Semaphore(self.pool_size)
+        async with self._available:
+            connection = self._idle.pop() if self._idle else await self._open()
+            in_step = False
+            try:
+                reply = await self._roundtrip(connection, *args)
+                in_step = True
+                return reply
+            except RedisError:
+                in_step = True  # An error reply was read in full
+                raise
+            finally:
+                # Anything else, cancellation included, may leave a reply half read
+                if in_step:
+                    self._idle.append(connection)
+                else:
+                    connection[1].close()
+
+    async def _roundtrip(self, connection, *args):
+        reader, writer = connection
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(f"${len(data)}\r\n".encode())
+            parts.append(data)
+            parts.append(b"\r\n")
+        writer.write(b"".join(parts))
+        await writer.drain()
+        return await self._read_reply(reader)
+
+    async def _read_reply(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise RedisError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = await reader.readexactly(length + 2)
+            return data[:-2].decode()
+        if kind == b"*":
+            count = int(body)
+            if count < 0:
+                return None
+            return [await self._read_reply(reader) for _ in range(count)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    @staticmethod
+    def _px(ttl: float | None) -> list:
+        return ["PX", max(1, int(ttl * 1000))] if ttl is not None else []
+
+    async def get(self, key: str) -> str | None:
+        return await self.command("GET", key)
+
+    async def set(self, key: str, value: str, ttl: float | None = None):
+        await self.command("SET", key, value, *self._px(ttl))
+
+    async def add(self, key: str, value: str, ttl: float | None = None) -> bool:
+        return await self.command("SET", key, value, "NX", *self._px(ttl)) is not None
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self.command("DEL", *keys)
+
+    async def append(self, key: str, value: str, ttl: float | None = None) -> int:
+        length = await self.command("RPUSH", key, value)
+        if ttl is not None:
+            await self.command("PEXPIRE", key, max(1, int(ttl * 1000)))
+        return length
+
+    async def get_list(self, key: str) -> list[str]:
+        return await self.command("LRANGE", key, 0, -1) or []
+
+    async def trim_list(self, key: str, count: int):
+        await self.command("LTRIM", key, count, -1)
+
+    async def keys(self, prefix: str) -> list[str]:
+        found = []
+        cursor = "0"
+        while True:
+            cursor, batch = await self.command("SCAN", cursor, "MATCH", self._match_prefix(prefix), "COUNT", 500)
+            found.extend(batch)
+            if cursor == "0":
+                return found
+
+    @staticmethod
+    def _match_prefix(prefix: str) -> str:
+        """SCAN MATCH pattern for keys starting with prefix, taken literally"""
+        return _GLOB_SPECIAL.sub(r"\\\1", prefix) + "*"
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "host": self.host, "port": self.port, "db": self.db}
+
+
+def create_state_backend(url: str, memory_max_entries: int = 50000) -> StateBackend:
+    """
+    Build a backend from a URL
+
+    memory://                      single worker only
+    sqlite:///state.db             workers on one host (sqlite:////abs/path.db)
+    redis://[:password@]host:port/db
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemoryStateBackend(memory_max_entries)
+    if parsed.scheme == "sqlite":
+        # sqlite:///relative.db or sqlite:////absolute/path.db
+        return SQLiteStateBackend(parsed.path[1:] or "state.db")
+    if parsed.scheme == "redis":
+        return RedisStateBackend(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(parsed.path.lstrip("/") or 0),
+            password=parsed.password
+        )
+    raise ValueError(f"Unsupported state backend URL: {url}")
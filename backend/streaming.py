@@ -0,0 +1,70 @@
+import json
+
+
+class SummaryFieldParser:
+    """
+    Incremental parser for a streamed JSON object
+
+    Feed it text as it arrives from the LLM; each call returns the top-level
+    (key, value) pairs whose values completed in that chunk. Anything before the
+    opening brace (e.g. a ```json fence) is ignored.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start = None
+        self._done = False
+
+    def feed(self, chunk: str) -> list[tuple[str, object]]:
+        """Consume a chunk and return newly completed top-level fields"""
+        self.text += chunk
+        completed = []
+        text = self.text
+
+        while self._pos < len(text) and not self._done:
+            char = text[self._pos]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                if self._depth > 0:
+                    self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._member_start = self._pos + 1
+            elif char in "}]":
+                if self._depth == 1:
+                    completed.extend(self._close_member(text[self._member_start:self._pos]))
+                    self._done = True
+                self._depth -= 1
+            elif char == "," and self._depth == 1:
+                completed.extend(self._close_member(text[self._member_start:self._pos]))
+                self._member_start = self._pos + 1
+
+            self._pos += 1
+
+        return completed
+
+    def _close_member(self, member: str) -> list[tuple[str, object]]:
+        """Decode one `"key": value` member, skipping anything malformed"""
+        if not member.strip():
+            return []
+        try:
+            return list(json.loads("{" + member + "}").items())
+        except json.JSONDecodeError:
+            return []
+
+
+def sse_event(event: str, data) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,14 @@
+import os
+import sys
+from pathlib import Path
+
+# The backend is a flat set of modules run from its own directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Settings are read at import time; no upstream is contacted by these tests
+os.environ.setdefault("LIVEKIT_API_KEY", "testkey")
+os.environ.setdefault("LIVEKIT_API_SECRET", "test-secret-that-is-at-least-32-characters")
+os.environ.setdefault("LIVEKIT_WS_URL", "ws://127.0.0.1:1")
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("GROQ_API_KEY", "gsk-test")
+os.environ.setdefault("STATE_BACKEND_URL", "memory://")
@@ -0,0 +1,54 @@
+import asyncio
+
+import httpx
+
+import main
+
+
+def test_summary_long_poll_does_not_starve_transfer(monkeypatch):
+    budget = main.admission.classes["transfer"]
+    monkeypatch.setattr(budget, "limit", 2)
+    monkeypatch.setattr(budget, "timeout", 0.2)
+
+    async def get_summary(transfer_id, wait=0.0):
+        await asyncio.sleep(wait)
+        return None
+
+    async def initiate_transfer(caller_room_id, agent_a_id, transcript=None, async_summary=False):
+        return {
+            "transfer_id": "t2",
+            "transfer_room_id": "transfer_t2",
+            "agent_a_token": "a",
+            "agent_b_token": "b",
+            "summary": None,
+            "summary_status": "pending",
+            "preliminary_summary": None
+        }
+
+    monkeypatch.setattr(main.transfer_service, "get_summary", get_summary)
+    monkeypatch.setattr(main.transfer_service, "initiate_transfer", initiate_transfer)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            polls = [
+                asyncio.create_task(client.get("/transfers/t1/summary", params={"wait": 1}))
+                for _ in range(budget.limit + 1)
+            ]
+            await asyncio.sleep(0.05)
+            response = await client.post("/transfer", json={"caller_room_id": "room", "agent_a_id": "agent"})
+            await asyncio.gather(*polls)
+            return response
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert response.json()["transfer_id"] == "t2"
+
+
+def test_admission_classes():
+    assert main.admission_class("POST", "/transfer") == "transfer"
+    assert main.admission_class("POST", "/transfers/t1/complete") == "transfer"
+    assert main.admission_class("GET", "/transfers/t1/summary") is None
+    assert main.admission_class("GET", "/transfers/t1/summary/stream") is None
+    assert main.admission_class("POST", "/transcribe/raw") == "transcribe"
+    assert main.admission_class("GET", "/health") is None
@@ -0,0 +1,115 @@
+import asyncio
+import math
+import struct
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+import main
+from audio import HAVE_NUMPY, pcm_to_wav, preprocess_audio, read_wav
+from models import TranscriptionRequest
+
+
+needs_numpy = pytest.mark.skipif(not HAVE_NUMPY, reason="audio preprocessing needs numpy")
+
+
+def stereo_pcm(sample_rate: int, silence: float, speech: float) -> bytes:
+    """Silence, a 440 Hz tone on both channels, then silence again"""
+    quiet = int(sample_rate * silence)
+    loud = int(sample_rate * speech)
+    samples = [0] * quiet
+    samples += [int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate)) for i in range(loud)]
+    samples += [0] * quiet
+    return b"".join(struct.pack("<hh", sample, sample) for sample in samples)
+
+
+@needs_numpy
+def test_preprocess_downmixes_resamples_and_trims():
+    audio = stereo_pcm(48000, silence=1.0, speech=0.5)
+    processed = preprocess_audio(audio, "pcm", 48000, 2, target_rate=16000, pad_ms=90)
+
+    assert processed.sample_rate == 16000
+    assert processed.input_bytes == len(audio)
+    # 0.5 s of mono 16 kHz speech plus the padding, and up to a 30 ms frame, each side
+    assert 16000 <= len(processed.pcm) <= 2 * int(16000 * (0.5 + 2 * (0.09 + 0.03)))
+    assert processed.bytes_saved == len(audio) - len(processed.pcm)
+
+
+@needs_numpy
+def test_preprocess_wav_matches_pcm():
+    audio = stereo_pcm(48000, silence=0.3, speech=0.3)
+    from_pcm = preprocess_audio(audio, "pcm", 48000, 2)
+    from_wav = preprocess_audio(pcm_to_wav(audio, 48000, 2), "wav")
+    assert from_wav.pcm == from_pcm.pcm
+    assert from_wav.input_bytes == len(audio)  # The WAV header isn't counted
+
+
+@needs_numpy
+def test_preprocess_silence():
+    processed = preprocess_audio(b"\0" * 32000, "pcm", 16000, 1)
+    assert processed.silent
+    assert processed.bytes_saved == 32000
+
+
+@needs_numpy
+def test_preprocess_rejects_unreadable_audio():
+    with pytest.raises(ValueError):
+        preprocess_audio(b"RIFF", "wav")
+    with pytest.raises(ValueError):
+        preprocess_audio(b"\0" * 100, "mp3")
+
+
+@needs_numpy
+def test_transcribe_bytes_uploads_trimmed_mono(monkeypatch):
+    service = main.transcription_service
+    uploads = []
+
+    async def call_whisper(audio, audio_format):
+        uploads.append((bytes(audio), audio_format))
+        return {"transcript": "hello", "confidence": 1.0, "language": "en"}
+
+    monkeypatch.setattr(service, "_call_whisper", call_whisper)
+    monkeypatch.setattr(service, "preprocess", True)
+    saved_before = service.bytes_saved
+    audio = stereo_pcm(48000, silence=1.0, speech=0.5)
+
+    async def scenario():
+        result = await service.transcribe_bytes(audio, "pcm", sample_rate=48000, channels=2)
+        silent = await service.transcribe_bytes(b"\0" * 3200, "pcm")
+        return result, silent
+
+    result, silent = asyncio.run(scenario())
+    assert result["transcript"] == "hello"
+    assert silent["transcript"] == ""
+    assert len(uploads) == 1  # The silent chunk never reached Whisper
+
+    upload, audio_format = uploads[0]
+    pcm, sample_rate, channels = read_wav(upload)
+    assert (audio_format, sample_rate, channels) == ("wav", 16000, 1)
+    assert service.bytes_saved - saved_before == len(audio) - len(pcm) + 3200
+
+
+@pytest.mark.parametrize("params", [
+    {"audio_format": "pcm", "channels": 0},
+    {"audio_format": "pcm", "sample_rate": 0},
+    {"audio_format": "pcm", "sample_rate": -16000}
+])
+def test_raw_transcription_rejects_bad_pcm_layout(params):
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(
+                "/transcribe/raw",
+                params={"speaker_id": "caller", "room_id": "room", **params},
+                content=b"\0" * 3200
+            )
+
+    assert asyncio.run(scenario()).status_code == 422
+
+
+def test_transcription_request_rejects_bad_pcm_layout():
+    with pytest.raises(ValidationError):
+        TranscriptionRequest(audio_data="", speaker_id="caller", room_id="room", channels=0)
+    with pytest.raises(ValidationError):
+        TranscriptionRequest(audio_data="", speaker_id="caller", room_id="room", sample_rate=-1)
@@ -0,0 +1,115 @@
+import asyncio
+import uuid
+
+import httpx
+import pytest
+
+import main
+from idempotency import IdempotencyConflict, IdempotentRequests
+from state import MemoryStateBackend
+
+
+@pytest.fixture
+def initiated(monkeypatch) -> list:
+    calls = []
+
+    async def initiate_transfer(caller_room_id, agent_a_id, transcript=None, async_summary=False):
+        calls.append(caller_room_id)
+        await asyncio.sleep(0.05)  # Long enough for the concurrent duplicate to arrive
+        transfer_id = f"t{len(calls)}"
+        return {
+            "transfer_id": transfer_id,
+            "transfer_room_id": f"transfer_{transfer_id}",
+            "agent_a_token": "a",
+            "agent_b_token": "b",
+            "summary": None,
+            "summary_status": "pending",
+            "preliminary_summary": None
+        }
+
+    monkeypatch.setattr(main.transfer_service, "initiate_transfer", initiate_transfer)
+    return calls
+
+
+async def post_transfers(*requests: tuple[dict, str | None]) -> list[httpx.Response]:
+    """POST /transfer concurrently; each request is (body, Idempotency-Key)"""
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*(
+            client.post("/transfer", json=body, headers={"Idempotency-Key": key} if key else {})
+            for body, key in requests
+        ))
+
+
+def transfer_body(transcript: str = "caller: I was charged twice") -> dict:
+    return {"caller_room_id": f"room-{uuid.uuid4()}", "agent_a_id": "agent", "transcript": transcript}
+
+
+def test_identical_concurrent_transfers_run_once(initiated):
+    body = transfer_body()
+    first, second = asyncio.run(post_transfers((body, None), (body, None)))
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["transfer_id"] == second.json()["transfer_id"]
+    assert len(initiated) == 1
+    assert sorted(response.headers.get("Idempotent-Replayed", "false") for response in (first, second)) == ["false", "true"]
+
+
+def test_idempotency_key_replays_and_rejects_a_different_body(initiated):
+    key = str(uuid.uuid4())
+    body = transfer_body()
+    first, retry = asyncio.run(post_transfers((body, key), (body, key)))
+    later, = asyncio.run(post_transfers((body, key)))
+    conflict, = asyncio.run(post_transfers((transfer_body("caller: something else"), key)))
+
+    assert len(initiated) == 1
+    assert first.json()["transfer_id"] == retry.json()["transfer_id"] == later.json()["transfer_id"]
+    assert later.headers["Idempotent-Replayed"] == "true"
+    assert conflict.status_code == 422
+    assert "different request" in conflict.json()["detail"]
+
+
+def test_idempotency_key_length_is_checked(initiated):
+    response, = asyncio.run(post_transfers((transfer_body(), "k" * 256)))
+    assert response.status_code == 400
+    assert initiated == []
+
+
+def test_keyed_response_is_replayed_by_another_worker():
+    state = MemoryStateBackend()
+    workers = [IdempotentRequests(state), IdempotentRequests(state)]
+    calls = []
+
+    async def call():
+        calls.append(True)
+        return {"transfer_id": "t1"}
+
+    async def scenario():
+        first = await workers[0].run("transfer", "key", {"room": "a"}, call)
+        second = await workers[1].run("transfer", "key", {"room": "a"}, call)
+        with pytest.raises(IdempotencyConflict):
+            await workers[1].run("transfer", "key", {"room": "b"}, call)
+        return first, second
+
+    assert asyncio.run(scenario()) == (({"transfer_id": "t1"}, False), ({"transfer_id": "t1"}, True))
+    assert len(calls) == 1
+    assert workers[1].conflicts == 1
+
+
+def test_failures_are_not_kept():
+    requests = IdempotentRequests(MemoryStateBackend())
+    calls = []
+
+    async def call():
+        calls.append(True)
+        if len(calls) == 1:
+            raise RuntimeError("LiveKit unavailable")
+        return {"transfer_id": "t1"}
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await requests.run("transfer", "key", {"room": "a"}, call)
+        return await requests.run("transfer", "key", {"room": "a"}, call)
+
+    assert asyncio.run(scenario()) == ({"transfer_id": "t1"}, False)
+    assert len(calls) == 2
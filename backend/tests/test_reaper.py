@@ -0,0 +1,38 @@
+import asyncio
+
+from livekit.protocol.models import ParticipantInfo, Room
+from livekit.protocol.webhook import WebhookEvent
+
+import main
+
+
+def webhook(event: str, room_name: str, identity: str, created_at: int) -> WebhookEvent:
+    return WebhookEvent(
+        event=event,
+        id=f"{event}-{room_name}-{identity}",
+        created_at=created_at,
+        room=Room(name=room_name),
+        participant=ParticipantInfo(identity=identity)
+    )
+
+
+def test_reaped_room_transcript_is_discarded(monkeypatch):
+    reaper = main.transfer_service.reaper
+    deleted = []
+
+    async def delete_room(room_name):
+        deleted.append(room_name)
+
+    monkeypatch.setattr(reaper, "delete", delete_room)
+    monkeypatch.setattr(reaper, "empty_grace", 0.0)
+
+    async def scenario():
+        await main.transcript_store.append("reaped_room", "I was double charged", "caller")
+        assert await main.transcript_store.turns("reaped_room")
+        main.livekit_service.rooms.apply(webhook("participant_joined", "reaped_room", "caller", 1))
+        main.livekit_service.rooms.apply(webhook("participant_left", "reaped_room", "caller", 2))
+        await reaper.reap()
+        return await main.transcript_store.turns("reaped_room")
+
+    assert asyncio.run(scenario()) == []
+    assert deleted == ["reaped_room"]
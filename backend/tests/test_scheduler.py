@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from config import settings
+from scheduler import JobScheduler, QueueFullError
+from services import ProviderBusyError, TranscriptionService
+
+
+def test_lower_priority_values_run_first_then_fifo():
+    scheduler = JobScheduler("test", concurrency=1, max_queue=10)
+    order = []
+
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def blocker():
+            await gate.wait()
+
+        def job(name):
+            async def run():
+                order.append(name)
+                return name
+            return run
+
+        first = asyncio.create_task(scheduler.submit(blocker))
+        await asyncio.sleep(0)  # The only worker is now busy
+        queued = [
+            asyncio.create_task(scheduler.submit(job(name), priority=priority))
+            for name, priority in (("backfill-1", 10), ("live-1", 0), ("backfill-2", 10), ("live-2", 0), ("mid", 5))
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queue_depth"] == 5
+        gate.set()
+        await asyncio.gather(first, *queued)
+        await scheduler.close()
+
+    asyncio.run(scenario())
+    assert order == ["live-1", "live-2", "mid", "backfill-1", "backfill-2"]
+    assert scheduler.completed == 6
+
+
+def test_full_queue_sheds_and_cancelled_waiters_are_skipped():
+    scheduler = JobScheduler("test", concurrency=1, max_queue=1)
+    ran = []
+
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def blocker():
+            await gate.wait()
+
+        async def job():
+            ran.append(True)
+
+        first = asyncio.create_task(scheduler.submit(blocker))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(scheduler.submit(job))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError) as shed:
+            await scheduler.submit(job)
+        assert shed.value.retry_after >= 1.0
+
+        waiting.cancel()  # The caller gives up while queued
+        gate.set()
+        await first
+        await asyncio.sleep(0.01)
+        await scheduler.close()
+
+    asyncio.run(scenario())
+    assert ran == []
+    assert scheduler.rejected == 1
+    assert scheduler.in_flight == 0
+
+
+def test_close_stops_a_worker_whose_caller_gave_up_at_the_same_time():
+    scheduler = JobScheduler("test", concurrency=1, max_queue=10)
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def job():
+            started.set()
+            await asyncio.sleep(10)
+
+        caller = asyncio.create_task(scheduler.submit(job))
+        await started.wait()
+        workers = list(scheduler._workers)
+        caller.cancel()
+        await scheduler.close()
+        done, _ = await asyncio.wait(workers, timeout=1)
+        return len(done) == len(workers)
+
+    assert asyncio.run(scenario())
+
+
+@pytest.fixture
+def transcription(monkeypatch):
+    monkeypatch.setattr(settings, "transcribe_max_retries", 2)
+    monkeypatch.setattr(settings, "transcribe_backoff_base", 0.01)
+    service = TranscriptionService(None)
+    service.scheduler.concurrency = 1
+    yield service
+    asyncio.run(service.close())
+
+
+def test_throttled_chunk_gives_its_slot_back_while_backing_off(transcription, monkeypatch):
+    attempts = []
+    in_flight_during_backoff = []
+
+    async def call_whisper(audio, audio_format):
+        chunk = bytes(audio).decode()
+        attempts.append(chunk)
+        if chunk == "A" and attempts.count("A") == 1:
+            raise ProviderBusyError(429, retry_after=0.2)
+        if chunk == "B":
+            in_flight_during_backoff.append(transcription.scheduler.in_flight)
+        return {"transcript": chunk, "confidence": 1.0, "language": "en"}
+
+    monkeypatch.setattr(transcription, "_call_whisper", call_whisper)
+
+    async def scenario():
+        throttled = asyncio.create_task(transcription.transcribe_bytes(b"A", "webm"))
+        await asyncio.sleep(0.05)  # A is now sleeping out its Retry-After
+        assert transcription.scheduler.in_flight == 0
+        other = await asyncio.wait_for(transcription.transcribe_bytes(b"B", "webm"), timeout=0.1)
+        return other, await throttled
+
+    other, throttled = asyncio.run(scenario())
+    assert (other["transcript"], throttled["transcript"]) == ("B", "A")
+    assert attempts == ["A", "B", "A"]
+    assert in_flight_during_backoff == [1]  # B ran alone in the single slot
+    assert transcription.retries == 1
+    assert transcription.scheduler.completed == 2
+    assert transcription.scheduler.failed == 1
+
+
+def test_retries_are_exhausted(transcription, monkeypatch):
+    attempts = []
+
+    async def call_whisper(audio, audio_format):
+        attempts.append(audio_format)
+        raise ProviderBusyError(503)
+
+    monkeypatch.setattr(transcription, "_call_whisper", call_whisper)
+
+    with pytest.raises(ProviderBusyError):
+        asyncio.run(transcription.transcribe_bytes(b"A", "webm"))
+    assert len(attempts) == settings.transcribe_max_retries + 1
+    assert transcription.retries == settings.transcribe_max_retries
+    assert transcription.exhausted == 1
+    assert transcription.scheduler.in_flight == 0
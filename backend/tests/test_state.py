@@ -0,0 +1,269 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from state import MemoryStateBackend, RedisError, RedisStateBackend, SQLiteStateBackend, create_state_backend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    state = MemoryStateBackend() if request.param == "memory" else SQLiteStateBackend(str(tmp_path / "state.db"))
+    yield state
+    asyncio.run(state.close())
+
+
+def test_get_set_delete(backend):
+    async def scenario():
+        assert await backend.get("a") is None
+        await backend.set("a", "1")
+        await backend.set("b", "2")
+        assert await backend.get("a") == "1"
+        await backend.set("a", "3")
+        assert await backend.get("a") == "3"
+        await backend.delete("a", "b", "missing")
+        return await backend.get("a"), await backend.get("b")
+
+    assert asyncio.run(scenario()) == (None, None)
+
+
+def test_ttl_expiry_and_sweep(backend):
+    async def scenario():
+        await backend.set("short", "1", ttl=0.05)
+        await backend.set("long", "1", ttl=60)
+        await backend.append("list", "x", ttl=0.05)
+        await asyncio.sleep(0.1)
+        expired = await backend.get("short"), await backend.get_list("list")
+        await backend.sweep()
+        return expired, await backend.keys("")
+
+    expired, keys = asyncio.run(scenario())
+    assert expired == (None, [])
+    assert keys == ["long"]
+
+
+def test_add_is_a_lease(backend):
+    async def scenario():
+        first = await backend.add("lease", "a", ttl=0.05)
+        second = await backend.add("lease", "b", ttl=0.05)
+        holder = await backend.get("lease")
+        await asyncio.sleep(0.1)
+        after_expiry = await backend.add("lease", "c", ttl=60)
+        await backend.delete("lease")
+        after_delete = await backend.add("lease", "d")
+        return first, second, holder, after_expiry, after_delete
+
+    assert asyncio.run(scenario()) == (True, False, "a", True, True)
+
+
+def test_lists(backend):
+    async def scenario():
+        lengths = [await backend.append("turns", turn, ttl=60) for turn in ("one", "two", "three")]
+        await backend.trim_list("turns", 2)
+        trimmed = await backend.get_list("turns")
+        await backend.trim_list("missing", 1)
+        await backend.delete("turns")
+        return lengths, trimmed, await backend.get_list("turns")
+
+    assert asyncio.run(scenario()) == ([1, 2, 3], ["three"], [])
+
+
+def test_keys_prefix_is_literal(backend):
+    async def scenario():
+        for key in ("a_b:1", "a%b:2", "axb:3", "other"):
+            await backend.set(key, "1")
+        await backend.append("a_b:list", "x")
+        return sorted(await backend.keys("a_b:")), await backend.keys("a%")
+
+    assert asyncio.run(scenario()) == (["a_b:1", "a_b:list"], ["a%b:2"])
+
+
+def test_memory_evicts_least_recently_used():
+    backend = MemoryStateBackend(max_entries=2)
+
+    async def scenario():
+        await backend.set("a", "1")
+        await backend.set("b", "2")
+        await backend.get("a")  # a is now more recent than b
+        await backend.set("c", "3")
+        return await backend.get("a"), await backend.get("b"), await backend.get("c")
+
+    assert asyncio.run(scenario()) == ("1", None, "3")
+    assert backend.evicted == 1
+
+
+def test_sqlite_lease_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "state.db")
+    workers = [SQLiteStateBackend(path), SQLiteStateBackend(path)]
+
+    async def scenario():
+        won = await asyncio.gather(*(worker.add("reaper:lease", str(i), ttl=60) for i, worker in enumerate(workers)))
+        await workers[0].append("shared", "x")
+        seen = await workers[1].get_list("shared")
+        for worker in workers:
+            await worker.close()
+        return sorted(won), seen
+
+    assert asyncio.run(scenario()) == ([False, True], ["x"])
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_create_state_backend(tmp_path):
+    assert isinstance(create_state_backend("memory://"), MemoryStateBackend)
+    assert create_state_backend(f"sqlite:///{tmp_path}/state.db").path == f"{tmp_path}/state.db"
+    redis = create_state_backend("redis://:secret@cache:6380/2")
+    assert (redis.host, redis.port, redis.db, redis.password) == ("cache", 6380, 2, "secret")
+    with pytest.raises(ValueError):
+        create_state_backend("postgres://db")
+
+
+def resp_reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+def test_resp_reply_parsing():
+    backend = RedisStateBackend("unused")
+
+    async def parse(data: bytes):
+        return await backend._read_reply(resp_reader(data))
+
+    async def scenario():
+        return [
+            await parse(b"+OK\r\n"),
+            await parse(b":42\r\n"),
+            await parse(b"$5\r\nhe\r\no\r\n"),
+            await parse(b"$-1\r\n"),
+            await parse(b"*-1\r\n"),
+            await parse(b"*2\r\n$1\r\n0\r\n*2\r\n$3\r\nk:1\r\n$3\r\nk:2\r\n")
+        ]
+
+    assert asyncio.run(scenario()) == ["OK", 42, "he\r\no", None, None, ["0", ["k:1", "k:2"]]]
+
+    with pytest.raises(RedisError, match="WRONGTYPE"):
+        asyncio.run(parse(b"-WRONGTYPE wrong kind of value\r\n"))
+    with pytest.raises(ConnectionError):
+        asyncio.run(parse(b""))
+
+
+class FakeRedis:
+    """
+    Socket server answering each RESP command with the next scripted reply
+
+    A reply wrapped in a tuple is sent and then the connection is dropped.
+    """
+
+    def __init__(self, replies: list):
+        self.replies = replies
+        self.commands = []
+        self.connections = 0
+        self.server = None
+
+    async def start(self) -> RedisStateBackend:
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return RedisStateBackend("127.0.0.1", self.server.sockets[0].getsockname()[1])
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while line := await reader.readline():
+                args = []
+                for _ in range(int(line[1:])):
+                    length = int((await reader.readline())[1:])
+                    args.append((await reader.readexactly(length + 2))[:-2].decode())
+                self.commands.append(args)
+                reply = self.replies.pop(0)
+                writer.write(reply[0] if isinstance(reply, tuple) else reply)
+                await writer.drain()
+                if isinstance(reply, tuple):
+                    return
+        finally:
+            writer.close()
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def test_redis_commands_reuse_a_connection():
+    fake = FakeRedis([b"+OK\r\n", b"$1\r\n1\r\n", b"$-1\r\n", b":2\r\n", b"-ERR boom\r\n", b"+OK\r\n"])
+
+    async def scenario():
+        backend = await fake.start()
+        await backend.set("a", "1", ttl=1.5)
+        results = [await backend.get("a"), await backend.add("a", "2")]
+        results.append(await backend.append("list", "x"))
+        with pytest.raises(RedisError):
+            await backend.get("broken")
+        await backend.set("b", "2")  # An error reply leaves the connection usable
+        await backend.close()
+        await fake.stop()
+        return results
+
+    assert asyncio.run(scenario()) == ["1", False, 2]
+    assert fake.connections == 1
+    assert fake.commands[0] == ["SET", "a", "1", "PX", "1500"]
+    assert fake.commands[2] == ["SET", "a", "2", "NX"]
+
+
+def test_redis_connection_dropped_mid_reply_is_not_reused():
+    fake = FakeRedis([(b"$10\r\nhalf",), b"$2\r\nok\r\n"])
+
+    async def scenario():
+        backend = await fake.start()
+        with pytest.raises(asyncio.IncompleteReadError):
+            await backend.get("a")
+        idle_after_drop = len(backend._idle)
+        value = await backend.get("b")
+        await backend.close()
+        await fake.stop()
+        return idle_after_drop, value
+
+    assert asyncio.run(scenario()) == (0, "ok")
+    assert fake.connections == 2
+
+
+def test_redis_cancelled_command_closes_its_connection():
+    fake = FakeRedis([])
+    hung = asyncio.Event()
+
+    async def never_reply(reader, writer):
+        fake.connections += 1
+        await reader.readline()
+        hung.set()
+        await reader.read()  # Until the client hangs up
+        writer.close()
+
+    fake._serve = never_reply
+
+    async def scenario():
+        backend = await fake.start()
+        command = asyncio.create_task(backend.get("a"))
+        await hung.wait()
+        command.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await command
+        idle = len(backend._idle)
+        await fake.stop()
+        return idle
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_redis_keys_escapes_glob_characters():
+    fake = FakeRedis([b"*2\r\n$1\r\n7\r\n*1\r\n$5\r\na*b:1\r\n", b"*2\r\n$1\r\n0\r\n*0\r\n"])
+
+    async def scenario():
+        backend = await fake.start()
+        keys = await backend.keys("a*b?[x]:")
+        await backend.close()
+        await fake.stop()
+        return keys
+
+    assert asyncio.run(scenario()) == ["a*b:1"]
+    assert fake.commands == [
+        ["SCAN", "0", "MATCH", "a\\*b\\?\\[x\\]:*", "COUNT", "500"],
+        ["SCAN", "7", "MATCH", "a\\*b\\?\\[x\\]:*", "COUNT", "500"]
+    ]
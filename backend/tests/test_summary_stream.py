@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+from config import settings
+from services import LLMService
+
+
+SUMMARY = {
+    "customer_name": "Jordan Lee",
+    "issue_type": "Billing Inquiry",
+    "key_points": ["Charged twice"],
+    "current_status": "Awaiting refund",
+    "recommended_actions": ["Approve the refund"],
+    "customer_sentiment": "Frustrated"
+}
+
+
+async def answer(messages):
+    yield json.dumps(SUMMARY)
+
+
+async def collect(llm: LLMService, transcript: str) -> list:
+    return [event async for event in llm.stream_summary(transcript)]
+
+
+def stream_with_primary(monkeypatch, primary) -> LLMService:
+    monkeypatch.setattr(settings, "llm_execution_mode", "hedge")
+    monkeypatch.setattr(settings, "llm_hedge_delay", 0.05)
+    llm = LLMService(None)
+    monkeypatch.setattr(llm, "_stream_openai", primary)
+    monkeypatch.setattr(llm, "_stream_groq", answer)
+    events = asyncio.run(collect(llm, "caller: I was charged twice for my order"))
+    kind, summary = events[-1]
+    assert kind == "summary"
+    assert summary.provider_used == "groq"
+    assert summary.customer_name == "Jordan Lee"
+    return llm
+
+
+def test_hedged_out_primary_is_not_a_breaker_failure(monkeypatch):
+    async def slow(messages):
+        await asyncio.sleep(5)
+        yield json.dumps(SUMMARY)
+
+    llm = stream_with_primary(monkeypatch, slow)
+    openai = llm.health.stats()["openai"]
+    assert openai["error_rate"] == 0.0
+    assert openai["calls_in_window"] == 0  # Abandoned before slow_call_threshold: inconclusive
+
+
+def test_failing_primary_is_a_breaker_failure(monkeypatch):
+    async def broken(messages):
+        raise RuntimeError("HTTP 500")
+        yield
+
+    llm = stream_with_primary(monkeypatch, broken)
+    assert llm.health.stats()["openai"]["error_rate"] == 1.0
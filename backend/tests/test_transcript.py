@@ -0,0 +1,157 @@
+import asyncio
+import json
+
+import pytest
+
+from config import settings
+from models import CallSummary
+from services import LLMService
+from transcript import TRANSCRIPTION_UNAVAILABLE, CHARS_PER_TOKEN, chunk_transcript, compact_transcript, estimate_tokens
+
+
+def test_compact_merges_turns_and_drops_noise():
+    transcript = "\n".join([
+        "caller: Um, hi, I I I need help with my bill.",
+        f"caller: {TRANSCRIPTION_UNAVAILABLE}",
+        "caller: I was charged twice",
+        "caller: I was charged twice for order 4411.",
+        "agent: Okay.   Okay.",
+        "agent: No.",
+        "",
+        "caller: uh-huh"
+    ])
+    assert compact_transcript(transcript) == "\n".join([
+        "caller: hi, I need help with my bill. I was charged twice for order 4411.",
+        "agent: Okay. No."
+    ])
+
+
+def test_compact_can_keep_filler():
+    assert compact_transcript("caller: um, hello", strip_filler=False) == "caller: um, hello"
+
+
+def test_estimate_tokens_rounds_up():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a") == 1
+    assert estimate_tokens("a" * CHARS_PER_TOKEN * 3) == 3
+
+
+def test_chunks_break_between_turns():
+    turns = [f"{'caller' if i % 2 else 'agent'}: turn number {i} of the call." for i in range(40)]
+    chunks = chunk_transcript("\n".join(turns), max_tokens=40)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 40 * CHARS_PER_TOKEN for chunk in chunks)
+    assert [line for chunk in chunks for line in chunk.split("\n")] == turns
+
+
+def test_long_turn_is_split_on_sentences_and_keeps_its_speaker():
+    sentences = [f"Sentence {i} about the refund for my order." for i in range(30)]
+    chunks = chunk_transcript("caller: " + " ".join(sentences), max_tokens=25)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 25 * CHARS_PER_TOKEN for chunk in chunks)
+    assert all(chunk.startswith("caller: ") for chunk in chunks)
+    assert " ".join(chunk.removeprefix("caller: ") for chunk in chunks) == " ".join(sentences)
+
+
+def test_word_longer_than_a_chunk_is_cut():
+    chunks = chunk_transcript("x" * 100, max_tokens=5)
+    assert chunks == ["x" * 20] * 5
+
+
+def partial(label: str) -> CallSummary:
+    return CallSummary(
+        customer_name="Jordan Lee",
+        issue_type="Billing Inquiry",
+        key_points=[label],
+        current_status="In Progress",
+        recommended_actions=["Check the order"],
+        customer_sentiment="Neutral",
+        provider_used="",
+        generation_time=0.0
+    )
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    """LLMService whose only provider records every prompt; chunk prompts answer with their first turn"""
+    monkeypatch.setattr(settings, "llm_execution_mode", "sequential")
+    monkeypatch.setattr(settings, "summary_max_prompt_tokens", 60)
+    llm = LLMService(None)
+    llm.prompts = []
+    llm.fail_chunks = set()
+
+    async def generate(messages):
+        content = messages[-1]["content"]
+        llm.prompts.append(content)
+        if content.startswith("These are summaries"):
+            parts = [json.loads(part.split(": ", 1)[1]) for part in content.split(": Part ", 1)[1].split("\nPart ")]
+            merged = [point for part in parts for point in part["key_points"]]
+            return partial(" + ".join(merged))
+        chunk = content.split("extract the information: ", 1)[1]
+        label = chunk.split("\n")[0]
+        if label in llm.fail_chunks:
+            raise RuntimeError("HTTP 500")
+        return partial(label)
+
+    async def unavailable(messages):
+        raise RuntimeError("not configured")
+
+    monkeypatch.setattr(llm, "_generate_with_openai", generate)
+    monkeypatch.setattr(llm, "_generate_with_groq", unavailable)
+    return llm
+
+
+def long_call(turns: int) -> str:
+    return "\n".join(
+        f"{'agent' if i % 2 else 'caller'}: turn {i} about the duplicate charge on my card." for i in range(turns)
+    )
+
+
+def test_map_reduce_summarizes_every_chunk_then_merges(stub_llm):
+    transcript = long_call(30)
+    chunks = chunk_transcript(compact_transcript(transcript), settings.summary_max_prompt_tokens)
+    assert len(chunks) >= 4
+
+    summary = asyncio.run(stub_llm.generate_summary(transcript))
+
+    map_prompts = [prompt for prompt in stub_llm.prompts if not prompt.startswith("These are summaries")]
+    merge_prompts = [prompt for prompt in stub_llm.prompts if prompt.startswith("These are summaries")]
+    assert len(map_prompts) == len(chunks)
+    assert len(merge_prompts) > 1  # More partials than fit one merge: reduced in rounds
+    assert all(prompt.count("Part ") >= 2 for prompt in merge_prompts)
+    # Every chunk's first turn survives the reduce, in call order
+    assert summary.key_points == [" + ".join(chunk.split("\n")[0] for chunk in chunks)]
+    assert summary.provider_used == "openai"
+
+
+def test_failed_chunks_are_left_out(stub_llm):
+    transcript = long_call(30)
+    chunks = chunk_transcript(compact_transcript(transcript), settings.summary_max_prompt_tokens)
+    stub_llm.fail_chunks = {chunks[1].split("\n")[0]}
+
+    summary = asyncio.run(stub_llm.generate_summary(transcript))
+    assert summary.key_points == [" + ".join(chunk.split("\n")[0] for chunk in chunks if chunk != chunks[1])]
+
+
+def test_every_chunk_failing_falls_back_to_the_emergency_summary(stub_llm):
+    transcript = long_call(30)
+    stub_llm.fail_chunks = {chunk.split("\n")[0] for chunk in chunk_transcript(compact_transcript(transcript), 60)}
+
+    summary = asyncio.run(stub_llm.generate_summary(transcript))
+    assert summary.provider_used == "emergency_fallback"
+
+
+def test_short_transcript_is_one_call(stub_llm):
+    summary = asyncio.run(stub_llm.generate_summary("caller: I was charged twice."))
+    assert len(stub_llm.prompts) == 1
+    assert summary.key_points == ["caller: I was charged twice."]
+
+
+def test_partials_are_grouped_at_least_two_at_a_time(stub_llm):
+    partials = [partial(str(i)) for i in range(5)]
+    groups = stub_llm._group_partials(partials, budget=1)
+    assert [len(group) for group in groups] == [2, 3]  # A lone last partial joins the previous group
+    assert [summary for group in groups for summary in group] == partials
+    assert stub_llm._group_partials(partials, budget=10_000) == [partials]
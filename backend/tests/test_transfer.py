@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize("async_summary", [False, True])
+def test_transfer_without_transcript_skips_the_llm(monkeypatch, async_summary):
+    async def create_room(room_name):
+        return None
+
+    async def no_llm(*args, **kwargs):
+        raise AssertionError("LLM called without a transcript")
+
+    monkeypatch.setattr(main.livekit_service, "create_room", create_room)
+    monkeypatch.setattr(main.llm_service, "generate_summary", no_llm)
+    monkeypatch.setattr(main.llm_service, "stream_summary", no_llm)
+
+    result = asyncio.run(main.transfer_service.initiate_transfer(
+        "silent_room", "agent", transcript="  ", async_summary=async_summary
+    ))
+    assert result["summary_status"] == "ready"
+    assert result["summary"].provider_used == "heuristic"
+    assert result["summary"] == result["preliminary_summary"]
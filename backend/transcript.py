@@ -0,0 +1,190 @@
+import re
+
+from state import StateBackend
+
+
+# What TranscriptionService returns when Whisper can't be reached; never worth summarizing
+TRANSCRIPTION_UNAVAILABLE = "[Audio transcription temporarily unavailable]"
+
+# Rough chars-per-token for English chat text; good enough to bound prompt size
+CHARS_PER_TOKEN = 4
+
+_SPEAKER = re.compile(r"^([A-Za-z][\w .'-]{0,40}?):\s+(.*)$")
+_FILLER = re.compile(r"(?<![\w-])(?:uh-huh|mm-hmm|u+[hm]+|e+r+m*|a+h+|h+m+|m+h*m+)(?![\w-])[,.]?\s*", re.IGNORECASE)
+_STUTTER = re.compile(r"\b(\w+)(?:[\s,]+\1\b){2,}|\b([ai])(?:[\s,]+\2\b)+", re.IGNORECASE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WHITESPACE = re.compile(r"\s+")
+_NOT_WORD = re.compile(r"[^\w]+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (no tokenizer dependency)"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _split_speaker(line: str) -> tuple[str | None, str]:
+    match = _SPEAKER.match(line)
+    if match:
+        return match.group(1), match.group(2)
+    return None, line
+
+
+def _key(text: str) -> str:
+    """Comparison form of a sentence: lowercase words only"""
+    return _NOT_WORD.sub(" ", text.lower()).strip()
+
+
+def _clean(text: str, strip_filler: bool) -> str:
+    text = text.replace(TRANSCRIPTION_UNAVAILABLE, " ")
+    if strip_filler:
+        text = _FILLER.sub("", text)
+        text = _STUTTER.sub(lambda match: match.group(1) or match.group(2), text)
+    return _WHITESPACE.sub(" ", text).strip(" ,")
+
+
+def _dedupe_sentences(sentences: list[str]) -> list[str]:
+    """Drop sentences repeated back to back, and partial results superseded by the next sentence"""
+    kept = []
+    for sentence in sentences:
+        key = _key(sentence)
+        if not key:
+            continue
+        if kept:
+            previous = _key(kept[-1])
+            if key == previous:
+                continue
+            # Only treat longer fragments as partials, so a short reply like "No." survives
+            if key.count(" ") >= 2 and previous.endswith(" " + key):
+                continue
+            if previous.count(" ") >= 2 and key.startswith(previous + " "):
+                kept[-1] = sentence
+                continue
+        kept.append(sentence)
+    return kept
+
+
+def compact_transcript(transcript: str, strip_filler: bool = True) -> str:
+    """
+    Normalize a transcript before it goes into a prompt
+
+    Lines of the form "Speaker: text" are speaker turns; consecutive turns by
+    the same speaker are merged. Unavailable-transcription placeholders,
+    filler ("um", "uh", ...) and stutters are removed, whitespace collapsed,
+    and sentences repeated back to back (overlapping STT chunks, partial then
+    final results) are kept once. Unlabelled text is treated as one speaker.
+    """
+    turns: list[list] = []  # [speaker, sentences]
+    for line in transcript.splitlines():
+        speaker, text = _split_speaker(line.strip())
+        text = _clean(text, strip_filler)
+        if not text:
+            continue
+        sentences = _SENTENCE_END.split(text)
+        if turns and turns[-1][0] == speaker:
+            turns[-1][1].extend(sentences)
+        else:
+            turns.append([speaker, sentences])
+
+    lines = []
+    for speaker, sentences in turns:
+        text = " ".join(_dedupe_sentences(sentences))
+        if text:
+            lines.append(f"{speaker}: {text}" if speaker else text)
+    return "\n".join(lines)
+
+
+def _split_long(text: str, max_chars: int) -> list[str]:
+    """Split text on sentence, then word, boundaries into pieces of at most max_chars"""
+    units = []
+    for sentence in _SENTENCE_END.split(text):
+        if len(sentence) <= max_chars:
+            units.append(sentence)
+            continue
+        for word in sentence.split(" "):
+            units.extend(word[i:i + max_chars] for i in range(0, len(word), max_chars))
+
+    pieces, current = [], ""
+    for unit in units:
+        if current and len(current) + 1 + len(unit) > max_chars:
+            pieces.append(current)
+            current = unit
+        else:
+            current = f"{current} {unit}" if current else unit
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_transcript(transcript: str, max_tokens: int) -> list[str]:
+    """
+    Split a transcript into chunks of at most max_tokens (estimated)
+
+    Chunks break between speaker turns where possible; a turn too long for
+    one chunk is split on sentences and keeps its speaker label on every part.
+    """
+    max_chars = max(1, max_tokens * CHARS_PER_TOKEN)
+    pieces = []
+    for line in transcript.splitlines():
+        if len(line) <= max_chars:
+            pieces.append(line)
+            continue
+        speaker, text = _split_speaker(line)
+        prefix = f"{speaker}: " if speaker else ""
+        pieces.extend(prefix + part for part in _split_long(text, max(1, max_chars - len(prefix))))
+
+    chunks, current, size = [], [], 0
+    for piece in pieces:
+        if current and size + len(piece) > max_chars:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(piece)
+        size += len(piece) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+class TranscriptStore:
+    """
+    Server-side, speaker-attributed transcript per room, in the shared state backend
+
+    Turns are appended as "speaker: text" to one list per room, capped like a
+    ring: past max_turns the oldest turns are dropped. Every append refreshes
+    the room's TTL, so a room quiet for `ttl` seconds is evicted by the
+    backend. Unavailable-transcription placeholders are never stored.
+    """
+
+    def __init__(self, state: StateBackend, max_turns: int, ttl: float):
+        self.state = state
+        self.max_turns = max_turns
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(room_id: str) -> str:
+        return f"transcript:{room_id}"
+
+    @staticmethod
+    def format_turn(text: str, speaker_id: str | None = None) -> str:
+        text = _WHITESPACE.sub(" ", text.replace(TRANSCRIPTION_UNAVAILABLE, " ")).strip()
+        if not text:
+            return ""
+        return f"{speaker_id}: {text}" if speaker_id else text
+
+    async def append(self, room_id: str, text: str, speaker_id: str | None = None) -> str:
+        """Store one turn; returns it as stored ("" if there was nothing to store)"""
+        turn = self.format_turn(text, speaker_id)
+        if not turn:
+            return ""
+        length = await self.state.append(self._key(room_id), turn, ttl=self.ttl)
+        if length > self.max_turns:
+            await self.state.trim_list(self._key(room_id), length - self.max_turns)
+        return turn
+
+    async def turns(self, room_id: str) -> list[str]:
+        return await self.state.get_list(self._key(room_id))
+
+    async def text(self, room_id: str) -> str:
+        return "\n".join(await self.turns(room_id))
+
+    async def discard(self, room_id: str):
+        await self.state.delete(self._key(room_id))
@@ -0,0 +1,69 @@
+"""
+Diff two benchmark reports and flag regressions
+
+    python compare.py baseline.json candidate.json --threshold 0.10
+
+Exits 1 when any endpoint's p50/p95/p99 grew, or its throughput or success
+rate dropped, by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+
+LATENCY_KEYS = ("p50", "p95", "p99")
+
+
+def change(before: float, after: float) -> float:
+    if before == 0:
+        return 0.0 if after == 0 else float("inf")
+    return (after - before) / before
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> tuple[list[str], list[str]]:
+    """Return (table lines, regression descriptions)"""
+    lines = [f"{'endpoint':<14}{'metric':<16}{'baseline':>12}{'candidate':>12}{'change':>10}"]
+    regressions = []
+    for endpoint, before in baseline["endpoints"].items():
+        after = candidate["endpoints"].get(endpoint)
+        if after is None:
+            lines.append(f"{endpoint:<14}(missing from candidate)")
+            continue
+
+        metrics = [(f"{key} ms", before["latency_ms"][key], after["latency_ms"][key], 1) for key in LATENCY_KEYS]
+        metrics.append(("throughput rps", before["throughput_rps"], after["throughput_rps"], -1))
+        metrics.append(("success rate", 1 - before["error_rate"], 1 - after["error_rate"], -1))
+
+        for name, old, new, worse_sign in metrics:
+            delta = change(old, new)
+            flag = ""
+            if delta * worse_sign > threshold:
+                flag = "  !"
+                regressions.append(f"{endpoint} {name}: {old} -> {new} ({delta:+.1%})")
+            lines.append(f"{endpoint:<14}{name:<16}{old:>12}{new:>12}{delta:>+10.1%}{flag}")
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON reports")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative change before flagging")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    lines, regressions = compare(baseline, candidate, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
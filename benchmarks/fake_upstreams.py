@@ -0,0 +1,342 @@
+"""
+Local stand-ins for the LiveKit room API, OpenAI (chat + Whisper) and Groq
+
+Each upstream samples its response latency from a configurable distribution
+and fails a configurable fraction of requests with a 5xx or a 429 carrying
+Retry-After, so the backend's fallback and retry paths get exercised too.
+
+Run standalone:
+    python fake_upstreams.py --upstream openai latency=lognormal:0.8:0.4 throttle_rate=0.02
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from aiohttp import web
+from livekit.protocol import models as proto_models
+from livekit.protocol import room as proto_room
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+from models import CallSummary  # The backend is a flat module directory
+
+
+UPSTREAMS = ("livekit", "openai", "whisper", "groq")
+
+# What the LLMs "return": a real CallSummary minus the fields the backend fills in itself
+FAKE_SUMMARY = CallSummary(
+    customer_name="Jordan Lee",
+    issue_type="Billing Inquiry",
+    key_points=[
+        "Customer was charged twice for the March invoice",
+        "Refund requested to the original card",
+        "Account verified by phone"
+    ],
+    current_status="Awaiting refund approval",
+    recommended_actions=["Approve the duplicate charge refund", "Confirm the refund by email"],
+    customer_sentiment="Frustrated",
+    provider_used="",
+    generation_time=0.0
+).model_dump(exclude={"provider_used", "generation_time"})
+
+FAKE_TRANSCRIPT = "Hi, I was charged twice for my March invoice and I'd like a refund please."
+
+
+def parse_latency(spec: str):
+    """
+    Parse a latency spec into a zero-argument sampler returning seconds
+
+    fixed:S, uniform:LO:HI, normal:MEAN:STD (clamped at 0) or
+    lognormal:MEDIAN:SIGMA.
+    """
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    if kind == "fixed" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(values[0], values[1])
+    if kind == "normal" and len(values) == 2:
+        return lambda: max(0.0, random.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0])
+        return lambda: random.lognormvariate(mu, values[1])
+    raise ValueError(f"Invalid latency spec: {spec!r}")
+
+
+@dataclass
+class UpstreamProfile:
+    """Latency distribution and failure rates for one fake upstream"""
+    latency: str = "fixed:0.05"
+    error_rate: float = 0.0  # fraction answered with a 500
+    throttle_rate: float = 0.0  # fraction answered with a 429
+    retry_after: float = 1.0  # Retry-After sent with 429s
+    chunks: int = 12  # streamed chat responses are split into this many deltas
+    stats: dict = field(default_factory=lambda: {"requests": 0, "ok": 0, "errors": 0, "throttled": 0})
+
+    def __post_init__(self):
+        self.sample = parse_latency(self.latency)
+
+    def outcome(self) -> str:
+        """Decide how to answer the next request: ok, error or throttled"""
+        self.stats["requests"] += 1
+        roll = random.random()
+        if roll < self.throttle_rate:
+            outcome = "throttled"
+        elif roll < self.throttle_rate + self.error_rate:
+            outcome = "errors"
+        else:
+            outcome = "ok"
+        self.stats[outcome] += 1
+        return outcome
+
+    def describe(self) -> dict:
+        config = asdict(self)
+        config.pop("stats")
+        return config
+
+
+def parse_profiles(entries: list[list[str]] | None) -> dict[str, UpstreamProfile]:
+    """Build profiles from `--upstream NAME key=value ...` entries (unlisted upstreams use defaults)"""
+    overrides = {name: {} for name in UPSTREAMS}
+    for name, *pairs in entries or []:
+        if name not in overrides:
+            raise ValueError(f"Unknown upstream {name!r}, expected one of {', '.join(UPSTREAMS)}")
+        for pair in pairs:
+            key, _, value = pair.partition("=")
+            if key not in UpstreamProfile.__dataclass_fields__ or key == "stats":
+                raise ValueError(f"Unknown upstream setting {key!r}")
+            overrides[name][key] = value if key == "latency" else float(value)
+    profiles = {}
+    for name, values in overrides.items():
+        if "chunks" in values:
+            values["chunks"] = int(values["chunks"])
+        profiles[name] = UpstreamProfile(**values)
+    return profiles
+
+
+def failure_response(outcome: str, profile: UpstreamProfile, twirp: bool = False) -> web.Response:
+    """The 429 or 500 for a request that drew a failure"""
+    if outcome == "throttled":
+        status, code, message = 429, "resource_exhausted", "rate limited"
+        headers = {"Retry-After": f"{profile.retry_after:g}"}
+    else:
+        status, code, message = 500, "internal", "injected failure"
+        headers = {}
+    if twirp:
+        body = {"code": code, "msg": message}
+    else:
+        body = {"error": {"message": message, "type": code}}
+    return web.json_response(body, status=status, headers=headers)
+
+
+def chat_completion_handler(profile: UpstreamProfile, model: str):
+    """OpenAI-compatible /chat/completions, streaming or not"""
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        payload = await request.json()
+        latency = profile.sample()
+        outcome = profile.outcome()
+        content = json.dumps(FAKE_SUMMARY)
+
+        if outcome != "ok" or not payload.get("stream"):
+            await asyncio.sleep(latency)
+            if outcome != "ok":
+                return failure_response(outcome, profile)
+            return web.json_response({
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+            })
+
+        # Streamed: first token after a third of the latency, the rest spread evenly
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        step = max(1, len(content) // profile.chunks)
+        pieces = [content[i:i + step] for i in range(0, len(content), step)]
+        await asyncio.sleep(latency / 3)
+        for index, piece in enumerate(pieces):
+            if index:
+                await asyncio.sleep(latency * 2 / 3 / len(pieces))
+            chunk = {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    return handler
+
+
+def whisper_handler(profile: UpstreamProfile):
+    """OpenAI /audio/transcriptions (verbose_json)"""
+
+    async def handler(request: web.Request) -> web.Response:
+        await request.read()
+        await asyncio.sleep(profile.sample())
+        outcome = profile.outcome()
+        if outcome != "ok":
+            return failure_response(outcome, profile)
+        return web.json_response({
+            "task": "transcribe",
+            "language": "english",
+            "duration": 3.2,
+            "text": FAKE_TRANSCRIPT,
+            "segments": []
+        })
+
+    return handler
+
+
+def twirp_handler(profile: UpstreamProfile):
+    """LiveKit RoomService over Twirp (protobuf in, protobuf out)"""
+
+    async def handler(request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        body = await request.read()
+        await asyncio.sleep(profile.sample())
+        outcome = profile.outcome()
+        if outcome != "ok":
+            return failure_response(outcome, profile, twirp=True)
+
+        if method == "CreateRoom":
+            create = proto_room.CreateRoomRequest.FromString(body)
+            reply = proto_models.Room(
+                sid=f"RM_{random.getrandbits(48):012x}",
+                name=create.name,
+                empty_timeout=create.empty_timeout,
+                max_participants=create.max_participants,
+                creation_time=int(time.time())
+            )
+        elif method == "ListParticipants":
+            reply = proto_room.ListParticipantsResponse()
+        elif method == "DeleteRoom":
+            reply = proto_room.DeleteRoomResponse()
+        elif method == "ListRooms":
+            reply = proto_room.ListRoomsResponse()
+        else:
+            return web.json_response({"code": "unimplemented", "msg": method}, status=501)
+        return web.Response(body=reply.SerializeToString(), content_type="application/protobuf")
+
+    return handler
+
+
+def build_apps(profiles: dict[str, UpstreamProfile]) -> dict[str, web.Application]:
+    """One aiohttp app per upstream host; each also serves GET /_stats"""
+
+    def stats_handler(names):
+        async def handler(request: web.Request) -> web.Response:
+            return web.json_response({name: profiles[name].stats for name in names})
+        return handler
+
+    livekit = web.Application()
+    livekit.router.add_post("/twirp/livekit.RoomService/{method}", twirp_handler(profiles["livekit"]))
+    livekit.router.add_get("/_stats", stats_handler(["livekit"]))
+
+    openai = web.Application(client_max_size=64 * 1024 * 1024)
+    openai.router.add_post("/v1/chat/completions", chat_completion_handler(profiles["openai"], "gpt-4o-mini"))
+    openai.router.add_post("/v1/audio/transcriptions", whisper_handler(profiles["whisper"]))
+    openai.router.add_get("/_stats", stats_handler(["openai", "whisper"]))
+
+    groq = web.Application()
+    groq.router.add_post(
+        "/openai/v1/chat/completions",
+        chat_completion_handler(profiles["groq"], "llama-3.3-70b-versatile")
+    )
+    groq.router.add_get("/_stats", stats_handler(["groq"]))
+
+    return {"livekit": livekit, "openai": openai, "groq": groq}
+
+
+async def start_upstreams(profiles: dict[str, UpstreamProfile], host: str = "127.0.0.1", ports: dict | None = None):
+    """
+    Start every fake upstream on the current loop
+
+    Returns (runners, urls); ports default to 0 (any free port). Clean up
+    with `await runner.cleanup()` for each runner.
+    """
+    ports = ports or {}
+    runners, urls = [], {}
+    for name, app in build_apps(profiles).items():
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, ports.get(name, 0))
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        runners.append(runner)
+        urls[name] = f"http://{host}:{port}"
+    return runners, urls
+
+
+def backend_env(urls: dict[str, str]) -> dict[str, str]:
+    """Environment that points the backend's services at the fake upstreams"""
+    return {
+        "LIVEKIT_WS_URL": urls["livekit"].replace("http://", "ws://"),
+        "LIVEKIT_API_KEY": "benchkey",
+        "LIVEKIT_API_SECRET": "bench-secret-that-is-at-least-32-characters",
+        "OPENAI_API_KEY": "sk-bench",
+        "OPENAI_BASE_URL": f"{urls['openai']}/v1",
+        "GROQ_API_KEY": "gsk-bench",
+        "GROQ_BASE_URL": urls["groq"]
+    }
+
+
+def add_upstream_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--upstream", nargs="+", action="append", metavar=("NAME", "KEY=VALUE"),
+        help=(
+            f"Profile for one upstream ({', '.join(UPSTREAMS)}): latency=fixed:S|uniform:LO:HI|"
+            "normal:MEAN:STD|lognormal:MEDIAN:SIGMA error_rate=F throttle_rate=F retry_after=S chunks=N"
+        )
+    )
+
+
+async def serve_forever(profiles: dict[str, UpstreamProfile], host: str, ports: dict):
+    runners, urls = await start_upstreams(profiles, host, ports)
+    for name, url in urls.items():
+        print(f"{name}: {url}")
+    print("Backend environment:")
+    for key, value in backend_env(urls).items():
+        print(f"  {key}={value}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run fake LiveKit/OpenAI/Groq servers for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--livekit-port", type=int, default=7880)
+    parser.add_argument("--openai-port", type=int, default=7881)
+    parser.add_argument("--groq-port", type=int, default=7882)
+    add_upstream_arguments(parser)
+    args = parser.parse_args()
+
+    profiles = parse_profiles(args.upstream)
+    ports = {"livekit": args.livekit_port, "openai": args.openai_port, "groq": args.groq_port}
+    try:
+        asyncio.run(serve_forever(profiles, args.host, ports))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+Offline latency/throughput benchmark for the backend API
+
+Starts the fake upstreams, launches the backend (uvicorn) pointed at them,
+drives /create-room, /transfer and /transcribe at a fixed concurrency and
+prints a JSON report with p50/p95/p99 latency and throughput per endpoint.
+
+    python run.py --concurrency 32 --requests 500 --output baseline.json
+    python run.py --upstream openai latency=lognormal:1.2:0.5 throttle_rate=0.05 --output slow-openai.json
+    python compare.py baseline.json slow-openai.json
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import aiohttp
+
+from fake_upstreams import add_upstream_arguments, backend_env, parse_profiles, start_upstreams
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+ENDPOINTS = ("create-room", "transfer", "transcribe")
+
+TRANSCRIPT_LINES = [
+    "Caller: Hi, I was charged twice for my March invoice.",
+    "Agent: I'm sorry about that, can I get the account number?",
+    "Caller: Sure, it's 4471-902. I'd like the duplicate refunded to my card.",
+    "Agent: I can see both charges. Let me bring in billing to approve the refund."
+]
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    rank = max(1, round(fraction * len(ordered) + 0.5))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(latencies: list[float], statuses: dict[str, int], wall_time: float) -> dict:
+    """Latency percentiles (ms), throughput and status breakdown for one endpoint"""
+    ordered = sorted(latencies)
+    total = sum(statuses.values())
+    succeeded = sum(count for status, count in statuses.items() if status.startswith("2"))
+    return {
+        "requests": total,
+        "succeeded": succeeded,
+        "error_rate": round(1 - succeeded / total, 4) if total else 0.0,
+        "status_codes": dict(sorted(statuses.items())),
+        "wall_time_s": round(wall_time, 3),
+        "throughput_rps": round(total / wall_time, 2) if wall_time else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(ordered, 0.50) * 1000, 2),
+            "p95": round(percentile(ordered, 0.95) * 1000, 2),
+            "p99": round(percentile(ordered, 0.99) * 1000, 2),
+            "mean": round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0.0,
+            "max": round(ordered[-1] * 1000, 2) if ordered else 0.0
+        }
+    }
+
+
+def request_factory(endpoint: str, audio_kb: int):
+    """Return a function producing (path, json_body) for each request to an endpoint"""
+    if endpoint == "create-room":
+        return lambda: ("/create-room", {
+            "room_name": f"bench-{uuid.uuid4().hex[:12]}",
+            "participant_name": "bench-caller",
+            "role": "caller"
+        })
+    if endpoint == "transfer":
+        # A unique marker per request keeps a warm summary cache from flattering the numbers
+        return lambda: ("/transfer", {
+            "caller_room_id": f"bench-{uuid.uuid4().hex[:12]}",
+            "agent_a_id": "bench-agent-a",
+            "transcript": "\n".join(TRANSCRIPT_LINES + [f"Reference: {uuid.uuid4().hex}"])
+        })
+    if endpoint == "transcribe":
+        audio = base64.b64encode(os.urandom(audio_kb * 1024)).decode()
+        return lambda: ("/transcribe", {
+            "audio_data": audio,
+            "speaker_id": "bench-caller",
+            "room_id": "bench-room",
+            "audio_format": "webm"
+        })
+    raise ValueError(f"Unknown endpoint {endpoint!r}")
+
+
+async def drive(session: aiohttp.ClientSession, base_url: str, make_request, total: int, concurrency: int):
+    """Closed-loop load: `concurrency` clients issue `total` requests back to back"""
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    remaining = iter(range(total))
+
+    async def client():
+        for _ in remaining:
+            path, body = make_request()
+            started = time.perf_counter()
+            try:
+                async with session.post(base_url + path, json=body) as response:
+                    await response.read()
+                    status = str(response.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+class UpstreamThread(threading.Thread):
+    """Fake upstreams on their own event loop so they don't compete with the load generator's"""
+
+    def __init__(self, profiles):
+        super().__init__(daemon=True)
+        self.profiles = profiles
+        self.urls: dict[str, str] = {}
+        self.ready = threading.Event()
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._shutdown: asyncio.Event | None = None
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(self._serve())
+
+    async def _serve(self):
+        self._shutdown = asyncio.Event()
+        runners, self.urls = await start_upstreams(self.profiles)
+        self.ready.set()
+        await self._shutdown.wait()
+        for runner in runners:
+            await runner.cleanup()
+
+    def snapshot(self) -> dict:
+        return {name: dict(profile.stats) for name, profile in self.profiles.items()}
+
+    def stop(self):
+        if self.loop is not None and self._shutdown is not None:
+            self.loop.call_soon_threadsafe(self._shutdown.set)
+        self.join(timeout=5)
+
+
+def stats_delta(before: dict, after: dict) -> dict:
+    return {
+        name: {key: after[name][key] - before[name].get(key, 0) for key in after[name]}
+        for name in after
+    }
+
+
+def launch_backend(args, urls: dict[str, str], state_dir: str | None = None) -> subprocess.Popen:
+    """
+    Start uvicorn in the backend directory with the fake upstreams wired in
+
+    With several workers and the default memory:// state backend, each worker
+    would keep its own transfers and miss the others'; the workers share a
+    SQLite database in state_dir instead.
+    """
+    env = {**os.environ, **backend_env(urls)}
+    if not args.summary_cache:
+        env["SUMMARY_CACHE_ENABLED"] = "false"
+    env.setdefault("LOG_LEVEL", "WARNING")
+    for pair in args.env or []:
+        key, _, value = pair.partition("=")
+        env[key] = value
+    if state_dir is not None and env.get("STATE_BACKEND_URL", "memory://").startswith("memory:"):
+        env["STATE_BACKEND_URL"] = f"sqlite:///{state_dir}/state.db"
+        print(f"{args.workers} workers: sharing state via {env['STATE_BACKEND_URL']}", file=sys.stderr)
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(args.port),
+            "--workers", str(args.workers), "--log-level", "warning"
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=None if args.backend_output else subprocess.DEVNULL
+    )
+
+
+async def wait_healthy(base_url: str, timeout: float):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{base_url}/health") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Backend at {base_url} did not become healthy within {timeout:.0f}s")
+
+
+async def benchmark(args, base_url: str, upstreams: UpstreamThread | None) -> dict:
+    await wait_healthy(base_url, args.startup_timeout)
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    timeout = aiohttp.ClientTimeout(total=args.request_timeout)
+    results = {}
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        for endpoint in args.endpoints:
+            make_request = request_factory(endpoint, args.audio_kb)
+            if args.warmup:
+                await drive(session, base_url, make_request, args.warmup, min(args.warmup, args.concurrency))
+            before = upstreams.snapshot() if upstreams else None
+            latencies, statuses, wall_time = await drive(
+                session, base_url, make_request, args.requests, args.concurrency
+            )
+            results[endpoint] = summarize(latencies, statuses, wall_time)
+            if upstreams:
+                results[endpoint]["upstream_calls"] = stats_delta(before, upstreams.snapshot())
+            print(
+                f"{endpoint}: p50={results[endpoint]['latency_ms']['p50']}ms "
+                f"p99={results[endpoint]['latency_ms']['p99']}ms "
+                f"{results[endpoint]['throughput_rps']} req/s",
+                file=sys.stderr
+            )
+    return results
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the backend against local fake upstreams")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per endpoint")
+    parser.add_argument("--audio-kb", type=int, default=32, help="Audio payload size for /transcribe")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Backend uvicorn workers (more than one share a temporary SQLite state backend unless STATE_BACKEND_URL is set)"
+    )
+    parser.add_argument("--port", type=int, default=8765, help="Port for the launched backend")
+    parser.add_argument("--env", nargs="+", metavar="KEY=VALUE", help="Extra backend settings, e.g. LLM_EXECUTION_MODE=race")
+    parser.add_argument("--summary-cache", action="store_true", help="Leave the summary cache enabled")
+    parser.add_argument("--backend-output", action="store_true", help="Show the launched backend's stdout")
+    parser.add_argument("--target", help="Benchmark an already running backend instead of launching one")
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--startup-timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    add_upstream_arguments(parser)
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    profiles = parse_profiles(args.upstream)
+    upstreams = backend = state_dir = None
+    if args.target:
+        base_url = args.target.rstrip("/")
+    else:
+        upstreams = UpstreamThread(profiles)
+        upstreams.start()
+        upstreams.ready.wait()
+        base_url = f"http://127.0.0.1:{args.port}"
+        if args.workers > 1:
+            state_dir = tempfile.TemporaryDirectory(prefix="bench-state-")
+        backend = launch_backend(args, upstreams.urls, state_dir.name if state_dir else None)
+
+    try:
+        results = asyncio.run(benchmark(args, base_url, upstreams))
+    finally:
+        if backend is not None:
+            backend.terminate()
+            backend.wait(timeout=10)
+        if upstreams is not None:
+            upstreams.stop()
+        if state_dir is not None:
+            state_dir.cleanup()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "target": args.target,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "audio_kb": args.audio_kb,
+            "workers": None if args.target else args.workers,
+            "summary_cache": args.summary_cache,
+            "env": args.env or [],
+            "upstreams": None if args.target else {name: p.describe() for name, p in profiles.items()}
+        },
+        "endpoints": results
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()